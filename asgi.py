@@ -0,0 +1,5 @@
+from flaskr.async_app import asgi_app
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(asgi_app)
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from statistics import median
+from uuid import uuid4
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+IN_FLIGHT = 200
+REQUESTS = 1000
+UPSTREAM_DELAY = 0.2
+SYNC_WORKERS = 4
+AUTH_STUB_PORT = 3104
+SYNC_PORT = 3108
+ASYNC_PORT = 3109
+
+
+async def users_by_customer(request):
+    """
+    Stand-in for the auth api, it answers after UPSTREAM_DELAY like a slow outbound call
+    """
+    await asyncio.sleep(UPSTREAM_DELAY)
+    return JSONResponse([{'id': str(uuid4()), 'auth_user_id': str(uuid4()), 'customer_id': request.query_params.get('customer_id')}])
+
+
+auth_stub = Starlette(routes=[Route('/users/getUsersByCustomer', users_by_customer)])
+
+
+def start_server(command):
+    environment = dict(os.environ, FLASK_ENV='test', AUTH_API_PATH=f'http://127.0.0.1:{AUTH_STUB_PORT}')
+    return subprocess.Popen(command, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as probe:
+            if probe.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f'nothing is listening on {port}')
+
+
+async def load(port, path):
+    """
+    Send REQUESTS requests keeping IN_FLIGHT of them open at any time
+    Return:
+        (requests per second, median latency ms, p95 latency ms, errors)
+    """
+    latencies = []
+    errors = 0
+    pending = iter(range(REQUESTS))
+    limits = httpx.Limits(max_connections=IN_FLIGHT, max_keepalive_connections=IN_FLIGHT)
+    async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            for _ in pending:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    errors += response.status_code != 200
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(IN_FLIGHT)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return REQUESTS / elapsed, median(latencies), latencies[int(len(latencies) * 0.95) - 1], errors
+
+
+def main():
+    path = f'/issue/getIssuesByCustomer?customer_id={uuid4()}&year=2024&month=5'
+    servers = {
+        'auth api stub': (AUTH_STUB_PORT, start_server(
+            [sys.executable, '-m', 'uvicorn', '--port', str(AUTH_STUB_PORT), '--log-level', 'warning',
+             'benchmarks.async_concurrency_benchmark:auth_stub'])),
+        f'gunicorn -w {SYNC_WORKERS} (wsgi)': (SYNC_PORT, start_server(
+            [sys.executable, '-m', 'gunicorn', '-w', str(SYNC_WORKERS), '--bind', f'127.0.0.1:{SYNC_PORT}', 'wsgi:app'])),
+        'uvicorn (asgi)': (ASYNC_PORT, start_server(
+            [sys.executable, '-m', 'uvicorn', '--port', str(ASYNC_PORT), '--log-level', 'warning', 'asgi:asgi_app'])),
+    }
+    try:
+        print(f'{IN_FLIGHT} in flight, {REQUESTS} requests, auth api answering in {UPSTREAM_DELAY * 1000:.0f} ms')
+        print(f'{"server":>22} | {"req/s":>7} | {"p50 ms":>8} | {"p95 ms":>8} | {"errors":>6}')
+        wait_for_port(AUTH_STUB_PORT)
+        for name, (port, _) in list(servers.items())[1:]:
+            wait_for_port(port)
+            throughput, p50, p95, errors = asyncio.run(load(port, path))
+            print(f'{name:>22} | {throughput:>7.1f} | {p50:>8.1f} | {p95:>8.1f} | {errors:>6}')
+    finally:
+        for _, process in servers.values():
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+from uuid import uuid4
+from sqlalchemy import text
+from flaskr.application.issue_service import IssueService
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.infrastructure.databases.postgres.db import engine
+from .helpers import seed_issues, clean_issues, measure, BENCHMARK_SUBJECT
+
+BATCH_SIZES = [10, 100, 500]
+
+
+def open_issue_ids(total):
+    with engine.connect() as connection:
+        return [str(issue_id) for issue_id, in connection.execute(
+            text("SELECT id FROM issue WHERE subject = :subject LIMIT :total"),
+            {"subject": BENCHMARK_SUBJECT, "total": total})]
+
+
+def one_by_one(service, issue_ids):
+    agent_id = uuid4()
+    for issue_id in issue_ids:
+        service.assign_issue_with_trace(issue_id=issue_id, auth_user_agent_id=agent_id, scope='benchmark')
+
+
+def bulk(service, issue_ids):
+    service.assign_issues(auth_user_agent_id=uuid4(), issue_ids=issue_ids, scope='benchmark')
+
+
+def main():
+    service = IssueService(issue_repository=IssuePostgresqlRepository())
+    try:
+        seed_issues(max(BATCH_SIZES))
+        print(f'{"batch":>6} | {"one by one ms":>13} | {"bulk ms":>8}')
+        for batch_size in BATCH_SIZES:
+            issue_ids = open_issue_ids(batch_size)
+            one_by_one_latency = measure(lambda: one_by_one(service, issue_ids), repeat=3)
+            bulk_latency = measure(lambda: bulk(service, issue_ids), repeat=3)
+            print(f'{batch_size:>6} | {one_by_one_latency:>13.1f} | {bulk_latency:>8.1f}')
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("DELETE FROM issue_trace WHERE scope = 'benchmark'"))
+        clean_issues()
+
+
+if __name__ == '__main__':
+    main()
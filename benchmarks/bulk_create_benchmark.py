@@ -0,0 +1,39 @@
+import time
+from uuid import uuid4
+from flaskr.application.issue_service import IssueService
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from .helpers import clean_issues, BENCHMARK_SUBJECT
+
+BATCH_SIZES = [10, 100, 500]
+
+
+def items(total):
+    return [{
+        "auth_user_id": uuid4(),
+        "auth_user_agent_id": uuid4(),
+        "subject": BENCHMARK_SUBJECT,
+        "description": "benchmark description"
+    } for _ in range(total)]
+
+
+def issues_per_second(function, total):
+    start = time.perf_counter()
+    function()
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    service = IssueService(issue_repository=IssuePostgresqlRepository())
+    try:
+        print(f'{"batch":>6} | {"single issues/s":>15} | {"bulk issues/s":>13}')
+        for batch_size in BATCH_SIZES:
+            batch = items(batch_size)
+            single = issues_per_second(lambda: [service.create_issue(file_path=None, **item) for item in batch], batch_size)
+            bulk = issues_per_second(lambda: service.create_issues(items(batch_size)), batch_size)
+            print(f'{batch_size:>6} | {single:>15.0f} | {bulk:>13.0f}')
+    finally:
+        clean_issues()
+
+
+if __name__ == '__main__':
+    main()
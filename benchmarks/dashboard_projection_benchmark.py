@@ -0,0 +1,58 @@
+import tracemalloc
+from uuid import uuid4
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy
+from flaskr.infrastructure.databases.postgres.db import ReadSession
+from .helpers import seed_issues, clean_issues, measure
+
+ISSUE_COUNTS = [10_000, 100_000, 250_000]
+USERS_PER_CUSTOMER = 50
+
+
+def full_rows(repository, user_ids):
+    session = ReadSession()
+    try:
+        return [
+            {
+                "status": issue.status,
+                "channel_plan_id": issue.channel_plan_id,
+                "created_at": issue.created_at
+            } for issue in session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.auth_user_id.in_(user_ids))
+        ]
+    finally:
+        session.close()
+
+
+def projected_rows(repository, user_ids):
+    return repository.list_issue_columns_by_users(user_ids=user_ids)
+
+
+def peak_memory_mb(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    repository = IssuePostgresqlRepository()
+    try:
+        print(f'{"issues":>8} | {"full ms":>9} | {"projected ms":>12} | {"full MB":>8} | {"projected MB":>12}')
+        for issue_count in ISSUE_COUNTS:
+            clean_issues()
+            user_ids = [uuid4() for _ in range(USERS_PER_CUSTOMER)]
+            seed_issues(issue_count, auth_user_ids=user_ids)
+            full_latency = measure(lambda: full_rows(repository, user_ids), repeat=3)
+            projected_latency = measure(lambda: projected_rows(repository, user_ids), repeat=3)
+            full_memory = peak_memory_mb(lambda: full_rows(repository, user_ids))
+            projected_memory = peak_memory_mb(lambda: projected_rows(repository, user_ids))
+            print(f'{issue_count:>8} | {full_latency:>9.1f} | {projected_latency:>12.1f} | '
+                  f'{full_memory:>8.1f} | {projected_memory:>12.1f}')
+    finally:
+        clean_issues()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import random
+from sqlalchemy import text
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.infrastructure.databases.postgres.db import engine
+from .helpers import seed_issues, clean_issues, measure, BENCHMARK_SUBJECT
+
+TABLE_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def sample_radicados(size=50):
+    with engine.connect() as connection:
+        return [row[0] for row in connection.execute(
+            text("SELECT radicado FROM issue WHERE subject = :subject ORDER BY random() LIMIT :size"),
+            {"subject": BENCHMARK_SUBJECT, "size": size})]
+
+
+def main():
+    repository = IssuePostgresqlRepository()
+    seeded = 0
+    try:
+        print(f'{"rows":>10} | {"median ms":>10}')
+        for size in TABLE_SIZES:
+            seed_issues(size - seeded)
+            seeded = size
+            radicados = sample_radicados()
+            latency = measure(lambda: repository.get_issue_by_id(random.choice(radicados)))
+            print(f'{size:>10} | {latency:>10.3f}')
+
+        with engine.connect() as connection:
+            plan = connection.execute(text("EXPLAIN SELECT * FROM issue WHERE radicado = :radicado"),
+                                      {"radicado": radicados[0]})
+            print('\n'.join(row[0] for row in plan))
+    finally:
+        clean_issues()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import time
+from statistics import median
+from sqlalchemy import text
+from flaskr.infrastructure.databases.postgres.db import engine
+from flaskr.domain.constants import ISSUE_STATUS_OPEN
+
+BENCHMARK_SUBJECT = 'benchmark-issue'
+
+
+def seed_issues(total, auth_user_ids=None, status=ISSUE_STATUS_OPEN):
+    """
+    Insert synthetic issues with a single INSERT ... SELECT generate_series
+    Args:
+        total (int): number of issues to insert
+        auth_user_ids (list): users to spread the issues across, a random user per issue if None
+        status (str): issue status id
+    """
+    users = [str(user_id) for user_id in auth_user_ids] if auth_user_ids else None
+    with engine.begin() as connection:
+        connection.execute(text("""
+            INSERT INTO issue (id, auth_user_id, auth_user_agent_id, status, subject, description,
+                               created_at, closed_at, channel_plan_id)
+            SELECT gen_random_uuid(),
+                   CASE WHEN CAST(:users AS uuid[]) IS NULL THEN gen_random_uuid()
+                        ELSE (CAST(:users AS uuid[]))[1 + (serie % cardinality(CAST(:users AS uuid[])))] END,
+                   gen_random_uuid(),
+                   CAST(:status AS uuid),
+                   :subject,
+                   md5(random()::text),
+                   now() - (random() * interval '730 days'),
+                   now(),
+                   gen_random_uuid()
+            FROM generate_series(1, :total) AS serie
+        """), {"users": users, "status": str(status), "subject": BENCHMARK_SUBJECT, "total": total})
+        connection.execute(text("ANALYZE issue"))
+
+
+def clean_issues():
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM issue WHERE subject = :subject"), {"subject": BENCHMARK_SUBJECT})
+
+
+def measure(function, repeat=50):
+    """
+    Run function repeat times and return the median latency in milliseconds
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return median(samples)
@@ -0,0 +1,37 @@
+from sqlalchemy import text
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.infrastructure.databases.postgres.db import engine
+from flaskr.domain.constants import ISSUE_STATUS_OPEN
+from flaskr.utils import encode_cursor
+from .helpers import seed_issues, clean_issues, measure
+
+TOTAL_ISSUES = 200_000
+LIMIT = 20
+PAGES = [1, 100, 1_000, 5_000]
+
+
+def cursor_before_page(page):
+    with engine.connect() as connection:
+        created_at, issue_id = connection.execute(text("""
+            SELECT created_at, id FROM issue WHERE status = :status
+            ORDER BY created_at DESC, id DESC OFFSET :offset LIMIT 1
+        """), {"status": ISSUE_STATUS_OPEN, "offset": (page - 1) * LIMIT - 1}).one()
+    return encode_cursor(created_at, issue_id)
+
+
+def main():
+    repository = IssuePostgresqlRepository()
+    seed_issues(TOTAL_ISSUES)
+    try:
+        print(f'{"page":>6} | {"offset ms":>10} | {"cursor ms":>10}')
+        for page in PAGES:
+            cursor = cursor_before_page(page) if page > 1 else ''
+            offset_latency = measure(lambda: repository.get_open_issues(page=page, limit=LIMIT), repeat=20)
+            cursor_latency = measure(lambda: repository.get_open_issues_after(cursor=cursor, limit=LIMIT), repeat=20)
+            print(f'{page:>6} | {offset_latency:>10.3f} | {cursor_latency:>10.3f}')
+    finally:
+        clean_issues()
+
+
+if __name__ == '__main__':
+    main()
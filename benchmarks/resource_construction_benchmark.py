@@ -0,0 +1,24 @@
+from config import Config
+from flaskr.application.issue_service import IssueService
+from flaskr.container import Container
+from flaskr.endpoint import Issue
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from .helpers import measure
+
+
+def per_request_construction():
+    Config()
+    Issue(IssueService(IssuePostgresqlRepository()))
+
+
+def main():
+    container = Container()
+    before = measure(per_request_construction, repeat=2_000)
+    after = measure(lambda: Issue(**container.resource_kwargs()), repeat=2_000)
+    print(f'{"construction":>24} | {"median ms":>10}')
+    print(f'{"per request (before)":>24} | {before:>10.4f}')
+    print(f'{"container (after)":>24} | {after:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import time
+from uuid import uuid4
+from sqlalchemy import text
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository, USERS_SEARCH_PAGE
+from flaskr.infrastructure.databases.postgres.db import engine
+from flaskr.domain.constants import ISSUE_STATUS_OPEN
+
+TOTAL_ISSUES = 2_000_000
+SEED_CHUNK = 250_000
+USERS = 20_000
+CUSTOMER_USERS = 500
+LIMIT = 20
+REPEAT = 50
+P95_TARGET_MS = 50
+BENCHMARK_AGENT = uuid4()
+
+QUERIES = {
+    'common word': 'conexión',
+    'rare word': 'antena',
+    'phrase': '"sin servicio"',
+    'or / not': 'router or módem -factura',
+}
+
+
+def seed_spanish_issues(users):
+    """
+    Insert TOTAL_ISSUES issues with spanish subjects and descriptions, spread evenly
+    across users and marked with BENCHMARK_AGENT so clean_search_issues finds them.
+    Every word is in a tenth of the issues or more, but antena is in one of 2000
+    """
+    for start in range(0, TOTAL_ISSUES, SEED_CHUNK):
+        with engine.begin() as connection:
+            connection.execute(text("""
+                WITH words AS (
+                    SELECT ARRAY['Falla', 'Lentitud', 'Corte', 'Cobro', 'Cambio', 'Reclamo', 'Error', 'Intermitencia'] AS problems,
+                           ARRAY['de conexión', 'del router', 'del módem', 'de la factura', 'del plan', 'de la línea',
+                                 'del portal', 'de la app', 'de la fibra', 'del correo'] AS services,
+                           ARRAY['desde ayer', 'sin servicio', 'en la oficina', 'después de la tormenta', 'cada noche',
+                                 'al pagar', 'tras la visita técnica', 'con todos los equipos'] AS details
+                )
+                INSERT INTO issue (id, auth_user_id, auth_user_agent_id, status, subject, description,
+                                   created_at, closed_at, channel_plan_id)
+                SELECT gen_random_uuid(),
+                       (CAST(:users AS uuid[]))[1 + (serie % cardinality(CAST(:users AS uuid[])))],
+                       CAST(:agent AS uuid),
+                       CAST(:status AS uuid),
+                       problems[1 + floor(random() * 8)::int] || ' ' || services[1 + floor(random() * 10)::int],
+                       'El cliente reporta ' || lower(problems[1 + floor(random() * 8)::int]) || ' '
+                           || services[1 + floor(random() * 10)::int] || ' ' || details[1 + floor(random() * 8)::int]
+                           || CASE WHEN random() < 0.0005 THEN ' y la antena dañada' ELSE '' END,
+                       now() - (random() * interval '730 days'),
+                       NULL,
+                       gen_random_uuid()
+                FROM words, generate_series(:first, :last) AS serie
+            """), {"users": [str(user) for user in users], "agent": str(BENCHMARK_AGENT), "status": ISSUE_STATUS_OPEN,
+                   "first": start + 1, "last": min(start + SEED_CHUNK, TOTAL_ISSUES)})
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE issue"))
+
+
+def clean_search_issues():
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM issue WHERE auth_user_agent_id = :agent"), {"agent": BENCHMARK_AGENT})
+
+
+def percentiles(function, repeat=REPEAT):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.95) - 1]
+
+
+def plan_indexes(user_ids, query):
+    compiled = USERS_SEARCH_PAGE.params(user_ids=user_ids, query=query, limit=LIMIT + 1).compile(
+        dialect=engine.dialect, compile_kwargs={'render_postcompile': True})
+    params = {key: str(value) for key, value in compiled.params.items()}
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(f'EXPLAIN {compiled}', params).scalars().all()
+    return sorted({line.split(' on ')[1].split()[0] for line in plan if 'Index Scan on' in line})
+
+
+def main():
+    repository = IssuePostgresqlRepository()
+    users = [uuid4() for _ in range(USERS)]
+    scopes = {'user': users[:1], 'customer': users[:CUSTOMER_USERS]}
+    start = time.perf_counter()
+    seed_spanish_issues(users)
+    print(f'seeded {TOTAL_ISSUES} issues for {USERS} users in {time.perf_counter() - start:.0f} s, '
+          f'{TOTAL_ISSUES // USERS} issues per user, limit {LIMIT}, p95 target {P95_TARGET_MS} ms')
+    try:
+        print(f'{"scope":>8} | {"query":>11} | {"matches":>8} | {"page":>5} | {"p50 ms":>7} | {"p95 ms":>7} | {"target":>6} | indexes')
+        for scope, user_ids in scopes.items():
+            for name, query in QUERIES.items():
+                first_page = repository.search_by_users(user_ids, query, limit=LIMIT)
+                with engine.connect() as connection:
+                    matches = connection.execute(text(
+                        "SELECT count(*) FROM issue WHERE auth_user_id = ANY(CAST(:users AS uuid[])) "
+                        "AND search_vector @@ websearch_to_tsquery('spanish', :query)"
+                    ), {"users": [str(user) for user in user_ids], "query": query}).scalar()
+                indexes = ', '.join(plan_indexes(user_ids, query))
+                pages = {'first': None, 'next': first_page["next_cursor"]}
+                for page, cursor in pages.items():
+                    if page == 'next' and cursor is None:
+                        continue
+                    p50, p95 = percentiles(lambda: repository.search_by_users(user_ids, query, cursor=cursor, limit=LIMIT))
+                    verdict = 'ok' if p95 <= P95_TARGET_MS else 'over'
+                    print(f'{scope:>8} | {name:>11} | {matches:>8} | {page:>5} | {p50:>7.2f} | {p95:>7.2f} | {verdict:>6} | {indexes}')
+    finally:
+        clean_search_issues()
+
+
+if __name__ == '__main__':
+    main()
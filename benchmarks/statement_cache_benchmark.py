@@ -0,0 +1,69 @@
+from uuid import uuid4
+from sqlalchemy import desc
+from flaskr.domain.constants import ISSUE_STATUS_OPEN, ISSUE_STATUS_SOLVED, ISSUE_DASHBOARD_COLUMNS
+from flaskr.infrastructure.databases.issue_postresql_repository import (IssuePostgresqlRepository, USER_ISSUES_PAGE,
+                                                                        OPEN_ISSUES_PAGE, USER_SOLVED_IN_PERIOD)
+from flaskr.infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy
+from flaskr.infrastructure.databases.postgres.db import ReadSession
+from flaskr.infrastructure.mappers.issue_sqlalchemy_mapper import _month_range
+from .helpers import measure
+
+REPEAT = 20_000
+
+
+def query_statement(query):
+    """
+    Build the statement a legacy Query executes and the key sqlalchemy looks its
+    compiled SQL up with, which is what every call paid before running anything
+    """
+    return query._statement_20()._generate_cache_key()
+
+
+def main():
+    repository = IssuePostgresqlRepository()
+    session = ReadSession()
+    user_id = uuid4()
+    user_ids = [user_id, uuid4(), uuid4()]
+    channel_plan_id = uuid4()
+    selected = repository._issue_columns(ISSUE_DASHBOARD_COLUMNS)
+    start, end = _month_range(2024, 5)
+
+    legacy = {
+        'find': lambda: query_statement(
+            session.query(IssueModelSqlAlchemy)
+                .filter(IssueModelSqlAlchemy.auth_user_id == user_id, IssueModelSqlAlchemy.status.isnot(None))
+                .order_by(desc(IssueModelSqlAlchemy.created_at)).offset(10).limit(10)),
+        'get_open_issues': lambda: query_statement(
+            session.query(IssueModelSqlAlchemy)
+                .filter(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN)
+                .order_by(desc(IssueModelSqlAlchemy.created_at)).offset(10).limit(10)),
+        'list_issue_columns_by_users': lambda: query_statement(repository._filter_issues(
+            session.query(*selected).filter(IssueModelSqlAlchemy.auth_user_id.in_(user_ids)),
+            status='Created', channel_plan_id=channel_plan_id)),
+        'list_issues_period': lambda: query_statement(
+            session.query(IssueModelSqlAlchemy)
+                .filter(IssueModelSqlAlchemy.auth_user_id == user_id, IssueModelSqlAlchemy.status == ISSUE_STATUS_SOLVED,
+                        IssueModelSqlAlchemy.created_at >= start, IssueModelSqlAlchemy.created_at < end)),
+    }
+    cached = {
+        'find': lambda: USER_ISSUES_PAGE._generate_cache_key(),
+        'get_open_issues': lambda: OPEN_ISSUES_PAGE._generate_cache_key(),
+        'list_issue_columns_by_users': lambda: repository._filter_issues_lambda(
+            repository._issue_columns_statement(selected, user_ids),
+            status='Created', channel_plan_id=channel_plan_id)._generate_cache_key(),
+        'list_issues_period': lambda: USER_SOLVED_IN_PERIOD._generate_cache_key(),
+    }
+
+    repository.status_registry.refresh()
+    try:
+        print(f'{"query":>27} | {"query() us":>10} | {"cached us":>10} | {"speedup":>8}')
+        for name, build in legacy.items():
+            before = measure(build, repeat=REPEAT) * 1000
+            after = measure(cached[name], repeat=REPEAT) * 1000
+            print(f'{name:>27} | {before:>10.1f} | {after:>10.1f} | {before / after:>7.1f}x')
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
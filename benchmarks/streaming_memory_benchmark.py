@@ -0,0 +1,46 @@
+import json
+import tracemalloc
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.utils import json_array_chunks
+from .helpers import seed_issues, clean_issues
+
+ISSUE_COUNTS = [10_000, 50_000, 200_000]
+
+
+def listed_body(repository):
+    return json.dumps(repository.all())
+
+
+def streamed_body(repository):
+    size = 0
+    for chunk in json_array_chunks(repository.iter_all()):
+        size += len(chunk)
+    return size
+
+
+def peak_memory_mb(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    repository = IssuePostgresqlRepository()
+    try:
+        print(f'{"issues":>8} | {"list MB":>8} | {"stream MB":>9}')
+        seeded = 0
+        for issue_count in ISSUE_COUNTS:
+            seed_issues(issue_count - seeded)
+            seeded = issue_count
+            listed_memory = peak_memory_mb(lambda: listed_body(repository))
+            streamed_memory = peak_memory_mb(lambda: streamed_body(repository))
+            print(f'{issue_count:>8} | {listed_memory:>8.1f} | {streamed_memory:>9.1f}')
+    finally:
+        clean_issues()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import text
+from flaskr.domain.models import IssueTrace
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.infrastructure.databases.issue_trace_writer import BufferedIssueTraceWriter
+from flaskr.infrastructure.databases.postgres.db import engine, Session
+from .helpers import seed_issues, clean_issues, BENCHMARK_SUBJECT
+
+ASSIGNMENTS = 3_000
+CONCURRENCY = 12
+
+
+def open_issue_ids():
+    with engine.connect() as connection:
+        return connection.execute(text('SELECT id FROM issue WHERE subject = :subject'),
+                                  {'subject': BENCHMARK_SUBJECT}).scalars().all()
+
+
+def assign_all(repository, issue_ids):
+    """
+    Assign every issue from CONCURRENCY threads, like concurrent assignIssue requests
+    Return:
+        assignments per second
+    """
+    def assign(issue_id):
+        agent_id = uuid4()
+        trace = IssueTrace(id=uuid4(), issue_id=issue_id, auth_user_id=None, auth_user_agent_id=agent_id,
+                           scope='assignIssue - benchmark', created_at=datetime.utcnow(), channel_plan_id=None)
+        try:
+            repository.assign_issue_with_trace(issue_id=issue_id, auth_user_agent_id=agent_id, issue_trace=trace)
+        finally:
+            Session.remove()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+        list(executor.map(assign, issue_ids))
+    return len(issue_ids) / (time.perf_counter() - start)
+
+
+def main():
+    writer = BufferedIssueTraceWriter()
+    repositories = {
+        'sync': IssuePostgresqlRepository(),
+        'buffered': IssuePostgresqlRepository(trace_writer=writer),
+    }
+    try:
+        print(f'{ASSIGNMENTS} assignments from {CONCURRENCY} threads')
+        print(f'{"trace write":>12} | {"assign/s":>9} | {"speedup":>8}')
+        baseline = None
+        for name, repository in repositories.items():
+            seed_issues(ASSIGNMENTS)
+            throughput = assign_all(repository, open_issue_ids())
+            writer.close()
+            baseline = baseline or throughput
+            print(f'{name:>12} | {throughput:>9.1f} | {throughput / baseline:>7.2f}x')
+            with engine.begin() as connection:
+                connection.execute(text("DELETE FROM issue_trace WHERE scope = 'assignIssue - benchmark'"))
+            clean_issues()
+    finally:
+        writer.close()
+
+
+if __name__ == '__main__':
+    main()
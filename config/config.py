@@ -15,6 +15,14 @@ class Config:
         self.ENVIRONMENT = environment
         self.APP_NAME=os.getenv('APP_NAME')
         self.DATABASE_URI=os.getenv('DATABASE_URI')
+        self.DATABASE_REPLICA_URIS=os.getenv('DATABASE_REPLICA_URIS', '')
+        self.ASYNC_DATABASE_URI=os.getenv('ASYNC_DATABASE_URI', '')
         self.AUTH_API_PATH=os.getenv('AUTH_API_PATH')
         self.OPENAI_PREDICTIVE_MODEL=os.getenv('OPENAI_PREDICTIVE_MODEL')
-        
\ No newline at end of file
+        self.RECENT_ISSUES_CACHE_SIZE=os.getenv('RECENT_ISSUES_CACHE_SIZE', '1024')
+        self.RECENT_ISSUES_CACHE_TTL=os.getenv('RECENT_ISSUES_CACHE_TTL', '300')
+        self.UPLOAD_DIRECTORY=os.getenv('UPLOAD_DIRECTORY', 'uploads')
+        
+        self.ISSUE_TRACE_WRITE_MODE=os.getenv('ISSUE_TRACE_WRITE_MODE', 'sync')
+        self.ISSUE_TRACE_BATCH_SIZE=os.getenv('ISSUE_TRACE_BATCH_SIZE', '500')
+        self.ISSUE_TRACE_MAX_DELAY=os.getenv('ISSUE_TRACE_MAX_DELAY', '1')
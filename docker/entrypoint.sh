@@ -1 +1,2 @@
+make db-migrate
 make run-docker PORT=3007
\ No newline at end of file
@@ -5,10 +5,12 @@ import requests
 from flaskr import create_app
 from config import Config
 from .endpoint import HealthCheck,Issue, Issues
+from .container import Container
+import os
 import signal
 import logging
 from flask_cors import CORS
-from .infrastructure.databases.postgres.db import Session
+from .infrastructure.databases.postgres.db import Session, ReadSession
 import newrelic.agent
 newrelic.agent.initialize('newrelic.ini')
 
@@ -16,6 +18,7 @@ config = Config()
 
 
 app = create_app('default')
+app.config['UPLOAD_FOLDER'] = os.path.abspath(config.UPLOAD_DIRECTORY)
 CORS(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('default')
@@ -24,6 +27,8 @@ logger.info('starting application ...')
 
 def before_server_stop(*args, **kwargs):
     logger.info('Closing application ...')
+    if container.trace_writer is not None:
+        container.trace_writer.close()
 
 signal.signal(signal.SIGTERM, before_server_stop)
 
@@ -31,12 +36,14 @@ app_context = app.app_context()
 app_context.push()
 
 api = Api(app)
+container = Container(config)
 
 #resources
 api.add_resource(HealthCheck, '/health')
-api.add_resource(Issue, '/issue/<string:action>')
-api.add_resource(Issues, '/issues/<string:action>/<string:user_id>')
+api.add_resource(Issue, '/issue/<string:action>', resource_class_kwargs=container.resource_kwargs())
+api.add_resource(Issues, '/issues/<string:action>/<string:user_id>', resource_class_kwargs=container.resource_kwargs())
 
 @app.teardown_appcontext
 def shutdown_session(exception=None):
+    ReadSession.remove()
     Session.remove()
\ No newline at end of file
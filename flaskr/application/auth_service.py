@@ -7,6 +7,7 @@ import re
 import os
 import logging
 from ..domain.models.auth_user_customer import AuthUserCustomer
+from ..utils import AsyncHttpClient, async_http_client
 
 class AuthService:
     """
@@ -15,16 +16,17 @@ class AuthService:
         base_url (string): the Auth api url 
     """
 
-    def __init__(self):
+    def __init__(self, http_client: AsyncHttpClient = None):
         """
         service constructor 
         Args:
-            
+            http_client (AsyncHttpClient): client for the async calls, the shared one if None
         """
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('default')
         self.logger.info(f'Instanced auth service')
         self.base_url = os.environ.get('AUTH_API_PATH')
+        self.http_client = http_client or async_http_client
 
     def get_users_by_customer_list(self,customer_id):
         """
@@ -34,35 +36,12 @@ class AuthService:
         Return:
             auth_user_customer_list (AuthUserCustomer): list of auth users objects
         """
-        auth_user_customer_list=[]
         try:
             
             self.logger.info(f'init consuming api auth {self.base_url}/users/getUsersByCustomer?customer_id={customer_id}')
             response = requests.get(f'{self.base_url}/users/getUsersByCustomer?customer_id={customer_id}')
-            self.logger.info(f'quering users customer')
-            if response.status_code == 200:
-                self.logger.info(f'status code 200 quering users customer services')
-                data = response.json()
-                if data:
-                    self.logger.info(f'there are auth response ')
-                    for item in data:
-
+            return self._users_from_response(response)
 
-                        auth_user_customer_list.append(AuthUserCustomer(item.get('id'),
-                                item.get('auth_user_id'),
-                                item.get('customer_id')                    
-                        ))
- 
-                    self.logger.info(f'deserializing user  list')
-                    return auth_user_customer_list
-                    
-                else:
-                    self.logger.info(f'there arent users customer')
-                    return None
-            else:
-                self.logger.info(f"error consuming user users auth api: {response.status_code}")
-                return None
-            
         except Exception as e:
             self.logger.info(f"Error comunication with auth api: {str(e)}")
             return None    
@@ -76,32 +55,94 @@ class AuthService:
         Return:
             auth_user_customer (AuthUserCustomer):  auth user object
         """
-        auth_user_customer=None
         try:
             
             self.logger.info(f'init consuming api auth {self.base_url}/users/getCompanyByUser?user_id={user_id}')
             response = requests.get(f'{self.base_url}/users/getCompanyByUser?user_id={user_id}')
-            self.logger.info(f'quering users customer')
-            if response.status_code == 200:
-                self.logger.info(f'status code 200 quering users customer services')
-                data = response.json()
-                if data:
-                    self.logger.info(f'there are auth response ')
-                    auth_user_customer= AuthUserCustomer(data.get('id'),
-                            data.get('auth_user_id'),
-                            data.get('customer_id')                    
-                    )
+            return self._customer_from_response(response)
+
+        except Exception as e:
+            self.logger.info(f"Error comunication with auth api: {str(e)}")
+            return None
+
+    async def get_users_by_customer_list_async(self,customer_id):
+        """
+        same as get_users_by_customer_list without blocking the event loop
+        Args:
+            customer_id: (str)
+        Return:
+            auth_user_customer_list (AuthUserCustomer): list of auth users objects
+        """
+        try:
+            self.logger.info(f'init consuming api auth {self.base_url}/users/getUsersByCustomer?customer_id={customer_id}')
+            response = await self.http_client.get(f'{self.base_url}/users/getUsersByCustomer?customer_id={customer_id}')
+            return self._users_from_response(response)
+
+        except Exception as e:
+            self.logger.info(f"Error comunication with auth api: {str(e)}")
+            return None
+
+    async def get_customer_by_user_id_async(self,user_id):
+        """
+        same as get_customer_by_user_id without blocking the event loop
+        Args:
+            user_id: (str)
+        Return:
+            auth_user_customer (AuthUserCustomer):  auth user object
+        """
+        try:
+            self.logger.info(f'init consuming api auth {self.base_url}/users/getCompanyByUser?user_id={user_id}')
+            response = await self.http_client.get(f'{self.base_url}/users/getCompanyByUser?user_id={user_id}')
+            return self._customer_from_response(response)
+
+        except Exception as e:
+            self.logger.info(f"Error comunication with auth api: {str(e)}")
+            return None
+
+    def _users_from_response(self, response):
+        auth_user_customer_list=[]
+        self.logger.info(f'quering users customer')
+        if response.status_code == 200:
+            self.logger.info(f'status code 200 quering users customer services')
+            data = response.json()
+            if data:
+                self.logger.info(f'there are auth response ')
+                for item in data:
+
+
+                    auth_user_customer_list.append(AuthUserCustomer(item.get('id'),
+                            item.get('auth_user_id'),
+                            item.get('customer_id')                    
+                    ))
  
-                    self.logger.info(f'deserializing user customer')
-                    return auth_user_customer
-                    
-                else:
-                    self.logger.info(f'there arent users customer')
-                    return None
+                self.logger.info(f'deserializing user  list')
+                return auth_user_customer_list
+                
             else:
-                self.logger.info(f"error consuming user users auth api: {response.status_code}")
+                self.logger.info(f'there arent users customer')
                 return None
-            
-        except Exception as e:
-            self.logger.info(f"Error comunication with auth api: {str(e)}")
-            return None  
\ No newline at end of file
+        else:
+            self.logger.info(f"error consuming user users auth api: {response.status_code}")
+            return None
+
+    def _customer_from_response(self, response):
+        self.logger.info(f'quering users customer')
+        if response.status_code == 200:
+            self.logger.info(f'status code 200 quering users customer services')
+            data = response.json()
+            if data:
+                self.logger.info(f'there are auth response ')
+                auth_user_customer= AuthUserCustomer(data.get('id'),
+                        data.get('auth_user_id'),
+                        data.get('customer_id')                    
+                )
+ 
+                self.logger.info(f'deserializing user customer')
+                return auth_user_customer
+                
+            else:
+                self.logger.info(f'there arent users customer')
+                return None
+        else:
+            self.logger.info(f"error consuming user users auth api: {response.status_code}")
+            return None
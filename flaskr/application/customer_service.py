@@ -8,6 +8,7 @@ import os
 import logging
 from ..domain.models.customer import Customer
 from ..domain.models.plan import Plan
+from ..utils import AsyncHttpClient, async_http_client
 
 class CustomerService:
     """
@@ -16,16 +17,17 @@ class CustomerService:
         base_url (string): the Customer api url 
     """
 
-    def __init__(self):
+    def __init__(self, http_client: AsyncHttpClient = None):
         """
         service constructor 
         Args:
-            
+            http_client (AsyncHttpClient): client for the async calls, the shared one if None
         """
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('default')
         self.logger.info('Instanced customer service')
         self.base_url = os.environ.get('CUSTOMER_API_PATH')
+        self.http_client = http_client or async_http_client
 
   
     def get_customer_by_id(self,customer_id):
@@ -36,34 +38,12 @@ class CustomerService:
         Return:
             customer (Customer):  customer object
         """
-        customer=None
         try:
             
             self.logger.info(f'init consuming api auth {self.base_url}/customer/getCustomerById?customer_id={customer_id}')
             response = requests.get(f'{self.base_url}/customer/getCustomerById?customer_id={customer_id}')
-            self.logger.info('quering customer')
-            if response.status_code == 200:
-                self.logger.info('status code 200 quering customer services')
-                data = response.json()
-                if data:
-                    self.logger.info('there are customer response ')
-                    customer= Customer(
-                        data.get('id'),
-                        data.get('name'),
-                        data.get('plan_id'),
-                        data.get('date_suscription')                   
-                    )
- 
-                    self.logger.info('deserializing customer')
-                    return customer
-                    
-                else:
-                    self.logger.info('there isnt customer')
-                    return None
-            else:
-                self.logger.info(f"error consuming customer api: {response.status_code}")
-                return None
-            
+            return self._customer_from_response(response)
+
         except Exception as e:
             self.logger.info(f"Error comunication with customer api: {str(e)}")
             return None  
@@ -77,34 +57,94 @@ class CustomerService:
         Return:
             plan (Plan):  Plan object
         """
-        plan=None
         try:
             
             self.logger.info(f'init consuming api auth {self.base_url}/customer/getPlanById?plan_id={plan_id}')
             response = requests.get(f'{self.base_url}/customer/getPlanById?plan_id={plan_id}')
-            self.logger.info('quering plan')
-            if response.status_code == 200:
-                self.logger.info('status code 200 quering plan services')
-                data = response.json()
-                if data:
-                    self.logger.info('there are plan response ')
-                    plan= Plan(
-                        data.get('id'),
-                        data.get('name'),
-                        data.get('basic_monthly_rate'),
-                        data.get('issue_fee')                   
-                    )
+            return self._plan_from_response(response)
+
+        except Exception as e:
+            self.logger.info(f"Error comunication with plan api: {str(e)}")
+            return None
+
+    async def get_customer_by_id_async(self,customer_id):
+        """
+        same as get_customer_by_id without blocking the event loop
+        Args:
+            customer_id: (uuid)
+        Return:
+            customer (Customer):  customer object
+        """
+        try:
+            self.logger.info(f'init consuming api auth {self.base_url}/customer/getCustomerById?customer_id={customer_id}')
+            response = await self.http_client.get(f'{self.base_url}/customer/getCustomerById?customer_id={customer_id}')
+            return self._customer_from_response(response)
+
+        except Exception as e:
+            self.logger.info(f"Error comunication with customer api: {str(e)}")
+            return None
+
+    async def get_plan_by_id_async(self,plan_id):
+        """
+        same as get_plan_by_id without blocking the event loop
+        Args:
+            plan_id: (uuid)
+        Return:
+            plan (Plan):  Plan object
+        """
+        try:
+            self.logger.info(f'init consuming api auth {self.base_url}/customer/getPlanById?plan_id={plan_id}')
+            response = await self.http_client.get(f'{self.base_url}/customer/getPlanById?plan_id={plan_id}')
+            return self._plan_from_response(response)
+
+        except Exception as e:
+            self.logger.info(f"Error comunication with plan api: {str(e)}")
+            return None
+
+    def _customer_from_response(self, response):
+        self.logger.info('quering customer')
+        if response.status_code == 200:
+            self.logger.info('status code 200 quering customer services')
+            data = response.json()
+            if data:
+                self.logger.info('there are customer response ')
+                customer= Customer(
+                    data.get('id'),
+                    data.get('name'),
+                    data.get('plan_id'),
+                    data.get('date_suscription')                   
+                )
  
-                    self.logger.info('deserializing plan')
-                    return plan
-                    
-                else:
-                    self.logger.info('there isnt plan')
-                    return None
+                self.logger.info('deserializing customer')
+                return customer
+                
             else:
-                self.logger.info(f"error consuming plan api: {response.status_code}")
+                self.logger.info('there isnt customer')
                 return None
-            
-        except Exception as e:
-            self.logger.info(f"Error comunication with plan api: {str(e)}")
-            return None  
\ No newline at end of file
+        else:
+            self.logger.info(f"error consuming customer api: {response.status_code}")
+            return None
+
+    def _plan_from_response(self, response):
+        self.logger.info('quering plan')
+        if response.status_code == 200:
+            self.logger.info('status code 200 quering plan services')
+            data = response.json()
+            if data:
+                self.logger.info('there are plan response ')
+                plan= Plan(
+                    data.get('id'),
+                    data.get('name'),
+                    data.get('basic_monthly_rate'),
+                    data.get('issue_fee')                   
+                )
+ 
+                self.logger.info('deserializing plan')
+                return plan
+                
+            else:
+                self.logger.info('there isnt plan')
+                return None
+        else:
+            self.logger.info(f"error consuming plan api: {response.status_code}")
+            return None
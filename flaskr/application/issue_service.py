@@ -1,69 +1,121 @@
-from typing import List, Optional
-import requests
+from typing import List, Optional, Iterator
+import asyncio
 from uuid import UUID
 import uuid
 from datetime import datetime
 from typing import TypedDict
 from ..domain.interfaces.issue_repository import IssueRepository
+from ..domain.interfaces.issue_async_repository import IssueAsyncRepository
 from ..domain.models import Issue, IssueAttachment,IssueTrace
-from ..utils import Logger
+from ..utils import Logger, LRUCache
+from ..domain.constants import ISSUE_TOTAL_EXACT, ISSUE_TOTAL_MODES, ISSUE_DASHBOARD_COLUMNS, ISSUE_BUCKET_DAY, ISSUE_BUCKETS, ISSUE_BULK_LIMIT, ISSUE_TOP_WINDOWS, ISSUE_STATUS_OPEN, ISSUE_STATUS_INPROGRESS, ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN_NAME, ISSUE_STATUS_INPROGRESS_NAME, ISSUE_STATUS_SOLVED_NAME, ISSUE_SEARCH_MAX_LIMIT, ISSUE_ASSIGNABLE_STATUS_NAMES
 from  config import Config
 from .auth_service import AuthService
 from .openAiService import OpenAIService
 from .customer_service import CustomerService
-from ..utils import Logger
 log = Logger()
 class Status(TypedDict):
     id: UUID
     name: str
    
 class IssueStatus:
-    NEW = {"id": UUID("574408a7-3aa0-4eab-b279-62ed10e6107e"), "name": "New"}
-    IN_PROGRESS = {"id": UUID("18e7d7dd-247b-4e27-aa0e-4f15e8ba5930"), "name": "In Progress"}
-    RESOLVED = {"id": UUID("791353c6-3899-4d35-bcd9-af8775e240bf"), "name": "Resolved"}
-    CLOSED = {"id": UUID("00000000-0000-0000-0000-000000000004"), "name": "Closed"}
+    NEW = {"id": UUID(ISSUE_STATUS_OPEN), "name": ISSUE_STATUS_OPEN_NAME}
+    IN_PROGRESS = {"id": UUID(ISSUE_STATUS_INPROGRESS), "name": ISSUE_STATUS_INPROGRESS_NAME}
+    RESOLVED = {"id": UUID(ISSUE_STATUS_SOLVED), "name": ISSUE_STATUS_SOLVED_NAME}
 
-    ALL_STATUSES = [NEW, IN_PROGRESS, RESOLVED, CLOSED]
+    ALL_STATUSES = [NEW, IN_PROGRESS, RESOLVED]
 class IssueService:
-    def __init__(self, issue_repository: IssueRepository=None):
+    def __init__(self, issue_repository: IssueRepository=None, auth_service: AuthService=None,
+                 customer_service: CustomerService=None, openai_service: OpenAIService=None, config: Config=None,
+                 recent_issues_cache: LRUCache=None, async_issue_repository: IssueAsyncRepository=None):
         self.log = Logger()
         self.issue_repository=issue_repository
-        self.config=Config()
+        self.async_issue_repository=async_issue_repository
+        self.config=config or Config()
+        self.auth_service=auth_service or AuthService()
+        self.customer_service=customer_service or CustomerService()
+        self.openai_service=openai_service or OpenAIService()
+        self.recent_issues_cache=recent_issues_cache or LRUCache(max_size=int(self.config.RECENT_ISSUES_CACHE_SIZE),
+                                                                 ttl=float(self.config.RECENT_ISSUES_CACHE_TTL))
 
     def list_issues_period(self, customer_id, year, month):
-        auth_service=AuthService()
-        list_user_customer=auth_service.get_users_by_customer_list(customer_id)
+        list_user_customer=self.auth_service.get_users_by_customer_list(customer_id)
         self.log.info(f'list user customer {list_user_customer}')
-        issues=[]
         if list_user_customer:
-            for item in list_user_customer:
-                issues.extend(self.issue_repository.list_issues_period(item.auth_user_id,year,month))
-            return issues
+            user_ids=[item.auth_user_id for item in list_user_customer]
+            return self.issue_repository.list_issues_period_by_users(user_ids,year,month)
         else:
             return None
-        
-    def list_issues_filtered(self, customer_id, status=None, channel_plan_id=None, created_at=None, closed_at=None):
-        auth_service = AuthService()
-        list_user_customer = auth_service.get_users_by_customer_list(customer_id)
+
+    async def list_issues_period_async(self, customer_id, year, month) -> Optional[List[Issue]]:
+        list_user_customer = await self.auth_service.get_users_by_customer_list_async(customer_id)
         self.log.info(f'list user customer {list_user_customer}')
-        issues = []
-        
         if list_user_customer:
-            for item in list_user_customer:
-                self.log.info(f'for each user {item}')
-                user_issues = self.issue_repository.list_issues_filtered(
-                    user_id=item.auth_user_id, 
-                    status=status, 
-                    channel_plan_id=channel_plan_id, 
-                    created_at=created_at, 
-                    closed_at=closed_at
-                )
-                issues.extend(user_issues)
-                
-            return issues
+            user_ids = [item.auth_user_id for item in list_user_customer]
+            return await self.async_issue_repository.list_issues_period_by_users(user_ids, year, month)
         else:
             return None
         
+    def stream_issues_period(self, customer_id, year, month) -> Iterator[Issue]:
+        list_user_customer = self.auth_service.get_users_by_customer_list(customer_id)
+        self.log.info(f'list user customer {list_user_customer}')
+        if list_user_customer:
+            user_ids = [item.auth_user_id for item in list_user_customer]
+            return self.issue_repository.iter_issues_period_by_users(user_ids, year, month)
+        else:
+            return iter(())
+
+    def stream_issues_dashboard(self, customer_id, status=None, channel_plan_id=None, created_at=None, closed_at=None) -> Iterator[tuple]:
+        list_user_customer = self.auth_service.get_users_by_customer_list(customer_id)
+        self.log.info(f'list user customer {list_user_customer}')
+
+        if list_user_customer:
+            return self.issue_repository.iter_issue_columns_by_users(
+                user_ids=[item.auth_user_id for item in list_user_customer],
+                columns=ISSUE_DASHBOARD_COLUMNS,
+                status=status,
+                channel_plan_id=channel_plan_id,
+                created_at=created_at,
+                closed_at=closed_at
+            )
+        else:
+            return iter(())
+
+    def list_issues_dashboard(self, customer_id, status=None, channel_plan_id=None, created_at=None, closed_at=None):
+        list_user_customer = self.auth_service.get_users_by_customer_list(customer_id)
+        self.log.info(f'list user customer {list_user_customer}')
+
+        if list_user_customer:
+            return self.issue_repository.list_issue_columns_by_users(
+                user_ids=[item.auth_user_id for item in list_user_customer],
+                columns=ISSUE_DASHBOARD_COLUMNS,
+                status=status,
+                channel_plan_id=channel_plan_id,
+                created_at=created_at,
+                closed_at=closed_at
+            )
+        else:
+            return None
+
+    def count_issues_dashboard(self, customer_id, bucket=ISSUE_BUCKET_DAY, status=None, channel_plan_id=None, created_at=None, closed_at=None):
+        if bucket not in ISSUE_BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(ISSUE_BUCKETS)}")
+
+        list_user_customer = self.auth_service.get_users_by_customer_list(customer_id)
+        self.log.info(f'list user customer {list_user_customer}')
+
+        if list_user_customer:
+            return self.issue_repository.count_issues_by_users(
+                user_ids=[item.auth_user_id for item in list_user_customer],
+                bucket=bucket,
+                status=status,
+                channel_plan_id=channel_plan_id,
+                created_at=created_at,
+                closed_at=closed_at
+            )
+        else:
+            return None
+
     def get_issue_by_id(self, issue_id: str) -> Optional[dict]:
         try:
             issue = self.issue_repository.get_issue_by_id(issue_id=issue_id)
@@ -76,7 +128,26 @@ class IssueService:
             self.log.error(f"Error retrieving issue by issue_id {issue_id}: {ex}")
             return None
 
+    async def get_issue_by_id_async(self, issue_id: str) -> Optional[dict]:
+        try:
+            return await self.async_issue_repository.get_issue_by_id(issue_id=issue_id)
+        except Exception as ex:
+            self.log.error(f"Error retrieving issue by issue_id {issue_id}: {ex}")
+            return None
+
     def create_issue(self, auth_user_id: uuid, auth_user_agent_id: uuid, subject: str, description: str, file_path: str = None) -> uuid:
+        new_issue, new_attachment = self._new_issue(auth_user_id, auth_user_agent_id, subject, description, file_path)
+        self.issue_repository.create_issue(new_issue, new_attachment)
+        self.recent_issues_cache.invalidate(str(auth_user_id).lower())
+        return new_issue
+
+    async def create_issue_async(self, auth_user_id: uuid, auth_user_agent_id: uuid, subject: str, description: str, file_path: str = None) -> Issue:
+        new_issue, new_attachment = self._new_issue(auth_user_id, auth_user_agent_id, subject, description, file_path)
+        await self.async_issue_repository.create_issue(new_issue, new_attachment)
+        self.recent_issues_cache.invalidate(str(auth_user_id).lower())
+        return new_issue
+
+    def _new_issue(self, auth_user_id, auth_user_agent_id, subject, description, file_path=None):
         if not auth_user_id or not subject or not description or not auth_user_agent_id:
             raise ValueError("All fields are required to create an issue.")
         new_issue = Issue(
@@ -98,21 +169,120 @@ class IssueService:
                 issue_id=new_issue.id,
                 file_path=file_path,
             )
-        self.issue_repository.create_issue(new_issue, new_attachment)
-        return new_issue
+        return new_issue, new_attachment
     
-    def find_issues(self, user_id: UUID, page: int, limit: int):
+    def validate_issues(self, items: List[dict]):
+        """
+        Check the items of a bulk create before anything is stored, attachments only
+        come from uploads so an item carrying its own file_path is refused
+        Args:
+            items (list): dicts with auth_user_id, auth_user_agent_id, subject and description
+        """
+        if not isinstance(items, list):
+            raise ValueError("issues must be a list")
+        if not items:
+            raise ValueError("At least one issue is required.")
+        if len(items) > ISSUE_BULK_LIMIT:
+            raise ValueError(f"At most {ISSUE_BULK_LIMIT} issues can be created per request.")
+
+        invalid = [str(index) for index, item in enumerate(items)
+                   if not isinstance(item, dict)
+                   or not all(item.get(field) for field in ("auth_user_id", "auth_user_agent_id", "subject", "description"))]
+        if invalid:
+            raise ValueError(f"All fields are required to create an issue. Invalid items: {', '.join(invalid)}")
+        with_file_path = [str(index) for index, item in enumerate(items) if "file_path" in item]
+        if with_file_path:
+            raise ValueError(f"file_path can not be set, upload the file instead. Invalid items: {', '.join(with_file_path)}")
+
+    def create_issues(self, items: List[dict], file_paths: dict = None) -> List[Issue]:
+        """
+        Validate every item first and then store all of them in one repository call
+        Args:
+            items (list): dicts with auth_user_id, auth_user_agent_id, subject and description
+            file_paths (dict): path of the uploaded attachment by item index
+        Return:
+            issues (list): created issues in the same order as items
+        """
+        self.validate_issues(items)
+        file_paths = file_paths or {}
+
+        created_at = datetime.utcnow()
+        issues = []
+        attachments = []
+        for index, item in enumerate(items):
+            new_issue = Issue(
+                id=uuid.uuid4(),
+                auth_user_id=item["auth_user_id"],
+                auth_user_agent_id=item["auth_user_agent_id"],
+                status=IssueStatus.NEW["id"],
+                subject=item["subject"],
+                description=item["description"],
+                created_at=created_at,
+                closed_at=None,
+                channel_plan_id=None
+            )
+            issues.append(new_issue)
+            if file_paths.get(index):
+                attachments.append(IssueAttachment(
+                    id=uuid.uuid4(),
+                    issue_id=new_issue.id,
+                    file_path=file_paths[index],
+                ))
+
+        created = self.issue_repository.create_issues(issues, attachments)
+        for auth_user_id in {str(issue.auth_user_id).lower() for issue in issues}:
+            self.recent_issues_cache.invalidate(auth_user_id)
+        return created
+
+    def find_issues(self, user_id: UUID, page: int, limit: int, cursor: str = None, total_mode: str = ISSUE_TOTAL_EXACT):
         if not user_id:
             raise ValueError("All fields are required to create an issue.")
+        self._validate_total_mode(total_mode)
+
+        if cursor is not None:
+            return self.issue_repository.find_after(
+                        user_id=user_id,
+                        cursor=cursor,
+                        limit=limit
+                    )
 
         issue_response = self.issue_repository.find(
                     user_id=user_id,
                     page=page,
-                    limit=limit
+                    limit=limit,
+                    total_mode=total_mode
                 )
         
         return issue_response
 
+    async def find_issues_async(self, user_id: UUID, page: int, limit: int, cursor: str = None, total_mode: str = ISSUE_TOTAL_EXACT) -> dict:
+        if not user_id:
+            raise ValueError("All fields are required to create an issue.")
+        self._validate_total_mode(total_mode)
+
+        if cursor is not None:
+            return await self.async_issue_repository.find_after(user_id=user_id, cursor=cursor, limit=limit)
+        return await self.async_issue_repository.find(user_id=user_id, page=page, limit=limit, total_mode=total_mode)
+
+    def search_issues(self, query: str, customer_id: UUID = None, user_id: UUID = None, cursor: str = None, limit: int = None) -> dict:
+        """
+        Ranked full text search over the issues of one user, or of every user of a
+        customer when no user is given
+        """
+        if not query or not query.strip():
+            raise ValueError("q is required to search issues.")
+        if not customer_id and not user_id:
+            raise ValueError("customer_id or user_id is required to search issues.")
+        if not limit or not 0 < limit <= ISSUE_SEARCH_MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {ISSUE_SEARCH_MAX_LIMIT}")
+
+        if user_id:
+            user_ids = [user_id]
+        else:
+            list_user_customer = self.auth_service.get_users_by_customer_list(customer_id) or []
+            user_ids = [item.auth_user_id for item in list_user_customer]
+        return self.issue_repository.search_by_users(user_ids=user_ids, query=query.strip(), cursor=cursor, limit=limit)
+
     def ask_generative_ai(self,question):
         """
         method to ask question to chat gpt
@@ -121,8 +291,10 @@ class IssueService:
         Return:
             answer (str): answer about ask
         """
-        ia_service=OpenAIService()
-        return ia_service.ask_chatgpt(question)
+        return self.openai_service.ask_chatgpt(question)
+
+    async def ask_generative_ai_async(self, question) -> Optional[str]:
+        return await self.openai_service.ask_chatgpt_async(question)
     
 
     def ask_predictive_analitic(self,user_id:UUID) -> str :
@@ -134,34 +306,28 @@ class IssueService:
             answer (str): answer about ask
         """
         self.log.info('entró en el predictive analitic')
-        self.log.info('leyendo el promp')
-        promp_to_ask=''
-        with open('openaipromp.txt', 'r', encoding='utf-8') as promp_file:
-            promp_to_ask = promp_file.read()
-
+        promp_to_ask=self._predictive_prompt()
 
-        auth_service=AuthService()
 
         #1. obtener compañia del usuario
-        customer_user=auth_service.get_customer_by_user_id(user_id)
+        customer_user=self.auth_service.get_customer_by_user_id(user_id)
         self.log.info(f'obteniendo el customer_user {customer_user}')
         if customer_user:
 
             #1. obtener el nombre compañia
-            customer_service=CustomerService()
-            customer=customer_service.get_customer_by_id(customer_user.customer_id)
+            customer=self.customer_service.get_customer_by_id(customer_user.customer_id)
             company_name=customer.name
             promp_to_ask=promp_to_ask.replace('{NOMBRECLIENTE}', customer.name)
             self.log.info(f'obteniendo el nombre del cliente {customer} {company_name}')
             #2. obtener el nombre del plan
-            plan=customer_service.get_plan_by_id(customer.plan_id)
+            plan=self.customer_service.get_plan_by_id(customer.plan_id)
             plan_name=plan.name
             promp_to_ask=promp_to_ask.replace('{PLAN}', plan_name)
             self.log.info(f'obteniendo el nombre del plan {plan} {plan_name}')
             #3. obtener un distinct de los ultimos incidentes reportados por el cliente distintos
-            list_top_issues=self.issue_repository.list_top_issues_by_user(user_id)
+            list_top_issues=self._recent_descriptions(user_id)
             if list_top_issues:
-                top_issues_descriptions =' - '.join(row[0] for row in list_top_issues)
+                top_issues_descriptions =' - '.join(list_top_issues)
                 self.log.info(f'top de issues {top_issues_descriptions}')
                 promp_to_ask=promp_to_ask.replace('{INCIDENTES}', top_issues_descriptions)
 
@@ -170,18 +336,72 @@ class IssueService:
 
 
             if promp_to_ask:
-                ia_service=OpenAIService()
-                return ia_service.ask_predictive_ai_chatgpt(promp_to_ask)
+                return self.openai_service.ask_predictive_ai_chatgpt(promp_to_ask)
             else:
                 return 'No se puede dar sugerencias en este momento'
         else:
             return 'No se pudo identificar al cliente para dar sugerencias'
 
+    async def ask_predictive_analitic_async(self, user_id: UUID) -> str:
+        """
+        same as ask_predictive_analitic, the customer and the recent issues of the
+        user are requested at the same time since neither needs the other
+        """
+        promp_to_ask = self._predictive_prompt()
+        customer_user = await self.auth_service.get_customer_by_user_id_async(user_id)
+        self.log.info(f'obteniendo el customer_user {customer_user}')
+        if not customer_user:
+            return 'No se pudo identificar al cliente para dar sugerencias'
+
+        customer, list_top_issues = await asyncio.gather(
+            self.customer_service.get_customer_by_id_async(customer_user.customer_id),
+            self._recent_descriptions_async(user_id)
+        )
+        plan = await self.customer_service.get_plan_by_id_async(customer.plan_id)
+        promp_to_ask = promp_to_ask.replace('{NOMBRECLIENTE}', customer.name).replace('{PLAN}', plan.name)
+        if list_top_issues:
+            promp_to_ask = promp_to_ask.replace('{INCIDENTES}', ' - '.join(list_top_issues))
+
+        if promp_to_ask:
+            return await self.openai_service.ask_predictive_ai_chatgpt_async(promp_to_ask)
+        else:
+            return 'No se puede dar sugerencias en este momento'
+
+    def _predictive_prompt(self) -> str:
+        self.log.info('leyendo el promp')
+        with open('openaipromp.txt', 'r', encoding='utf-8') as promp_file:
+            return promp_file.read()
+
+    def _recent_descriptions(self, user_id) -> List[str]:
+        """
+        Last distinct descriptions reported by the user, kept in recent_issues_cache
+        until the user creates another issue or the entry expires
+        """
+        key = str(user_id).lower()
+        descriptions = self.recent_issues_cache.get(key)
+        if descriptions is None:
+            descriptions = [row[0] for row in self.issue_repository.list_top_issues_by_user(user_id)]
+            self.recent_issues_cache.put(key, descriptions)
+        self.log.info(f'recent issues cache {self.recent_issues_cache.stats()}')
+        return descriptions
+
+    async def _recent_descriptions_async(self, user_id) -> List[str]:
+        key = str(user_id).lower()
+        descriptions = self.recent_issues_cache.get(key)
+        if descriptions is None:
+            descriptions = [row[0] for row in await self.async_issue_repository.list_top_issues_by_user(user_id)]
+            self.recent_issues_cache.put(key, descriptions)
+        return descriptions
+
     def get_all_issues(self):
         self.log.info(f'get_all_issues')
         issues = self.issue_repository.all()
         return issues
 
+    def stream_all_issues(self) -> Iterator[dict]:
+        self.log.info(f'stream_all_issues')
+        return self.issue_repository.iter_all()
+
     def assign_issue(self, issue_id: UUID= None, auth_user_agent_id: UUID = None):
             self.log.info(f'Service assign_issue')
             if not issue_id or not auth_user_agent_id:
@@ -194,12 +414,104 @@ class IssueService:
             
             return issue_response
 
-    def get_open_issues(self,page: int, limit: int):
+    def assign_issue_with_trace(self, issue_id: UUID = None, auth_user_agent_id: UUID = None, scope: str = None) -> IssueTrace:
+        self.log.info(f'Service assign_issue_with_trace')
+        trace = self._assign_trace(issue_id, auth_user_agent_id, scope)
+
+        return self.issue_repository.assign_issue_with_trace(
+                    issue_id=issue_id,
+                    auth_user_agent_id=auth_user_agent_id,
+                    issue_trace=trace
+                )
+
+    async def assign_issue_with_trace_async(self, issue_id: UUID = None, auth_user_agent_id: UUID = None, scope: str = None) -> IssueTrace:
+        trace = self._assign_trace(issue_id, auth_user_agent_id, scope)
+
+        return await self.async_issue_repository.assign_issue_with_trace(
+                    issue_id=issue_id,
+                    auth_user_agent_id=auth_user_agent_id,
+                    issue_trace=trace
+                )
+
+    def _assign_trace(self, issue_id, auth_user_agent_id, scope) -> IssueTrace:
+        if not issue_id or not auth_user_agent_id:
+            raise ValueError("Issue ID and Auth User Agent ID are required")
+
+        return IssueTrace(
+            id=uuid.uuid4(),
+            issue_id=issue_id,
+            auth_user_id=None,
+            auth_user_agent_id=auth_user_agent_id,
+            scope=scope,
+            created_at=datetime.utcnow(),
+            channel_plan_id=None
+        )
+
+    def assign_issues(self, auth_user_agent_id: UUID = None, issue_ids: List[str] = None, filters: dict = None, scope: str = None) -> dict:
+        """
+        Assign many issues to one agent, either a list of issue ids or the issues
+        matching filters (status, channel_plan_id, created_at, closed_at), at most ISSUE_BULK_LIMIT.
+        A filter must name one of the ISSUE_ASSIGNABLE_STATUS_NAMES, so solved issues are never reopened
+        Return:
+            result (dict): assigned ids and, for an id list, the ids that do not exist
+        """
+        self.log.info(f'Service assign_issues')
+        if not auth_user_agent_id or (issue_ids is None) == (filters is None):
+            raise ValueError("Auth User Agent ID and either issue_ids or filter are required")
+
+        if filters is not None:
+            if not isinstance(filters, dict):
+                raise ValueError("filter must be an object")
+            unknown = set(filters) - {"status", "channel_plan_id", "created_at", "closed_at"}
+            if unknown:
+                raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+            if filters.get("status") not in ISSUE_ASSIGNABLE_STATUS_NAMES:
+                raise ValueError(f"filter status must be one of {', '.join(ISSUE_ASSIGNABLE_STATUS_NAMES)}")
+            assigned = self.issue_repository.assign_issues_with_trace(
+                auth_user_agent_id=auth_user_agent_id, scope=scope, filters=filters, limit=ISSUE_BULK_LIMIT)
+            return {"assigned": [str(issue_id) for issue_id in assigned], "missing": []}
+
+        if not issue_ids or len(issue_ids) > ISSUE_BULK_LIMIT:
+            raise ValueError(f"Between 1 and {ISSUE_BULK_LIMIT} issue ids are required")
+        try:
+            requested = list(dict.fromkeys(UUID(str(issue_id)) for issue_id in issue_ids))
+        except ValueError:
+            raise ValueError("issue_ids must be valid UUIDs")
+
+        assigned = set(self.issue_repository.assign_issues_with_trace(
+            auth_user_agent_id=auth_user_agent_id, scope=scope, issue_ids=requested))
+        return {
+            "assigned": [str(issue_id) for issue_id in requested if issue_id in assigned],
+            "missing": [str(issue_id) for issue_id in requested if issue_id not in assigned]
+        }
+
+    def get_open_issues(self,page: int, limit: int, cursor: str = None, total_mode: str = ISSUE_TOTAL_EXACT):
         self.log.info('Receive IssueService get_open_issues')
+        self._validate_total_mode(total_mode)
+        if cursor is not None:
+            if not limit:
+                raise ValueError("All fields are required to get issues.")
+            return self.issue_repository.get_open_issues_after(cursor=cursor,
+                        limit=limit)
         if not page or not limit:
             raise ValueError("All fields are required to get issues.")
         return self.issue_repository.get_open_issues(page=page,
-                    limit=limit)
+                    limit=limit,
+                    total_mode=total_mode)
+
+    async def get_open_issues_async(self, page: int, limit: int, cursor: str = None, total_mode: str = ISSUE_TOTAL_EXACT) -> dict:
+        self._validate_total_mode(total_mode)
+        if cursor is not None:
+            if not limit:
+                raise ValueError("All fields are required to get issues.")
+            return await self.async_issue_repository.get_open_issues_after(cursor=cursor, limit=limit)
+        if not page or not limit:
+            raise ValueError("All fields are required to get issues.")
+        return await self.async_issue_repository.get_open_issues(page=page, limit=limit, total_mode=total_mode)
+
+    def _validate_total_mode(self, total_mode: str):
+        if total_mode not in ISSUE_TOTAL_MODES:
+            raise ValueError(f"total must be one of {', '.join(ISSUE_TOTAL_MODES)}")
     
     def create_issue_trace(self, issue_id:UUID, auth_user_id:UUID, auth_user_agent_id:UUID, scope:str):
         log.info(f'Receive request to create_issue_trace')
@@ -216,6 +528,15 @@ class IssueService:
         self.issue_repository.create_issue_trace(trace)    
 
 
-    def get_top_7_incident_types(self) -> List[Issue]:
-        issues = self.issue_repository.get_top_7_incident_types()
-        return issues
\ No newline at end of file
+    def get_top_7_incident_types(self, days: int = None) -> List[Issue]:
+        self._validate_top_window(days)
+        issues = self.issue_repository.get_top_7_incident_types(days=days)
+        return issues
+
+    async def get_top_7_incident_types_async(self, days: int = None) -> List[Issue]:
+        self._validate_top_window(days)
+        return await self.async_issue_repository.get_top_7_incident_types(days=days)
+
+    def _validate_top_window(self, days: int):
+        if days is not None and days not in ISSUE_TOP_WINDOWS:
+            raise ValueError(f"days must be one of {', '.join(str(window) for window in ISSUE_TOP_WINDOWS)}")
\ No newline at end of file
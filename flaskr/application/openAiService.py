@@ -6,7 +6,7 @@ import requests
 import re
 import os
 import logging
-
+from ..utils import AsyncHttpClient, async_http_client
 
 class OpenAIService:
     """
@@ -15,17 +15,18 @@ class OpenAIService:
         base_url (string): the Auth api url 
     """
 
-    def __init__(self):
+    def __init__(self, http_client: AsyncHttpClient = None):
         """
         service constructor 
         Args:
-            
+            http_client (AsyncHttpClient): client for the async calls, the shared one if None
         """
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger('default')
         self.logger.info('Instanced auth service')
         self.base_url = os.environ.get('OPENAI_API_PATH')
         self.token_openai = os.environ.get('TOKEN_OPENAI')
+        self.http_client = http_client or async_http_client
 
 
     def ask_chatgpt(self,question):
@@ -37,26 +38,13 @@ class OpenAIService:
             answer (str): answer about ask
         """
         url = self.base_url
-        headers = {
-            'Authorization': f'Bearer {self.token_openai}',
-            'Content-Type': 'application/json',
-        }
-        data = {
-            'model': 'gpt-4o',  
-            'messages': [{'role': 'user', 'content': question}],
-        }
+        headers = self._headers()
+        data = self._chat_data('gpt-4o', question)
         
         try:
             self.logger.info(f'init consuming api openai {url}')
             response = requests.post(url, headers=headers, json=data)
-            self.logger.info('quering open ai')
-            if response.status_code == 200:
-                self.logger.info('status code 200 quering open ai')
-                answer = response.json()['choices'][0]['message']['content']
-                return answer
-            else:
-                self.logger.info(f"error consuming open ai: {response.status_code}")
-                return None
+            return self._answer_from_response(response)
         except Exception as e:
             self.logger.info(f"Error comunication with open ai: {str(e)}")
             return None
@@ -72,29 +60,69 @@ class OpenAIService:
             answer (str): answer about ask
         """
         url = self.base_url
-        headers = {
-            'Authorization': f'Bearer {self.token_openai}',
-            'Content-Type': 'application/json',
-        }
-        data = {
-            'model': os.environ.get('OPENAI_PREDICTIVE_MODEL'),  
-            'messages': [{'role': 'user', 'content': context}],
-        }
+        headers = self._headers()
+        data = self._chat_data(os.environ.get('OPENAI_PREDICTIVE_MODEL'), context)
         
         try:
             self.logger.info(f'init consuming api openai {url}')
             response = requests.post(url, headers=headers, json=data)
-            self.logger.info('quering open ai')
-            if response.status_code == 200:
-                self.logger.info('status code 200 quering open ai')
-                answer = response.json()['choices'][0]['message']['content']
-                return answer
-            else:
-                self.logger.info(f"error consuming open ai: {response.status_code}")
-                return None
+            return self._answer_from_response(response)
+        except Exception as e:
+            self.logger.info(f"Error comunication with open ai: {str(e)}")
+            return None
+
+    async def ask_chatgpt_async(self,question):
+        """
+        same as ask_chatgpt without blocking the event loop
+        Args:
+            question (str): question to ask
+        Return:
+            answer (str): answer about ask
+        """
+        try:
+            self.logger.info(f'init consuming api openai {self.base_url}')
+            response = await self.http_client.post(self.base_url, headers=self._headers(),
+                                                   json=self._chat_data('gpt-4o', question))
+            return self._answer_from_response(response)
         except Exception as e:
             self.logger.info(f"Error comunication with open ai: {str(e)}")
             return None
-            
 
-   
\ No newline at end of file
+    async def ask_predictive_ai_chatgpt_async(self,context):
+        """
+        same as ask_predictive_ai_chatgpt without blocking the event loop
+        Args:
+            context (str): context
+        Return:
+            answer (str): answer about ask
+        """
+        try:
+            self.logger.info(f'init consuming api openai {self.base_url}')
+            response = await self.http_client.post(self.base_url, headers=self._headers(),
+                                                   json=self._chat_data(os.environ.get('OPENAI_PREDICTIVE_MODEL'), context))
+            return self._answer_from_response(response)
+        except Exception as e:
+            self.logger.info(f"Error comunication with open ai: {str(e)}")
+            return None
+
+    def _headers(self) -> dict:
+        return {
+            'Authorization': f'Bearer {self.token_openai}',
+            'Content-Type': 'application/json',
+        }
+
+    def _chat_data(self, model, content) -> dict:
+        return {
+            'model': model,
+            'messages': [{'role': 'user', 'content': content}],
+        }
+
+    def _answer_from_response(self, response):
+        self.logger.info('quering open ai')
+        if response.status_code == 200:
+            self.logger.info('status code 200 quering open ai')
+            answer = response.json()['choices'][0]['message']['content']
+            return answer
+        else:
+            self.logger.info(f"error consuming open ai: {response.status_code}")
+            return None
@@ -0,0 +1,35 @@
+import contextlib
+from asgiref.wsgi import WsgiToAsgi
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Route, Mount
+from .app import app, container, logger
+from .endpoint.Issues.AsyncIssues import AsyncIssue, AsyncIssues
+from .infrastructure.databases.postgres.async_db import async_engine, async_replica_engines
+from .utils import async_http_client
+
+
+@contextlib.asynccontextmanager
+async def lifespan(asgi_app):
+    logger.info('starting async application ...')
+    await run_in_threadpool(container.status_registry.refresh)
+    yield
+    logger.info('Closing async application ...')
+    if container.trace_writer is not None:
+        await run_in_threadpool(container.trace_writer.close)
+    await async_http_client.aclose()
+    await async_engine.dispose()
+    for replica_engine in async_replica_engines:
+        await replica_engine.dispose()
+
+
+wsgi_app = WsgiToAsgi(app)
+
+#resources, the async actions run on the event loop and every other request goes to the flask app
+asgi_app = Starlette(routes=[
+    Route('/issue/{action}', AsyncIssue),
+    Route('/issues/{action}/{user_id}', AsyncIssues),
+    Mount('/', app=wsgi_app),
+], lifespan=lifespan)
+asgi_app.state.service = container.issue_service
+asgi_app.state.wsgi_app = wsgi_app
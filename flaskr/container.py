@@ -0,0 +1,55 @@
+from config import Config
+from .application import IssueService, AuthService, CustomerService, OpenAIService
+from .infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from .infrastructure.databases.issue_postgresql_async_repository import IssuePostgresqlAsyncRepository
+from .infrastructure.databases.issue_state_registry import issue_state_registry
+from .infrastructure.databases.issue_trace_writer import BufferedIssueTraceWriter
+from .domain.constants import ISSUE_TRACE_WRITE_MODES, ISSUE_TRACE_WRITE_SYNC
+
+
+class Container:
+    """
+    This class holds the objects shared by every request, they are built once
+    when the application starts and handed to the resources
+    Attributes:
+        config (Config): application configuration
+        status_registry (IssueStateRegistry): issue states loaded once per process
+        trace_writer (BufferedIssueTraceWriter): issue trace buffer, None in the sync write mode
+        issue_repository (IssuePostgresqlRepository): issue repository
+        async_issue_repository (IssuePostgresqlAsyncRepository): issue repository for the async actions
+        auth_service (AuthService): auth api client
+        customer_service (CustomerService): customer api client
+        openai_service (OpenAIService): open ai client
+        issue_service (IssueService): issue use cases
+    """
+    def __init__(self, config: Config = None):
+        self.config = config or Config()
+        self.status_registry = issue_state_registry
+        self.trace_writer = self._trace_writer()
+        self.issue_repository = IssuePostgresqlRepository(status_registry=self.status_registry,
+                                                          trace_writer=self.trace_writer)
+        self.async_issue_repository = IssuePostgresqlAsyncRepository(status_registry=self.status_registry,
+                                                                     trace_writer=self.trace_writer)
+        self.auth_service = AuthService()
+        self.customer_service = CustomerService()
+        self.openai_service = OpenAIService()
+        self.issue_service = IssueService(
+            issue_repository=self.issue_repository,
+            auth_service=self.auth_service,
+            customer_service=self.customer_service,
+            openai_service=self.openai_service,
+            config=self.config,
+            async_issue_repository=self.async_issue_repository
+        )
+
+    def resource_kwargs(self) -> dict:
+        return {'service': self.issue_service}
+
+    def _trace_writer(self):
+        mode = self.config.ISSUE_TRACE_WRITE_MODE
+        if mode not in ISSUE_TRACE_WRITE_MODES:
+            raise ValueError(f"ISSUE_TRACE_WRITE_MODE must be one of {', '.join(ISSUE_TRACE_WRITE_MODES)}")
+        if mode == ISSUE_TRACE_WRITE_SYNC:
+            return None
+        return BufferedIssueTraceWriter(batch_size=int(self.config.ISSUE_TRACE_BATCH_SIZE),
+                                        max_delay=float(self.config.ISSUE_TRACE_MAX_DELAY))
@@ -1,3 +1,31 @@
 ISSUE_STATUS_SOLVED='791353c6-3899-4d35-bcd9-af8775e240bf'
 ISSUE_STATUS_OPEN='574408a7-3aa0-4eab-b279-62ed10e6107e'
 ISSUE_STATUS_INPROGRESS='18e7d7dd-247b-4e27-aa0e-4f15e8ba5930'
+ISSUE_STATUS_SOLVED_NAME='Solved'
+ISSUE_STATUS_OPEN_NAME='Created'
+ISSUE_STATUS_INPROGRESS_NAME='In Progress'
+
+ISSUE_TOTAL_EXACT='exact'
+ISSUE_TOTAL_CACHED='cached'
+ISSUE_TOTAL_ESTIMATED='estimated'
+ISSUE_TOTAL_MODES=[ISSUE_TOTAL_EXACT, ISSUE_TOTAL_CACHED, ISSUE_TOTAL_ESTIMATED]
+ISSUE_COUNTER_OPEN='open'
+
+ISSUE_DASHBOARD_COLUMNS=('status', 'channel_plan_id', 'created_at')
+ISSUE_BUCKET_DAY='day'
+ISSUE_BUCKET_WEEK='week'
+ISSUE_BUCKET_MONTH='month'
+ISSUE_BUCKETS=[ISSUE_BUCKET_DAY, ISSUE_BUCKET_WEEK, ISSUE_BUCKET_MONTH]
+
+ISSUE_BULK_LIMIT=500
+ISSUE_ASSIGNABLE_STATUS_NAMES=[ISSUE_STATUS_OPEN_NAME, ISSUE_STATUS_INPROGRESS_NAME]
+
+ISSUE_TOP_INCIDENT_TYPES=7
+ISSUE_TOP_WINDOWS=[7, 30]
+ISSUE_TRACE_WRITE_SYNC='sync'
+ISSUE_TRACE_WRITE_BUFFERED='buffered'
+ISSUE_TRACE_WRITE_MODES=[ISSUE_TRACE_WRITE_SYNC, ISSUE_TRACE_WRITE_BUFFERED]
+
+ISSUE_SEARCH_CONFIG='spanish'
+ISSUE_SEARCH_DEFAULT_LIMIT=20
+ISSUE_SEARCH_MAX_LIMIT=100
@@ -1 +1,2 @@
-from .issue_repository import *
\ No newline at end of file
+from .issue_repository import *
+from .issue_async_repository import *
\ No newline at end of file
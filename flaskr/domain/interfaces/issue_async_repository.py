@@ -0,0 +1,34 @@
+from typing import List, Optional
+from ..models.issue import Issue
+from ..models.issue_attachment import IssueAttachment
+from ..models.issue_trace import IssueTrace
+class IssueAsyncRepository:
+    async def list_issues_period_by_users (self, user_ids, year, month) -> List[Issue]:
+        raise NotImplementedError
+
+    async def get_issue_by_id(self, issue_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def create_issue(self, issue: Issue, attachment: IssueAttachment = None) -> Issue:
+        raise NotImplementedError
+
+    async def find(self, user_id, page, limit, total_mode) -> dict:
+        raise NotImplementedError
+
+    async def find_after(self, user_id, cursor, limit) -> dict:
+        raise NotImplementedError
+
+    async def get_open_issues(self, page, limit, total_mode) -> dict:
+        raise NotImplementedError
+
+    async def get_open_issues_after(self, cursor, limit) -> dict:
+        raise NotImplementedError
+
+    async def list_top_issues_by_user(self, user_id) -> List[tuple]:
+        raise NotImplementedError
+
+    async def assign_issue_with_trace(self, issue_id, auth_user_agent_id, issue_trace: IssueTrace) -> IssueTrace:
+        raise NotImplementedError
+
+    async def get_top_7_incident_types(self, days: int = None) -> List[Issue]:
+        raise NotImplementedError
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Iterator
 from uuid import UUID
 from ..models.issue import Issue
 from ..models.issue_attachment import IssueAttachment
@@ -9,8 +9,23 @@ class IssueRepository:
     
     def list_issues_period (self,user_id,year, month) -> List[Issue]:
         raise NotImplementedError
+
+    def list_issues_period_by_users (self,user_ids,year, month) -> List[Issue]:
+        raise NotImplementedError
     
-    def list_issues_filtered (self, user_id, status, channel_plan_id, created_at, closed_at) -> List[Issue]:
+    def list_issue_columns_by_users (self, user_ids, columns, status, channel_plan_id, created_at, closed_at) -> List[tuple]:
+        raise NotImplementedError
+
+    def iter_issue_columns_by_users (self, user_ids, columns, status, channel_plan_id, created_at, closed_at) -> Iterator[tuple]:
+        raise NotImplementedError
+
+    def iter_issues_period_by_users (self, user_ids, year, month) -> Iterator[Issue]:
+        raise NotImplementedError
+
+    def iter_all(self) -> Iterator[dict]:
+        raise NotImplementedError
+
+    def count_issues_by_users (self, user_ids, bucket, status, channel_plan_id, created_at, closed_at) -> List[tuple]:
         raise NotImplementedError
     
     def get_users_by_customer_list (self, user_id, status, channel_plan_id, created_at, closed_at) -> List[Issue]:
@@ -19,12 +34,21 @@ class IssueRepository:
     def create_issue(self, issue_data: dict, new_attachment:dict) -> Issue:
         raise NotImplementedError
     
+    def create_issues(self, issues: List[Issue], attachments: List[IssueAttachment]) -> List[Issue]:
+        raise NotImplementedError
+
     def create_issue_attachment(self, issue_attachment: dict)-> IssueAttachment:
         raise NotImplementedError
     
-    def find(self, user_id = None,page=None,limit=None):
+    def find(self, user_id = None,page=None,limit=None,total_mode=None):
+        raise NotImplementedError
+
+    def find_after(self, user_id = None,cursor=None,limit=None):
         raise NotImplementedError
     
+    def search_by_users(self, user_ids, query, cursor=None, limit=None) -> dict:
+        raise NotImplementedError
+
     def get_issue_by_id(self, issue_id) -> Optional[Issue]:
         raise NotImplementedError   
 
@@ -34,11 +58,20 @@ class IssueRepository:
     def assign_issue(self) -> dict:
         raise NotImplementedError
 
-    def get_open_issues(self,page=None,limit=None):
+    def assign_issue_with_trace(self, issue_id, auth_user_agent_id, issue_trace: IssueTrace) -> IssueTrace:
+        raise NotImplementedError
+
+    def assign_issues_with_trace(self, auth_user_agent_id, scope, issue_ids=None, filters=None, limit=None) -> List[UUID]:
+        raise NotImplementedError
+
+    def get_open_issues(self,page=None,limit=None,total_mode=None):
+        raise NotImplementedError
+
+    def get_open_issues_after(self,cursor=None,limit=None):
         raise NotImplementedError
 
     def create_issue_trace(self,issue_trace:IssueTrace):
         raise NotImplementedError
     
-    def get_top_7_incident_types(self) -> List[Issue]:
+    def get_top_7_incident_types(self, days: int = None) -> List[Issue]:
         raise NotImplementedError
\ No newline at end of file
@@ -4,7 +4,7 @@ from datetime import datetime
 class IssueTrace:
     def __init__(self, id:UUID,issue_id:UUID,auth_user_id:UUID,auth_user_agent_id:UUID,scope:str,created_at:datetime,channel_plan_id:UUID):
         self.id=id
-        self.issue_id=issue_id,
+        self.issue_id=issue_id
         self.auth_user_id=auth_user_id
         self.auth_user_agent_id=auth_user_agent_id
         self.scope=scope
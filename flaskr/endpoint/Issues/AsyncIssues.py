@@ -0,0 +1,223 @@
+from http import HTTPStatus
+from starlette.endpoints import HTTPEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from flaskr.application.issue_service import IssueService
+from ...infrastructure.databases.postgres.async_db import AsyncSession, AsyncReadSession
+from ...utils import Logger
+from ...domain.constants import ISSUE_TOTAL_EXACT
+
+log = Logger()
+
+
+class AsyncResource(HTTPEndpoint):
+    """
+    Runs the async variant of an action on the event loop and answers with its
+    (body, status). Actions without an async variant, and requests the variant does
+    not cover, are handed to the flask application stored in app.state.wsgi_app
+    Attributes:
+        actions (dict): async action method name by http method and action
+    """
+    actions = {}
+
+    async def dispatch(self):
+        request = Request(self.scope, receive=self.receive)
+        action = self._action(request)
+        if action is None:
+            await request.app.state.wsgi_app(self.scope, self.receive, self.send)
+            return
+
+        try:
+            body, status = await action(request, request.app.state.service)
+        finally:
+            await AsyncReadSession.remove()
+            await AsyncSession.remove()
+        await JSONResponse(body, status_code=status)(self.scope, self.receive, self.send)
+
+    def _action(self, request: Request):
+        action_name = self.actions.get(request.method, {}).get(request.path_params.get('action'))
+        if action_name is None or 'stream' in request.query_params:
+            return None
+        if request.method == 'POST' and request.headers.get('content-type', '').split(';')[0] != 'application/json':
+            return None
+        return getattr(self, action_name)
+
+
+class AsyncIssue(AsyncResource):
+    actions = {
+        'GET': {
+            'getIssuesByCustomer': 'getIssuesByCustomer',
+            'get_issue_by_id': 'getIssueDetail',
+            'getOpenIssues': 'getOpenIssues',
+            'getIAResponse': 'getIAResponse',
+            'getIAPredictiveAnswer': 'get_ia_predictive_answer',
+            'getTopSevenIssues': 'get_top_seven_issues',
+        },
+        'POST': {
+            'post': 'createIssue',
+            'assignIssue': 'assignIssue',
+        }
+    }
+
+    async def getIssuesByCustomer(self, request: Request, service: IssueService):
+        try:
+            log.info('Receive request to get issues by customer')
+            issue_list = await service.list_issues_period_async(
+                customer_id=request.query_params.get('customer_id'),
+                year=request.query_params.get('year'),
+                month=request.query_params.get('month')
+            )
+            list_issues = []
+            if issue_list:
+                list_issues = [issue.to_dict() for issue in issue_list]
+
+            return list_issues, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f'Some error occurred trying to get issue list: {ex}')
+            return {'message': 'Something was wrong trying to get issue list'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    async def getIssueDetail(self, request: Request, service: IssueService):
+        try:
+            issue = await service.get_issue_by_id_async(issue_id=request.query_params.get('issue_id'))
+            log.info(f'Issue retrieved: {issue}')
+
+            if issue:
+                issue_detail = {
+                    "created_at": issue.get("created_at"),
+                    "id": issue.get("id"),
+                    "subject": issue.get("subject"),
+                    "description": issue.get("description"),
+                    "status": issue.get("status")
+                }
+                return issue_detail, HTTPStatus.OK
+            else:
+                return {'message': 'Issue not found'}, HTTPStatus.NOT_FOUND
+
+        except Exception as ex:
+            log.error(f'Error trying to get issue detail: {ex}')
+            return {'message': 'Something went wrong trying to get the issue detail'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    async def getOpenIssues(self, request: Request, service: IssueService):
+        try:
+            log.info(f'Receive request to getOpenIssues')
+            cursor = request.query_params.get('cursor')
+            page = int(request.query_params.get('page')) if cursor is None else None
+            limit = int(request.query_params.get('limit'))
+            total_mode = request.query_params.get('total', ISSUE_TOTAL_EXACT)
+            issues_list = await service.get_open_issues_async(page=page, limit=limit, cursor=cursor, total_mode=total_mode)
+
+            return issues_list, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': 'There was an error validate the values'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f'Some error occurred trying to get open issues list: {ex}')
+            return {'message': 'Something was wrong trying to get open issues list'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    async def getIAResponse(self, request: Request, service: IssueService):
+        try:
+            log.info(f'Receive request to ask to open ai')
+            answer = await service.ask_generative_ai_async(request.query_params.get('question'))
+            return {
+                'answer': answer
+            }, HTTPStatus.OK
+
+        except Exception as ex:
+            log.error(f'Some error occurred trying ask open ai: {ex}')
+            return {'message': 'Something was wrong trying ask open ai'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    async def get_ia_predictive_answer(self, request: Request, service: IssueService):
+        try:
+            log.info(f'Receive request ai predictive')
+            answer = await service.ask_predictive_analitic_async(request.query_params.get('user_id'))
+            return {
+                'answer': answer
+            }, HTTPStatus.OK
+
+        except Exception as ex:
+            log.error(f'Some error occurred trying query ai predictive: {ex}')
+            return {'message': 'Something was wrong trying query ai predictive'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    async def get_top_seven_issues(self, request: Request, service: IssueService):
+        try:
+            log.info('Receive request to get top seven issues')
+            days = request.query_params.get('days')
+            days = int(days) if days else None
+            list_issues = await service.get_top_7_incident_types_async(days=days)
+
+            list_issues_d = []
+            if list_issues:
+                list_issues_d = [issue.to_dict() for issue in list_issues]
+
+            return list_issues_d, HTTPStatus.OK
+
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f'Some error occurred trying to get top seven issues list: {ex}')
+            return {'message': 'Something was wrong trying to get top seven issues list'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    async def createIssue(self, request: Request, service: IssueService):
+        log.info(f'Receive request createIssue')
+        try:
+            data = await request.json()
+            issue = await service.create_issue_async(
+                auth_user_id=data.get("auth_user_id"),
+                auth_user_agent_id=data.get('auth_user_agent_id'),
+                subject=data.get("subject"),
+                description=data.get("description")
+            )
+            radicado = str(issue.id).split('-')[-1]
+
+            log.info(f'Return Issue: {issue.id}')
+            return {"message": f"Issue creado con numero de Radicado: {radicado}"}, HTTPStatus.CREATED
+
+        except Exception as ex:
+            log.error(f"Error while creating issue: {ex}")
+            return {"message": "Error creating issue"}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    async def assignIssue(self, request: Request, service: IssueService):
+        try:
+            log.info(f'Receive request to assignIssue')
+            data = await request.json()
+            await service.assign_issue_with_trace_async(issue_id=str(request.query_params.get('issue_id')),
+                                                        auth_user_agent_id=data.get('auth_user_agent_id'),
+                                                        scope='assignIssue - Estado: ISSUE_STATUS_INPROGRESS')
+            return {"message": f"Issue Asignado correctamente"}, HTTPStatus.OK
+
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f"Error while Assign issue: {ex}")
+            return {"message": "Error Assign issue"}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+class AsyncIssues(AsyncResource):
+    actions = {
+        'GET': {
+            'find': 'find',
+        }
+    }
+
+    async def find(self, request: Request, service: IssueService):
+        try:
+            log.info(f'Receive request to get issues by user')
+            cursor = request.query_params.get('cursor')
+            page = int(request.query_params.get('page')) if cursor is None else None
+            limit = int(request.query_params.get('limit'))
+            total_mode = request.query_params.get('total', ISSUE_TOTAL_EXACT)
+            issue_list = await service.find_issues_async(user_id=request.path_params.get('user_id'), page=page,
+                                                         limit=limit, cursor=cursor, total_mode=total_mode)
+
+            return issue_list, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': 'There was an error validate the values'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f'Some error occurred trying to get issue list: {ex}')
+            return {'message': 'Something was wrong trying to get issue list'}, HTTPStatus.INTERNAL_SERVER_ERROR
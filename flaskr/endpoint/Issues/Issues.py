@@ -1,28 +1,31 @@
 import random
 from flask_restful import Resource
-from flask import jsonify, request
+from flask import jsonify, request, Response, stream_with_context, current_app
+from werkzeug.utils import secure_filename
 import os
-from config import Config
+import json
+from uuid import uuid4
 from http import HTTPStatus
 from flaskr.application.issue_service import IssueService
-from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
-from ...utils import Logger
-from ...domain.constants import ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN,ISSUE_STATUS_INPROGRESS
+from ...utils import Logger, STREAM_FORMATS, stream_chunks
+from ...domain.constants import ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN,ISSUE_STATUS_INPROGRESS,ISSUE_TOTAL_EXACT,ISSUE_BUCKET_DAY,ISSUE_SEARCH_DEFAULT_LIMIT
 
 log = Logger()
 
 class Issue(Resource):
 
-    def __init__(self):
-        config = Config()
-        self.issue_repository = IssuePostgresqlRepository()
-        self.service = IssueService(self.issue_repository)
+    def __init__(self, service: IssueService):
+        self.service = service
 
     def post(self,action=None):
         if action == 'assignIssue':
             return self.assignIssue()
         elif action =='post':
             return self.createIssue()
+        elif action == 'bulk':
+            return self.createIssues()
+        elif action == 'assignIssues':
+            return self.assignIssues()
         else:
             return {"message": "Action not found"}, HTTPStatus.NOT_FOUND
 
@@ -45,11 +48,7 @@ class Issue(Resource):
             log.info(f"auth_user_id at {auth_user_id}")
            
             if file:
-                upload_directory = os.path.join(os.getcwd(), 'uploads')
-                os.makedirs(upload_directory, exist_ok=True)
-                file_path = os.path.join(upload_directory, file.filename)
-                file.save(file_path)
-                log.info(f"File uploaded successfully at {file_path}")
+                file_path = self._save_upload(file)
 
             issue = self.service.create_issue(
                 auth_user_id=auth_user_id,
@@ -67,11 +66,76 @@ class Issue(Resource):
             log.error(f"Error while creating issue: {ex}")
             return {"message": "Error creating issue"}, HTTPStatus.INTERNAL_SERVER_ERROR
 
+    def createIssues(self):
+        log.info(f'Receive request createIssues')
+        try:
+            if request.is_json:
+                data = request.get_json(silent=True)
+                if not isinstance(data, dict):
+                    raise ValueError("body must be an object with the issues list")
+                items = data.get('issues')
+            else:
+                items = json.loads(request.form.get('issues', '[]'))
+            # attachments only come from uploads, never from a path sent by the client
+            for item in items if isinstance(items, list) else []:
+                if isinstance(item, dict):
+                    item.pop('file_path', None)
+            self.service.validate_issues(items)
+
+            file_paths = {}
+            for index in range(len(items)):
+                file = request.files.get(f'file_{index}')
+                if file:
+                    file_paths[index] = self._save_upload(file)
+
+            issues = self.service.create_issues(items, file_paths)
+            radicados = [str(issue.id).split('-')[-1] for issue in issues]
+
+            log.info(f'Return {len(radicados)} issues')
+            return {"radicados": radicados}, HTTPStatus.CREATED
+
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f"Error while creating issues: {ex}")
+            return {"message": "Error creating issues"}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def assignIssues(self):
+        try:
+            log.info(f'Receive request to assignIssues')
+            data = request.get_json()
+            result = self.service.assign_issues(
+                auth_user_agent_id=data.get('auth_user_agent_id'),
+                issue_ids=data.get('issue_ids'),
+                filters=data.get('filter'),
+                scope='assignIssues - Estado: ISSUE_STATUS_INPROGRESS'
+            )
+            return result, HTTPStatus.OK
+
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f"Error while Assign issues: {ex}")
+            return {"message": "Error Assign issues"}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def _save_upload(self, file) -> str:
+        # the client picks the file name, keep only its safe part and make it unique
+        upload_directory = current_app.config['UPLOAD_FOLDER']
+        os.makedirs(upload_directory, exist_ok=True)
+        file_path = os.path.join(upload_directory, f'{uuid4().hex}_{secure_filename(file.filename) or "upload"}')
+        file.save(file_path)
+        log.info(f"File uploaded successfully at {file_path}")
+        return file_path
+
     def get(self, action=None):
         if action == 'getIssuesByCustomer':
             return self.getIssuesByCustomer()
         elif action == 'getIssuesDasboard':
             return self.getIssuesDasboard()
+        elif action == 'getIssuesDashboardSummary':
+            return self.getIssuesDashboardSummary()
         elif action == 'getIAResponse':
             return self.getIAResponse()
         elif action== 'find':
@@ -84,6 +148,8 @@ class Issue(Resource):
             return self.getAllIssues()
         elif action == 'getOpenIssues':
             return self.getOpenIssues()
+        elif action == 'search':
+            return self.searchIssues()
         elif action == 'getTopSevenIssues':
             return self.get_top_seven_issues()
         elif action == 'getPredictedData':
@@ -98,6 +164,12 @@ class Issue(Resource):
             customer_id = request.args.get('customer_id')
             year = request.args.get('year')
             month = request.args.get('month')
+            stream_format = request.args.get('stream')
+            if stream_format:
+                self._validate_stream_format(stream_format)
+                issues = self.service.stream_issues_period(customer_id=customer_id,year=year,month=month)
+                return self._stream((issue.to_dict() for issue in issues), stream_format)
+
             issue_list = self.service.list_issues_period(customer_id=customer_id,year=year,month=month)
             list_issues=[]
             if issue_list:
@@ -105,6 +177,9 @@ class Issue(Resource):
 
             
             return list_issues, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
         except Exception as ex:
             log.error(f'Some error occurred trying to get issue list: {ex}')
             return {'message': 'Something was wrong trying to get issue list'}, HTTPStatus.INTERNAL_SERVER_ERROR    
@@ -130,36 +205,103 @@ class Issue(Resource):
             channel_plan_id = request.args.get('channel_plan_id')
             created_at = request.args.get('created_at')
             closed_at = request.args.get('closed_at')
+            stream_format = request.args.get('stream')
 
             log.info(f'Receive request to getIssuesDashboard {customer_id}  {status} {channel_plan_id} {created_at} {closed_at}')
 
-            issue_list = self.service.list_issues_filtered(
+            if stream_format:
+                self._validate_stream_format(stream_format)
+                issue_rows = self.service.stream_issues_dashboard(
+                    customer_id=customer_id,
+                    status=status,
+                    channel_plan_id=channel_plan_id,
+                    created_at=created_at,
+                    closed_at=closed_at
+                )
+                return self._stream((self._to_dashboard_item(row) for row in issue_rows), stream_format)
+
+            issue_rows = self.service.list_issues_dashboard(
                 customer_id=customer_id,
                 status=status,
                 channel_plan_id=channel_plan_id,
                 created_at=created_at,
                 closed_at=closed_at
             )
-            log.info(f'issue list {issue_list}')
 
             list_issues = []
-            if issue_list:
-                list_issues = [
-                    {
-                        "status": issue.get("status"),
-                        "channel_plan_id": issue.get("channel_plan_id"),
-                        "created_at": issue.get("created_at")
-                    } for issue in issue_list
-                ]
+            if issue_rows:
+                list_issues = [self._to_dashboard_item(row) for row in issue_rows]
 
-            log.info(f'list issue {list_issues}')
+            log.info(f'list issue size {len(list_issues)}')
 
             return list_issues, HTTPStatus.OK
 
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
         except Exception as ex:
             log.error(f'Error trying to get issue list: {ex}')
             return {'message': 'Something went wrong trying to get the issue dashboard'}, HTTPStatus.INTERNAL_SERVER_ERROR
         
+    def _to_dashboard_item(self, row):
+        issue_status, issue_channel_plan_id, issue_created_at = row
+        return {
+            "status": str(issue_status),
+            "channel_plan_id": str(issue_channel_plan_id),
+            "created_at": issue_created_at.isoformat() if issue_created_at else None
+        }
+
+    def _validate_stream_format(self, stream_format):
+        if stream_format not in STREAM_FORMATS:
+            raise ValueError(f"stream must be one of {', '.join(STREAM_FORMATS)}")
+
+    def _stream(self, items, stream_format):
+        """
+        Send items as they are read instead of building the whole body first,
+        as a chunked JSON array (stream=json) or newline delimited JSON (stream=ndjson)
+        """
+        return Response(stream_with_context(stream_chunks(items, stream_format)),
+                        mimetype=STREAM_FORMATS[stream_format])
+
+    def getIssuesDashboardSummary(self):
+        try:
+            customer_id = request.args.get('customer_id')
+            bucket = request.args.get('bucket', ISSUE_BUCKET_DAY)
+            status = request.args.get('status')
+            channel_plan_id = request.args.get('channel_plan_id')
+            created_at = request.args.get('created_at')
+            closed_at = request.args.get('closed_at')
+
+            log.info(f'Receive request to getIssuesDashboardSummary {customer_id} {bucket} {status} {channel_plan_id} {created_at} {closed_at}')
+
+            issue_totals = self.service.count_issues_dashboard(
+                customer_id=customer_id,
+                bucket=bucket,
+                status=status,
+                channel_plan_id=channel_plan_id,
+                created_at=created_at,
+                closed_at=closed_at
+            )
+
+            list_totals = []
+            if issue_totals:
+                list_totals = [
+                    {
+                        "status": str(issue_status),
+                        "channel_plan_id": str(issue_channel_plan_id),
+                        "bucket": issue_bucket.isoformat() if issue_bucket else None,
+                        "total": total
+                    } for issue_status, issue_channel_plan_id, issue_bucket, total in issue_totals
+                ]
+
+            return list_totals, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f'Error trying to get issue dashboard summary: {ex}')
+            return {'message': 'Something went wrong trying to get the issue dashboard summary'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
     def getIssueDetail(self):
         try:
             issue_id = request.args.get('issue_id')
@@ -214,10 +356,18 @@ class Issue(Resource):
     def getAllIssues(self):
         try:
             log.info(f'Receive request to getAllIssues')
+            stream_format = request.args.get('stream')
+            if stream_format:
+                self._validate_stream_format(stream_format)
+                return self._stream(self.service.stream_all_issues(), stream_format)
+
             list_issues=[]
             list_issues = self.service.get_all_issues()
             
             return list_issues, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
         except Exception as ex:
             log.error(f'Some error occurred trying to get all issues list: {ex}')
             return {'message': 'Something was wrong trying to get all issues list'}, HTTPStatus.INTERNAL_SERVER_ERROR 
@@ -225,15 +375,38 @@ class Issue(Resource):
     def getOpenIssues(self):
         try:
             log.info(f'Receive request to getOpenIssues')
-            page = int(request.args.get('page'))
+            cursor = request.args.get('cursor')
+            page = int(request.args.get('page')) if cursor is None else None
             limit = int(request.args.get('limit'))
-            issues_list = self.service.get_open_issues(page=page,limit=limit)
+            total_mode = request.args.get('total', ISSUE_TOTAL_EXACT)
+            issues_list = self.service.get_open_issues(page=page,limit=limit,cursor=cursor,total_mode=total_mode)
             
             return issues_list, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': 'There was an error validate the values'}, HTTPStatus.BAD_REQUEST
         except Exception as ex:
             log.error(f'Some error occurred trying to get open issues list: {ex}')
             return {'message': 'Something was wrong trying to get open issues list'}, HTTPStatus.INTERNAL_SERVER_ERROR 
 
+    def searchIssues(self):
+        try:
+            log.info(f'Receive request to searchIssues')
+            limit = int(request.args.get('limit', ISSUE_SEARCH_DEFAULT_LIMIT))
+            issues_page = self.service.search_issues(query=request.args.get('q'),
+                                                     customer_id=request.args.get('customer_id'),
+                                                     user_id=request.args.get('user_id'),
+                                                     cursor=request.args.get('cursor'),
+                                                     limit=limit)
+
+            return issues_page, HTTPStatus.OK
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
+        except Exception as ex:
+            log.error(f'Some error occurred trying to search issues: {ex}')
+            return {'message': 'Something was wrong trying to search issues'}, HTTPStatus.INTERNAL_SERVER_ERROR
+
     def assignIssue(self):
         try:
             log.info(f'Receive request to assignIssue')
@@ -242,9 +415,9 @@ class Issue(Resource):
             auth_user_agent_id = data.get('auth_user_agent_id')
 
 
-            self.service.assign_issue(issue_id=issue_id,auth_user_agent_id=auth_user_agent_id)
-            #Trace de asignacion
-            self.service.create_issue_trace(issue_id,None,auth_user_agent_id, 'assignIssue - Estado: ISSUE_STATUS_INPROGRESS')
+            #Asignacion y trace en una sola transaccion
+            self.service.assign_issue_with_trace(issue_id=issue_id,auth_user_agent_id=auth_user_agent_id,
+                                                 scope='assignIssue - Estado: ISSUE_STATUS_INPROGRESS')
             return {"message": f"Issue Asignado correctamente"}, HTTPStatus.OK
 
         except ValueError as ex:
@@ -258,7 +431,9 @@ class Issue(Resource):
         try:
             log.info('Receive request to get top seven issues')
             list_issues=[]
-            list_issues = self.service.get_top_7_incident_types()
+            days = request.args.get('days')
+            days = int(days) if days else None
+            list_issues = self.service.get_top_7_incident_types(days=days)
 
             list_issues_d=[]
             if list_issues:
@@ -266,7 +441,10 @@ class Issue(Resource):
 
             
             return list_issues_d, HTTPStatus.OK
-            
+
+        except ValueError as ex:
+            log.error(f'There was an error validate the values {ex}')
+            return {'message': f'{ex}'}, HTTPStatus.BAD_REQUEST
         except Exception as ex:
             log.error(f'Some error occurred trying to get top seven issues list: {ex}')
             return {'message': 'Something was wrong trying to get top seven issues list'}, HTTPStatus.INTERNAL_SERVER_ERROR 
@@ -300,10 +478,8 @@ class Issue(Resource):
 
 
 class Issues(Resource):
-    def __init__(self):
-        config = Config()
-        self.issue_repository = IssuePostgresqlRepository()
-        self.service = IssueService(self.issue_repository)
+    def __init__(self, service: IssueService):
+        self.service = service
 
     def get(self, action=None, user_id=None):
         if action== 'find':
@@ -315,9 +491,11 @@ class Issues(Resource):
     def find(self, user_id:str):
         try:
             log.info(f'Receive request to get issues by user')
-            page = int(request.args.get('page'))
+            cursor = request.args.get('cursor')
+            page = int(request.args.get('page')) if cursor is None else None
             limit = int(request.args.get('limit'))
-            issue_list = self.service.find_issues(user_id=user_id,page=page,limit=limit)
+            total_mode = request.args.get('total', ISSUE_TOTAL_EXACT)
+            issue_list = self.service.find_issues(user_id=user_id,page=page,limit=limit,cursor=cursor,total_mode=total_mode)
 
             return issue_list, HTTPStatus.OK
         except ValueError as ex:
@@ -1,2 +1,3 @@
 from .model_sqlalchemy import *
+from .issue_state_registry import *
 from .issue_postresql_repository import *
\ No newline at end of file
@@ -0,0 +1,247 @@
+import asyncio
+from math import ceil
+from sqlalchemy import func, desc, select, update
+from datetime import datetime, timedelta
+from typing import List, Optional
+from ...utils import Logger
+from ...domain.models import Issue, IssueAttachment, IssueTrace
+from ...domain.interfaces import IssueAsyncRepository
+from ...infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy, IssueIncidentTypeSqlAlchemy, IssueIncidentTypeDailySqlAlchemy
+from ...domain.constants import ISSUE_STATUS_OPEN, ISSUE_STATUS_INPROGRESS, ISSUE_TOTAL_EXACT, ISSUE_TOTAL_CACHED, ISSUE_TOTAL_ESTIMATED, ISSUE_COUNTER_OPEN, ISSUE_TOP_INCIDENT_TYPES
+from .postgres.async_db import AsyncSession, AsyncReadSession
+from .issue_state_registry import IssueStateRegistry, issue_state_registry
+from .issue_trace_writer import BufferedIssueTraceWriter
+from .issue_postresql_repository import USER_IDS_CHUNK_SIZE, _chunks
+from ..mappers.issue_sqlalchemy_mapper import IssueSqlAlchemyMapper
+
+log = Logger()
+
+
+class IssuePostgresqlAsyncRepository(IssueSqlAlchemyMapper, IssueAsyncRepository):
+    """
+    Same queries as IssuePostgresqlRepository for the actions served by the asgi
+    entry point, run through sqlalchemy asyncio and asyncpg so a request waiting on
+    the database does not hold a worker. The registry and the trace writer block,
+    so they are called from the default executor
+    Attributes:
+        session (async_scoped_session): one AsyncSession per asyncio task, for the writes
+        read_session (async_scoped_session): one AsyncReadSession per asyncio task, reads from a
+            replica until session writes in the same task
+        status_registry (IssueStateRegistry): issue states by id and by name
+        trace_writer (BufferedIssueTraceWriter): same as IssuePostgresqlRepository.trace_writer
+    """
+    def __init__(self, status_registry: IssueStateRegistry = issue_state_registry, session=AsyncSession,
+                 trace_writer: BufferedIssueTraceWriter = None, read_session=AsyncReadSession):
+        self.session = session
+        self.read_session = read_session
+        self.status_registry = status_registry
+        self.trace_writer = trace_writer
+
+    async def list_issues_period_by_users(self, user_ids, year, month) -> List[Issue]:
+        async with self.read_session() as session:
+            issues = []
+            for chunk in _chunks(user_ids, USER_IDS_CHUNK_SIZE):
+                statement = self._solved_in_period(
+                    select(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.auth_user_id.in_(chunk)),
+                    year, month)
+                issues.extend((await session.execute(statement)).scalars().all())
+
+            return [self._from_model(issue_model) for issue_model in issues]
+
+    async def get_issue_by_id(self, issue_id: str) -> Optional[dict]:
+        async with self.read_session() as session:
+            try:
+                issue = (await session.execute(
+                    select(IssueModelSqlAlchemy)
+                        .filter(IssueModelSqlAlchemy.radicado == issue_id.lower(), IssueModelSqlAlchemy.status.isnot(None))
+                        .limit(1)
+                )).scalars().first()
+
+                if not issue:
+                    return None
+
+                return {
+                    "created_at": issue.created_at.isoformat() if issue.created_at else None,
+                    "id": str(issue.id),
+                    "subject": issue.subject,
+                    "description": issue.description,
+                    "status": await self._name_of(issue.status),
+                    "closed_at": issue.closed_at.isoformat() if issue.closed_at else None
+                }
+            except Exception as ex:
+                log.error(f"Error retrieving issue by issue_id {issue_id}: {ex}")
+                return None
+
+    async def create_issue(self, issue: Issue, attachment: IssueAttachment = None) -> Issue:
+        async with self.session() as session:
+            try:
+                session.add(self._to_model(issue))
+                if attachment:
+                    session.add(self._to_model_attachment(attachment))
+                await self._increment_counters(session, self._issue_counters(issue.auth_user_id, issue.status), 1)
+                await session.commit()
+
+                return issue
+            except Exception as ex:
+                await session.rollback()
+                raise ex
+
+    async def find(self, user_id=None, page=None, limit=None, total_mode=ISSUE_TOTAL_EXACT) -> dict:
+        async with self.read_session() as session:
+            total_items = await self._count(
+                session,
+                select(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.auth_user_id == user_id),
+                self._user_counter(user_id),
+                total_mode
+            )
+            statement = (select(IssueModelSqlAlchemy)
+                            .filter(IssueModelSqlAlchemy.auth_user_id == user_id, IssueModelSqlAlchemy.status.isnot(None))
+                            .order_by(desc(IssueModelSqlAlchemy.created_at), desc(IssueModelSqlAlchemy.id)))
+
+            return await self._offset_page(session, statement, total_items, page, limit)
+
+    async def find_after(self, user_id=None, cursor=None, limit=None) -> dict:
+        async with self.read_session() as session:
+            statement = (select(IssueModelSqlAlchemy)
+                            .filter(IssueModelSqlAlchemy.auth_user_id == user_id, IssueModelSqlAlchemy.status.isnot(None)))
+
+            return await self._keyset_page(session, statement, cursor, limit)
+
+    async def get_open_issues(self, page=None, limit=None, total_mode=ISSUE_TOTAL_EXACT) -> dict:
+        async with self.read_session() as session:
+            open_issues = select(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN)
+            total_items = await self._count(session, open_issues, ISSUE_COUNTER_OPEN, total_mode)
+
+            return await self._offset_page(
+                session, open_issues.order_by(desc(IssueModelSqlAlchemy.created_at), desc(IssueModelSqlAlchemy.id)),
+                total_items, page, limit)
+
+    async def get_open_issues_after(self, cursor=None, limit=None) -> dict:
+        async with self.read_session() as session:
+            statement = select(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN)
+
+            return await self._keyset_page(session, statement, cursor, limit)
+
+    async def list_top_issues_by_user(self, user_id) -> List[tuple]:
+        async with self.read_session() as session:
+            recent = (select(IssueModelSqlAlchemy.description, IssueModelSqlAlchemy.created_at)
+                        .filter(IssueModelSqlAlchemy.auth_user_id == user_id)
+                        .order_by(IssueModelSqlAlchemy.created_at.desc())
+                        .limit(10)
+                        .subquery())
+
+            return (await session.execute(select(func.distinct(recent.c.description)))).all()
+
+    async def assign_issue_with_trace(self, issue_id, auth_user_agent_id, issue_trace: IssueTrace) -> IssueTrace:
+        """
+        Same single transaction as IssuePostgresqlRepository.assign_issue_with_trace
+        """
+        issue_table = IssueModelSqlAlchemy.__table__
+        previous = (select(issue_table.c.id, issue_table.c.status)
+                        .where(issue_table.c.id == issue_id)
+                        .with_for_update()
+                        .subquery('previous'))
+        assign = (update(issue_table)
+                    .where(issue_table.c.id == previous.c.id)
+                    .values(auth_user_agent_id=auth_user_agent_id, status=ISSUE_STATUS_INPROGRESS)
+                    .returning(issue_table.c.channel_plan_id, previous.c.status))
+
+        async with self.session() as session:
+            try:
+                assigned = (await session.execute(assign)).first()
+                if assigned is None:
+                    raise ValueError("Issue not found")
+
+                channel_plan_id, previous_status = assigned
+                if str(previous_status) == ISSUE_STATUS_OPEN:
+                    await self._increment_counters(session, [ISSUE_COUNTER_OPEN], -1)
+
+                issue_trace.channel_plan_id = channel_plan_id
+                if self.trace_writer is None:
+                    session.add(self._to_model_issue_trace(issue_trace))
+                await session.commit()
+                if self.trace_writer is not None:
+                    await asyncio.get_running_loop().run_in_executor(None, self.trace_writer.add, [issue_trace])
+                return issue_trace
+            except Exception as ex:
+                await session.rollback()
+                raise ex
+
+    async def get_top_7_incident_types(self, days: int = None) -> List[Issue]:
+        async with self.read_session() as session:
+            if days:
+                first_day = datetime.utcnow().date() - timedelta(days=days - 1)
+                total = func.sum(IssueIncidentTypeDailySqlAlchemy.total).label('total')
+                statement = (select(IssueIncidentTypeDailySqlAlchemy.name, total)
+                                .filter(IssueIncidentTypeDailySqlAlchemy.day >= first_day)
+                                .group_by(IssueIncidentTypeDailySqlAlchemy.name)
+                                .having(total > 0)
+                                .order_by(desc('total')))
+            else:
+                statement = (select(IssueIncidentTypeSqlAlchemy.name, IssueIncidentTypeSqlAlchemy.total)
+                                .filter(IssueIncidentTypeSqlAlchemy.total > 0)
+                                .order_by(desc(IssueIncidentTypeSqlAlchemy.total)))
+
+            rows = (await session.execute(statement.limit(ISSUE_TOP_INCIDENT_TYPES))).all()
+            return [self._from_model(IssueModelSqlAlchemy(subject=name)) for name, _ in rows]
+
+    async def _offset_page(self, session, statement, total_items, page, limit) -> dict:
+        total_pages = ceil(total_items / limit)
+        issues = (await session.execute(statement.offset((page - 1) * limit).limit(limit))).scalars().all()
+        status_names = await self._names_of(issue.status for issue in issues)
+
+        return {
+            "page": page,
+            "limit": limit,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "data": [self._to_list_item(issue, status_names) for issue in issues]
+        }
+
+    async def _keyset_page(self, session, statement, cursor, limit) -> dict:
+        issues = (await session.execute(self._after_cursor(statement, cursor, limit))).scalars().all()
+        return self._keyset_result(issues, limit, await self._names_of(issue.status for issue in issues))
+
+    async def _count(self, session, statement, counter_name, total_mode) -> int:
+        """
+        Total rows of statement computed as requested by total_mode, like IssuePostgresqlRepository._count
+        """
+        if total_mode == ISSUE_TOTAL_CACHED:
+            return (await session.execute(self._counter_total_statement(counter_name))).scalar() or 0
+        if total_mode == ISSUE_TOTAL_ESTIMATED:
+            compiled = statement.compile(dialect=session.bind.dialect)
+            connection = await session.connection()
+            plan = (await connection.exec_driver_sql(
+                f'EXPLAIN (FORMAT JSON) {compiled}',
+                tuple(compiled.params[name] for name in compiled.positiontup)
+            )).scalar()
+            return int(plan[0]['Plan']['Plan Rows'])
+        return await self._exact_count(session, statement)
+
+    async def _exact_count(self, session, statement) -> int:
+        return (await session.execute(select(func.count()).select_from(statement.subquery()))).scalar()
+
+    async def _increment_counters(self, session, counter_names, delta):
+        await session.execute(self._increment_counters_statement(counter_names, delta))
+
+    async def _name_of(self, status_id) -> Optional[str]:
+        # only a state missing from the loaded copy makes the registry read issue_state
+        name = self.status_registry.loaded_name_of(status_id)
+        if name is None and status_id is not None:
+            name = await asyncio.get_running_loop().run_in_executor(None, self.status_registry.name_of, status_id)
+        return name
+
+    async def _names_of(self, status_ids) -> dict:
+        """
+        Names of status_ids by str(status id) from the loaded registry copy, the ids
+        missing from it are read together in a single executor call
+        """
+        names = {str(status_id): self.status_registry.loaded_name_of(status_id)
+                 for status_id in status_ids if status_id is not None}
+        missing = [status_id for status_id, name in names.items() if name is None]
+        if missing:
+            names.update(await asyncio.get_running_loop().run_in_executor(None, self._registry_names_of, missing))
+        return names
+
+    def _registry_names_of(self, status_ids) -> dict:
+        return {status_id: self.status_registry.name_of(status_id) for status_id in status_ids}
@@ -1,94 +1,254 @@
 from math import ceil
-from flask import jsonify
-import json
-from sqlalchemy import func
-from sqlalchemy import create_engine,extract, func, desc
-from sqlalchemy.orm import sessionmaker
-from typing import List, Optional
-from ...utils import Logger
+from sqlalchemy import func, desc, tuple_, false, select, update, bindparam, lambda_stmt, cast, Float
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from typing import List, Optional, Iterator
+from ...utils import Logger, encode_search_cursor, decode_search_cursor
 from ...domain.models import Issue, IssueAttachment,IssueTrace
 from ...domain.interfaces import IssueRepository
-from ...infrastructure.databases.model_sqlalchemy import Base, IssueModelSqlAlchemy, IssueAttachmentSqlAlchemy, IssueStateSqlAlchemy,IssueTraceSqlAlchemy
-from ...domain.constants import ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN,ISSUE_STATUS_INPROGRESS
-from .postgres.db import Session, engine
+from ...infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy, IssueAttachmentSqlAlchemy,IssueTraceSqlAlchemy,IssueIncidentTypeSqlAlchemy,IssueIncidentTypeDailySqlAlchemy
+from ...domain.constants import ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN,ISSUE_STATUS_INPROGRESS,ISSUE_TOTAL_EXACT,ISSUE_TOTAL_CACHED,ISSUE_TOTAL_ESTIMATED,ISSUE_COUNTER_OPEN,ISSUE_DASHBOARD_COLUMNS,ISSUE_BUCKET_DAY,ISSUE_BULK_LIMIT,ISSUE_TOP_INCIDENT_TYPES,ISSUE_SEARCH_CONFIG
+from .postgres.db import Session, ReadSession, engine
+from .issue_state_registry import IssueStateRegistry, issue_state_registry
+from .issue_trace_writer import BufferedIssueTraceWriter
+from ..mappers.issue_sqlalchemy_mapper import IssueSqlAlchemyMapper, _month_range
 
 log = Logger()
 
-
-class IssuePostgresqlRepository(IssueRepository):
-    def __init__(self):
+USER_IDS_CHUNK_SIZE = 1000
+STREAM_CHUNK_SIZE = 1000
+
+
+def _chunks(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _count_of(statement):
+    return select(func.count()).select_from(statement.subquery())
+
+
+def _page_of(statement):
+    return (statement
+                .order_by(desc(IssueModelSqlAlchemy.created_at), desc(IssueModelSqlAlchemy.id))
+                .offset(bindparam('offset'))
+                .limit(bindparam('limit')))
+
+
+# The hot listings are built once with bound parameters, every call only binds its
+# values so sqlalchemy finds the compiled SQL without rebuilding the statement
+USER_ISSUES = select(IssueModelSqlAlchemy).where(IssueModelSqlAlchemy.auth_user_id == bindparam('user_id'))
+USER_ISSUES_COUNT = _count_of(USER_ISSUES)
+USER_ISSUES_PAGE = _page_of(USER_ISSUES.where(IssueModelSqlAlchemy.status.isnot(None)))
+
+OPEN_ISSUES = select(IssueModelSqlAlchemy).where(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN)
+OPEN_ISSUES_COUNT = _count_of(OPEN_ISSUES)
+OPEN_ISSUES_PAGE = _page_of(OPEN_ISSUES)
+
+SOLVED_IN_PERIOD = select(IssueModelSqlAlchemy).where(
+    IssueModelSqlAlchemy.status == ISSUE_STATUS_SOLVED,
+    IssueModelSqlAlchemy.created_at >= bindparam('start'),
+    IssueModelSqlAlchemy.created_at < bindparam('end'))
+USER_SOLVED_IN_PERIOD = SOLVED_IN_PERIOD.where(IssueModelSqlAlchemy.auth_user_id == bindparam('user_id'))
+USERS_SOLVED_IN_PERIOD = SOLVED_IN_PERIOD.where(
+    IssueModelSqlAlchemy.auth_user_id.in_(bindparam('user_ids', expanding=True)))
+
+# Ranked search pages ordered by (rank, created_at, id) descending. The rank is read
+# as double precision so the value sent back in the cursor compares equal to it
+SEARCH_QUERY = func.websearch_to_tsquery(ISSUE_SEARCH_CONFIG, bindparam('query'))
+SEARCH_RANK = cast(func.ts_rank(IssueModelSqlAlchemy.search_vector, SEARCH_QUERY), Float)
+USERS_SEARCH = (select(IssueModelSqlAlchemy, SEARCH_RANK.label('rank'))
+                    .where(IssueModelSqlAlchemy.auth_user_id.in_(bindparam('user_ids', expanding=True)),
+                           IssueModelSqlAlchemy.search_vector.op('@@')(SEARCH_QUERY)))
+USERS_SEARCH_ORDER = (desc(SEARCH_RANK), desc(IssueModelSqlAlchemy.created_at), desc(IssueModelSqlAlchemy.id))
+USERS_SEARCH_PAGE = USERS_SEARCH.order_by(*USERS_SEARCH_ORDER).limit(bindparam('limit'))
+USERS_SEARCH_PAGE_AFTER = (USERS_SEARCH
+                              .where(tuple_(SEARCH_RANK, IssueModelSqlAlchemy.created_at, IssueModelSqlAlchemy.id)
+                                     < tuple_(bindparam('rank'), bindparam('created_at'), bindparam('issue_id')))
+                              .order_by(*USERS_SEARCH_ORDER)
+                              .limit(bindparam('limit')))
+
+
+class IssuePostgresqlRepository(IssueSqlAlchemyMapper, IssueRepository):
+    """
+    Attributes:
+        trace_writer (BufferedIssueTraceWriter): stores the issue traces in batches after
+            the commit, None to store them in the transaction of the change they record
+    """
+    def __init__(self, status_registry: IssueStateRegistry = issue_state_registry, read_session=ReadSession,
+                 trace_writer: BufferedIssueTraceWriter = None):
         self.engine = engine
         self.session = Session
-        self._create_tables()
-
-    def _create_tables(self):
-        Base.metadata.create_all(self.engine)
+        self.read_session = read_session
+        self.status_registry = status_registry
+        self.trace_writer = trace_writer
 
     def list_issues_period (self,user_id,year, month) -> List[Issue]:
-        with self.session() as session:
+        start, end = _month_range(year, month)
+        with self.read_session() as session:
             try:
-                issues=session.query(IssueModelSqlAlchemy).filter(
-                    extract('year', IssueModelSqlAlchemy.created_at) == year,
-                    extract('month', IssueModelSqlAlchemy.created_at) == month,
-                    IssueModelSqlAlchemy.status == ISSUE_STATUS_SOLVED,
-                    IssueModelSqlAlchemy.auth_user_id==user_id).all()
-                
+                issues = session.execute(USER_SOLVED_IN_PERIOD,
+                                         {"user_id": user_id, "start": start, "end": end}).scalars().all()
+
                 return [self._from_model(issue_model) for issue_model in issues]
             finally:
                 session.close()
 
-    def list_issues_filtered(self, user_id, status=None, channel_plan_id=None, created_at=None, closed_at=None):
-        with self.session() as session:
-            try:            
-                query = session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.auth_user_id == user_id)
-            
-                if status:
-                    query = query.filter(IssueModelSqlAlchemy.issue_status.has(name=status))
-                if channel_plan_id:
-                    query = query.filter(IssueModelSqlAlchemy.channel_plan_id == channel_plan_id)
-                if created_at:
-                    query = query.filter(IssueModelSqlAlchemy.created_at >= created_at)
-                if closed_at:
-                    query = query.filter(IssueModelSqlAlchemy.closed_at <= closed_at)
-
-                issues_sqlalchemy = query.all()
-
-                issues = [
-                    Issue(
-                        id=issue_model.id,
-                        auth_user_id=issue_model.auth_user_id,
-                        auth_user_agent_id=issue_model.auth_user_agent_id,
-                        status=issue_model.status,
-                        subject=issue_model.subject,
-                        description=issue_model.description,
-                        created_at=issue_model.created_at,
-                        closed_at=issue_model.closed_at,
-                        channel_plan_id=issue_model.channel_plan_id
-                    ).to_dict() for issue_model in issues_sqlalchemy
-                ]
+    def list_issues_period_by_users(self, user_ids, year, month) -> List[Issue]:
+        """
+        Solved issues of the period for every user in user_ids, one query per
+        USER_IDS_CHUNK_SIZE users instead of one query per user
+        """
+        start, end = _month_range(year, month)
+        with self.read_session() as session:
+            try:
+                issues = []
+                for chunk in _chunks(user_ids, USER_IDS_CHUNK_SIZE):
+                    issues.extend(session.execute(USERS_SOLVED_IN_PERIOD,
+                                                  {"user_ids": chunk, "start": start, "end": end}).scalars())
 
-                return issues
+                return [self._from_model(issue_model) for issue_model in issues]
+            finally:
+                session.close()
+
+    def iter_issues_period_by_users(self, user_ids, year, month) -> Iterator[Issue]:
+        """
+        Same rows as list_issues_period_by_users read through a server side cursor,
+        STREAM_CHUNK_SIZE rows at a time, and yielded one by one
+        """
+        start, end = _month_range(year, month)
+        with self.read_session() as session:
+            try:
+                for chunk in _chunks(user_ids, USER_IDS_CHUNK_SIZE):
+                    issues = session.execute(USERS_SOLVED_IN_PERIOD,
+                                             {"user_ids": chunk, "start": start, "end": end},
+                                             execution_options={"yield_per": STREAM_CHUNK_SIZE}).scalars()
+                    for issue_model in issues:
+                        yield self._from_model(issue_model)
+            finally:
+                session.close()
+
+    def _filter_issues_lambda(self, statement, status=None, channel_plan_id=None, created_at=None, closed_at=None):
+        """
+        Same filters as _filter_issues added to a lambda statement, each combination of
+        filters is cached once and the filter values are bound on every call
+        """
+        if status:
+            status_id = self.status_registry.id_of(status)
+            if status_id:
+                statement += lambda s: s.where(IssueModelSqlAlchemy.status == status_id)
+            else:
+                statement += lambda s: s.where(false())
+        if channel_plan_id:
+            statement += lambda s: s.where(IssueModelSqlAlchemy.channel_plan_id == channel_plan_id)
+        if created_at:
+            statement += lambda s: s.where(IssueModelSqlAlchemy.created_at >= created_at)
+        if closed_at:
+            statement += lambda s: s.where(IssueModelSqlAlchemy.closed_at <= closed_at)
+        return statement
+
+    def list_issue_columns_by_users(self, user_ids, columns=ISSUE_DASHBOARD_COLUMNS, status=None, channel_plan_id=None,
+                                    created_at=None, closed_at=None) -> List[tuple]:
+        """
+        Issues of every user in user_ids, one query per USER_IDS_CHUNK_SIZE users, selecting
+        only the given issue columns as plain tuples in that order, no ORM objects are built
+        """
+        selected = self._issue_columns(columns)
+        with self.read_session() as session:
+            try:
+                rows = []
+                for chunk in _chunks(user_ids, USER_IDS_CHUNK_SIZE):
+                    statement = self._issue_columns_statement(selected, chunk)
+                    statement = self._filter_issues_lambda(statement, status, channel_plan_id, created_at, closed_at)
+                    rows.extend(tuple(row) for row in session.execute(statement))
+
+                return rows
+            except Exception as ex:
+                log.error(f'Error retrieving issue columns by user_ids: {ex}')
+                raise ex
+            finally:
+                session.close()
+
+    def iter_issue_columns_by_users(self, user_ids, columns=ISSUE_DASHBOARD_COLUMNS, status=None, channel_plan_id=None,
+                                    created_at=None, closed_at=None) -> Iterator[tuple]:
+        """
+        Same rows as list_issue_columns_by_users read through a server side cursor,
+        STREAM_CHUNK_SIZE rows at a time, and yielded one by one
+        """
+        selected = self._issue_columns(columns)
+        return self._iter_issue_columns(user_ids, selected, status, channel_plan_id, created_at, closed_at)
+
+    def _iter_issue_columns(self, user_ids, selected, status, channel_plan_id, created_at, closed_at):
+        with self.read_session() as session:
+            try:
+                for chunk in _chunks(user_ids, USER_IDS_CHUNK_SIZE):
+                    statement = self._issue_columns_statement(selected, chunk)
+                    statement = self._filter_issues_lambda(statement, status, channel_plan_id, created_at, closed_at)
+                    for row in session.execute(statement, execution_options={"yield_per": STREAM_CHUNK_SIZE}):
+                        yield tuple(row)
+            finally:
+                session.close()
+
+    def _issue_columns_statement(self, selected, user_ids):
+        """
+        Lambda statement selecting the given columns of the issues of user_ids, cached
+        once per column list with user_ids bound as an expanding parameter
+        """
+        return lambda_stmt(lambda: select(*selected).where(IssueModelSqlAlchemy.auth_user_id.in_(user_ids)),
+                           track_on=[tuple(selected)])
+
+    def _issue_columns(self, columns):
+        table_columns = IssueModelSqlAlchemy.__table__.columns
+        unknown = [column for column in columns if column not in table_columns]
+        if unknown:
+            raise ValueError(f'Unknown issue columns: {", ".join(unknown)}')
+        return [table_columns[column] for column in columns]
+
+    def count_issues_by_users(self, user_ids, bucket=ISSUE_BUCKET_DAY, status=None, channel_plan_id=None,
+                              created_at=None, closed_at=None) -> List[tuple]:
+        """
+        Same filters as list_issue_columns_by_users, grouped by status, channel_plan_id
+        and created_at truncated to bucket (day, week or month) in the database
+        Returns:
+            list of (status, channel_plan_id, bucket start, total) ordered by bucket start
+        """
+        created_bucket = func.date_trunc(bucket, IssueModelSqlAlchemy.created_at)
+        with self.read_session() as session:
+            try:
+                totals = {}
+                for chunk in _chunks(user_ids, USER_IDS_CHUNK_SIZE):
+                    statement = lambda_stmt(lambda: select(IssueModelSqlAlchemy.status, IssueModelSqlAlchemy.channel_plan_id,
+                                                           created_bucket, func.count())
+                                                    .where(IssueModelSqlAlchemy.auth_user_id.in_(chunk)))
+                    statement = self._filter_issues_lambda(statement, status, channel_plan_id, created_at, closed_at)
+                    statement += lambda s: s.group_by(IssueModelSqlAlchemy.status, IssueModelSqlAlchemy.channel_plan_id,
+                                                      created_bucket)
+                    for issue_status, issue_channel_plan_id, issue_bucket, total in session.execute(statement):
+                        key = (issue_status, issue_channel_plan_id, issue_bucket)
+                        totals[key] = totals.get(key, 0) + total
+
+                return sorted(((*key, total) for key, total in totals.items()),
+                              key=lambda row: (row[2] is None, row[2] or datetime.min))
             except Exception as ex:
-                log.error(f'Error retrieving issues by user_id {user_id}: {ex}')
+                log.error(f'Error counting issues by user_ids: {ex}')
                 raise ex
             finally:
-                session.close()         
+                session.close()
 
     def create_issue(self, issue:Issue, attachment: IssueAttachment = None):
+        """
+        Store the issue and its attachment in one flush and one commit, every
+        value is known before the insert so nothing is read back
+        """
         with self.session() as session:
             try:
-                issue_model = self._to_model(issue)
-                session.add(issue_model)
+                session.add(self._to_model(issue))
+                if attachment:
+                    session.add(self._to_model_attachment(attachment))
+                self._increment_counters(session, self._issue_counters(issue.auth_user_id, issue.status), 1)
                 session.commit()
-                session.refresh(issue_model)
 
-                if attachment:
-                    attachment_model = self._to_model_attachment(attachment)
-                    session.add(attachment_model)
-                    session.commit()
-                    session.refresh(attachment_model)
-                
-                issue = self._from_model(issue_model)
                 return issue
 
             except Exception as e:
@@ -99,25 +259,57 @@ class IssuePostgresqlRepository(IssueRepository):
                 if session:
                     session.close()
     
-    def find(self, user_id = None,page=None,limit=None):
+    def create_issues(self, issues: List[Issue], attachments: List[IssueAttachment] = None) -> List[Issue]:
+        """
+        Insert every issue, and its attachments, with multi-row INSERT statements
+        in a single transaction, either all of them are stored or none
+        """
         with self.session() as session:
             try:
-                total_items = session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.auth_user_id == user_id).count()
+                if issues:
+                    session.execute(IssueModelSqlAlchemy.__table__.insert(),
+                                    [self._to_row(issue) for issue in issues])
+                if attachments:
+                    session.execute(IssueAttachmentSqlAlchemy.__table__.insert(),
+                                    [{"id": attachment.id, "issue_id": attachment.issue_id, "file_path": attachment.file_path}
+                                     for attachment in attachments])
+
+                counter_deltas = {}
+                for issue in issues:
+                    for counter_name in self._issue_counters(issue.auth_user_id, issue.status):
+                        counter_deltas[counter_name] = counter_deltas.get(counter_name, 0) + 1
+                counters_by_delta = {}
+                for counter_name, delta in counter_deltas.items():
+                    counters_by_delta.setdefault(delta, []).append(counter_name)
+                for delta, counter_names in counters_by_delta.items():
+                    self._increment_counters(session, counter_names, delta)
+
+                session.commit()
+                return issues
+            except Exception as e:
+                session.rollback()
+                raise e
+            finally:
+                session.close()
+
+    def find(self, user_id = None,page=None,limit=None,total_mode=ISSUE_TOTAL_EXACT):
+        with self.read_session() as session:
+            try:
+                total_items = self._count(
+                    session,
+                    USER_ISSUES,
+                    USER_ISSUES_COUNT,
+                    {"user_id": user_id},
+                    self._user_counter(user_id),
+                    total_mode
+                )
                 total_pages = ceil(total_items / limit)
                 has_next = page < total_pages
 
-                issues = session.query(IssueModelSqlAlchemy).join(IssueStateSqlAlchemy).filter(IssueModelSqlAlchemy.auth_user_id == user_id).order_by(desc(IssueModelSqlAlchemy.created_at)).offset((page - 1) * limit).limit(limit).all()
+                issues = session.execute(USER_ISSUES_PAGE,
+                                         {"user_id": user_id, "offset": (page - 1) * limit, "limit": limit}).scalars().all()
 
-                data = [{
-                    "id": str(issue.id),
-                    "auth_user_id": str(issue.auth_user_id),
-                    "status": str(issue.issue_status.name),
-                    "subject": issue.subject,
-                    "description": issue.description,
-                    "created_at": str(issue.created_at),
-                    "closed_at": str(issue.closed_at),
-                    "channel_plan_id": str(issue.channel_plan_id)
-                    } for issue in issues]
+                data = [self._to_list_item(issue) for issue in issues]
                 
                 return {
                     "page": page,
@@ -134,39 +326,78 @@ class IssuePostgresqlRepository(IssueRepository):
                 if session:
                     session.close()
 
+    def find_after(self, user_id = None, cursor=None, limit=None):
+        with self.read_session() as session:
+            try:
+                query = (session.query(IssueModelSqlAlchemy)
+                            .filter(IssueModelSqlAlchemy.auth_user_id == user_id, IssueModelSqlAlchemy.status.isnot(None)))
+
+                return self._keyset_page(query, cursor, limit)
+            except Exception as ex:
+                if session:
+                    session.rollback()
+                raise ex
+            finally:
+                if session:
+                    session.close()
+
+    def search_by_users(self, user_ids, query, cursor=None, limit=None) -> dict:
+        """
+        Full text search of query over the subject and description of the issues of
+        user_ids, best ranked first. query takes the web search syntax: quoted
+        phrases, or, and -word to leave a word out
+        Return:
+            page (dict): limit, has_next, next_cursor and the issues with their rank
+        """
+        params = {"user_ids": list(user_ids), "query": query, "limit": limit + 1}
+        statement = USERS_SEARCH_PAGE
+        if cursor:
+            params["rank"], params["created_at"], params["issue_id"] = decode_search_cursor(cursor)
+            statement = USERS_SEARCH_PAGE_AFTER
+
+        with self.read_session() as session:
+            try:
+                rows = session.execute(statement, params).all() if params["user_ids"] else []
+                has_next = len(rows) > limit
+                rows = rows[:limit]
+                last_issue, last_rank = rows[-1] if rows else (None, None)
+
+                return {
+                    "limit": limit,
+                    "has_next": has_next,
+                    "next_cursor": encode_search_cursor(last_rank, last_issue.created_at, last_issue.id) if has_next else None,
+                    "data": [{**self._to_list_item(issue), "rank": rank} for issue, rank in rows]
+                }
+            except Exception as ex:
+                if session:
+                    session.rollback()
+                raise ex
+            finally:
+                if session:
+                    session.close()
+
     def get_issue_by_id(self, issue_id: str) -> Optional[dict]:
-        with self.session() as session:
+        with self.read_session() as session:
             try:
-                issues = (
-                        session.query(IssueModelSqlAlchemy, IssueStateSqlAlchemy.name.label("status_name"))
-                        .join(IssueStateSqlAlchemy, IssueModelSqlAlchemy.status == IssueStateSqlAlchemy.id)
-                        .all()  # Usamos `.all()` para obtener todos los resultados
+                issue = (
+                        session.query(IssueModelSqlAlchemy)
+                        .filter(IssueModelSqlAlchemy.radicado == issue_id.lower(), IssueModelSqlAlchemy.status.isnot(None))
+                        .first()
                     )
 
-                filtered_issues = [
-                    issue for issue, status in issues
-                    if str(issue.id).split('-')[-1] == issue_id.lower()
-                ]
-                issue = filtered_issues[0] if filtered_issues else None
-
                 if not issue:
-                    return issue
-
-                state = session.query(IssueStateSqlAlchemy).filter(IssueStateSqlAlchemy.id == issue.status).first()
-                status_name = state.name if state else None
+                    return None
 
                 issue_data = {
                     "created_at": issue.created_at.isoformat() if issue.created_at else None,
                     "id": str(issue.id),
                     "subject": issue.subject,
                     "description": issue.description,
-                    "status": status_name,
+                    "status": self.status_registry.name_of(issue.status),
                     "closed_at": issue.closed_at.isoformat() if issue.closed_at else None
                 }
                 return issue_data
 
-
-
             except Exception as ex:
                 log.error(f"Error retrieving issue by issue_id {issue_id}: {ex}")
                 return None
@@ -174,25 +405,11 @@ class IssuePostgresqlRepository(IssueRepository):
                 session.close()   
 
     def all(self):
-            with self.session() as session:
+            with self.read_session() as session:
                 try:
-                    issues = (session.query(IssueModelSqlAlchemy)
-                            .join(IssueStateSqlAlchemy)
-                            .filter(IssueModelSqlAlchemy.status ==ISSUE_STATUS_OPEN)
-                            .order_by(desc(IssueModelSqlAlchemy.created_at))
-                            .all()
-                    )
+                    issues = self._all_open_issues(session).all()
 
-                    data = [{
-                        "id": str(issue.id),
-                        "auth_user_id": str(issue.auth_user_id),
-                        "status": str(issue.issue_status.name),
-                        "subject": issue.subject,
-                        "description": issue.description,
-                        "created_at": str(issue.created_at),
-                        "closed_at": str(issue.closed_at),
-                        "channel_plan_id": str(issue.channel_plan_id)
-                        } for issue in issues]
+                    data = [self._to_list_item(issue) for issue in issues]
                     
                     return data
                 except Exception as ex:
@@ -203,43 +420,25 @@ class IssuePostgresqlRepository(IssueRepository):
                     if session:
                         session.close()      
 
-    def _from_model(self, model: IssueModelSqlAlchemy) -> Issue:
-        return Issue(
-            id=model.id,
-            auth_user_id=model.auth_user_id,
-            auth_user_agent_id=model.auth_user_agent_id,
-            status=model.status,
-            subject=model.subject,
-            description=model.description,
-            created_at=model.created_at,
-            closed_at=model.closed_at,
-            channel_plan_id=model.channel_plan_id
-        )
-    def _to_model(self,issue:Issue)->IssueModelSqlAlchemy:
-        return IssueModelSqlAlchemy(
-            id=issue.id,
-            auth_user_id=issue.auth_user_id,
-            auth_user_agent_id=issue.auth_user_agent_id,
-            status=issue.status,
-            subject=issue.subject,
-            description=issue.description,
-            created_at=issue.created_at,
-            closed_at=issue.closed_at,
-            channel_plan_id=issue.channel_plan_id
-        )  
-
-    def _to_model_attachment(self,attachment:IssueAttachment)->IssueAttachmentSqlAlchemy:
-        attachment_entity = IssueAttachmentSqlAlchemy(
-                id=attachment.id,
-                issue_id=attachment.issue_id,
-                file_path=attachment.file_path
-        )
-
-        return attachment_entity  
-    
+    def iter_all(self) -> Iterator[dict]:
+        """
+        Same items as all read through a server side cursor, STREAM_CHUNK_SIZE
+        rows at a time, and yielded one by one
+        """
+        with self.read_session() as session:
+            try:
+                for issue in self._all_open_issues(session).yield_per(STREAM_CHUNK_SIZE):
+                    yield self._to_list_item(issue)
+            finally:
+                session.close()
+
+    def _all_open_issues(self, session):
+        return (session.query(IssueModelSqlAlchemy)
+                    .filter(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN)
+                    .order_by(desc(IssueModelSqlAlchemy.created_at), desc(IssueModelSqlAlchemy.id)))
 
     def list_top_issues_by_user(self,user_id) -> List[Issue]:
-        with self.session() as session:
+        with self.read_session() as session:
             try:
                 subquery = (
                     session.query(
@@ -265,37 +464,114 @@ class IssuePostgresqlRepository(IssueRepository):
                     log.info(f"The issue: ${issue}")
                     if not issue:
                         raise ValueError("Issue not found")
+                    if str(issue.status) == ISSUE_STATUS_OPEN:
+                        self._increment_counters(session, [ISSUE_COUNTER_OPEN], -1)
                     issue.auth_user_agent_id = auth_user_agent_id
                     issue.status = ISSUE_STATUS_INPROGRESS
                     session.commit()
                 except Exception as ex:
                     session.rollback()
                     raise ex
-    def get_open_issues(self,page=None,limit=None):
+
+    def assign_issue_with_trace(self, issue_id, auth_user_agent_id, issue_trace: IssueTrace) -> IssueTrace:
+        """
+        Assign the issue to the agent and store its trace in one transaction, the
+        UPDATE returns the channel_plan_id the trace needs and the previous status
+        the open counter needs, so the issue is never read on its own
+        """
+        issue_table = IssueModelSqlAlchemy.__table__
+        previous = (select(issue_table.c.id, issue_table.c.status)
+                        .where(issue_table.c.id == issue_id)
+                        .with_for_update()
+                        .subquery('previous'))
+        assign = (update(issue_table)
+                    .where(issue_table.c.id == previous.c.id)
+                    .values(auth_user_agent_id=auth_user_agent_id, status=ISSUE_STATUS_INPROGRESS)
+                    .returning(issue_table.c.channel_plan_id, previous.c.status))
+
         with self.session() as session:
+            try:
+                assigned = session.execute(assign).first()
+                if assigned is None:
+                    raise ValueError("Issue not found")
+
+                channel_plan_id, previous_status = assigned
+                if str(previous_status) == ISSUE_STATUS_OPEN:
+                    self._increment_counters(session, [ISSUE_COUNTER_OPEN], -1)
+
+                issue_trace.channel_plan_id = channel_plan_id
+                if self.trace_writer is None:
+                    session.add(self._to_model_issue_trace(issue_trace))
+                session.commit()
+                if self.trace_writer is not None:
+                    self.trace_writer.add([issue_trace])
+                return issue_trace
+            except Exception as ex:
+                session.rollback()
+                raise ex
+            finally:
+                session.close()
+
+    def assign_issues_with_trace(self, auth_user_agent_id, scope, issue_ids=None, filters=None, limit=ISSUE_BULK_LIMIT) -> List[UUID]:
+        """
+        Assign to the agent either the given issue_ids or up to limit issues matching
+        filters (status, channel_plan_id, created_at, closed_at) with one UPDATE ... RETURNING,
+        and store one trace per assigned issue with one multi-row INSERT, in one transaction
+        Returns:
+            ids of the assigned issues
+        """
+        if issue_ids is None and not (filters or {}).get("status"):
+            raise ValueError("A status filter is required to assign issues in bulk")
+        issue_table = IssueModelSqlAlchemy.__table__
+        previous = select(issue_table.c.id, issue_table.c.status)
+        if issue_ids is not None:
+            previous = previous.where(issue_table.c.id.in_(issue_ids))
+        else:
+            previous = self._filter_issues(previous, **filters).order_by(issue_table.c.created_at).limit(limit)
+        previous = previous.with_for_update(skip_locked=issue_ids is None).subquery('previous')
+        assign = (update(issue_table)
+                    .where(issue_table.c.id == previous.c.id)
+                    .values(auth_user_agent_id=auth_user_agent_id, status=ISSUE_STATUS_INPROGRESS)
+                    .returning(issue_table.c.id, issue_table.c.channel_plan_id, previous.c.status))
+
+        with self.session() as session:
+            try:
+                assigned = session.execute(assign).all()
+                if not assigned:
+                    session.rollback()
+                    return []
+
+                opened = sum(1 for _, _, previous_status in assigned if str(previous_status) == ISSUE_STATUS_OPEN)
+                if opened:
+                    self._increment_counters(session, [ISSUE_COUNTER_OPEN], -opened)
+
+                created_at = datetime.utcnow()
+                traces = [IssueTrace(id=uuid4(), issue_id=issue_id, auth_user_id=None, auth_user_agent_id=auth_user_agent_id,
+                                     scope=scope, created_at=created_at, channel_plan_id=channel_plan_id)
+                          for issue_id, channel_plan_id, _ in assigned]
+                if self.trace_writer is None:
+                    session.execute(IssueTraceSqlAlchemy.__table__.insert(), [self._to_trace_row(trace) for trace in traces])
+                session.commit()
+                if self.trace_writer is not None:
+                    self.trace_writer.add(traces)
+
+                return [issue_id for issue_id, _, _ in assigned]
+            except Exception as ex:
+                session.rollback()
+                raise ex
+            finally:
+                session.close()
+
+    def get_open_issues(self,page=None,limit=None,total_mode=ISSUE_TOTAL_EXACT):
+        with self.read_session() as session:
             log.info('Receive request IssuePostgresqlRepository --->')
             try:
-                total_items = session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN).count()
+                total_items = self._count(session, OPEN_ISSUES, OPEN_ISSUES_COUNT, {}, ISSUE_COUNTER_OPEN, total_mode)
                 total_pages = ceil(total_items / limit)
                 has_next = page < total_pages
-                issues = (session.query(IssueModelSqlAlchemy)
-                            .join(IssueStateSqlAlchemy)
-                            .filter(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN)
-                            .order_by(desc(IssueModelSqlAlchemy.created_at))
-                            .offset((page - 1) * limit)
-                            .limit(limit)
-                            .all()
-                    )
-                data = [{
-                        "id": str(issue.id),
-                        "auth_user_id": str(issue.auth_user_id),
-                        "status": str(issue.issue_status.name),
-                        "subject": issue.subject,
-                        "description": issue.description,
-                        "created_at": str(issue.created_at),
-                        "closed_at": str(issue.closed_at),
-                        "channel_plan_id": str(issue.channel_plan_id)
-                        } for issue in issues]
+                issues = session.execute(OPEN_ISSUES_PAGE,
+                                         {"offset": (page - 1) * limit, "limit": limit}).scalars().all()
+                data = [self._to_list_item(issue) for issue in issues]
 
                 return {
                     "page": page,
@@ -307,7 +583,54 @@ class IssuePostgresqlRepository(IssueRepository):
             finally:
                 session.close()
     
+    def get_open_issues_after(self, cursor=None, limit=None):
+        with self.read_session() as session:
+            try:
+                query = (session.query(IssueModelSqlAlchemy)
+                            .filter(IssueModelSqlAlchemy.status == ISSUE_STATUS_OPEN))
+
+                return self._keyset_page(query, cursor, limit)
+            finally:
+                session.close()
+
+    def _count(self, session, statement, count_statement, params, counter_name, total_mode) -> int:
+        """
+        Total rows of statement computed as requested by total_mode:
+        exact runs count_statement, cached reads issue_counter and estimated asks the planner
+        """
+        if total_mode == ISSUE_TOTAL_CACHED:
+            return self._cached_count(session, counter_name)
+        if total_mode == ISSUE_TOTAL_ESTIMATED:
+            return self._estimated_count(session, statement, params)
+        return session.execute(count_statement, params).scalar()
+
+    def _cached_count(self, session, counter_name) -> int:
+        """
+        Total kept in issue_counter, migration 003 backfills the counters of the
+        existing rows and every write upserts them, so a missing counter is zero
+        """
+        return session.execute(self._counter_total_statement(counter_name)).scalar() or 0
+
+    def _estimated_count(self, session, statement, params) -> int:
+        compiled = statement.compile(dialect=session.get_bind().dialect)
+        params = {key: str(value) if isinstance(value, UUID) else value
+                  for key, value in {**compiled.params, **params}.items()}
+        plan = session.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', params).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def _increment_counters(self, session, counter_names, delta):
+        session.execute(self._increment_counters_statement(counter_names, delta))
+
+    def _keyset_page(self, query, cursor, limit) -> dict:
+        return self._keyset_result(self._after_cursor(query, cursor, limit).all(), limit)
+
     def create_issue_trace(self, issue_trace: IssueTrace):
+        if self.trace_writer is not None:
+            # the writer copies the channel plan of the issue for the whole batch, and a
+            # trace of a missing issue is dropped by the foreign key when it is written
+            log.info(f'Receive request Postgres to create_issue_trace')
+            self.trace_writer.add([issue_trace])
+            return
         with self.session() as session:
             try:
                 log.info(f'Receive request Postgres to create_issue_trace')
@@ -331,40 +654,36 @@ class IssuePostgresqlRepository(IssueRepository):
                 if session:
                     session.close()
 
-    def _to_model_issue_trace(self,issueTrace:IssueTraceSqlAlchemy)->IssueTraceSqlAlchemy:
-        trace = IssueTraceSqlAlchemy(
-                id=issueTrace.id,
-                issue_id=issueTrace.issue_id,
-                auth_user_id = issueTrace.auth_user_id,
-                auth_user_agent_id = issueTrace.auth_user_agent_id,
-                scope = issueTrace.scope,
-                channel_plan_id = issueTrace.channel_plan_id
-        )
-
-        return trace  
-    
-
-    def get_top_7_incident_types(self) -> List[Issue]:
+    def get_top_7_incident_types(self, days: int = None) -> List[Issue]:
         """
-        Get the 7 most reported types of incidents as Issue objects.
+        Get the 7 most reported types of incidents as Issue objects, read from the
+        incident type totals kept by the issue triggers (migration 006) instead of
+        grouping the issue table.
+
+        Args:
+            days (int): only count the issues created in the last days (UTC), all of them if None
 
         Returns:
             List[Issue]: A list of Issue objects representing the top 7 incident types.
         """
-        with self.session() as session:
+        with self.read_session() as session:
             try:
-                results = (
-                    session.query(IssueModelSqlAlchemy.subject, func.count(IssueModelSqlAlchemy.id).label('count'))
-                    .group_by(IssueModelSqlAlchemy.subject)
-                    .order_by(desc('count'))
-                    .limit(7)
-                    .all()
-                )
-                
-                top_issues = [
-                    self._from_model(IssueModelSqlAlchemy(subject=result[0][:20]))
-                    for result in results
+                if days:
+                    first_day = datetime.utcnow().date() - timedelta(days=days - 1)
+                    total = func.sum(IssueIncidentTypeDailySqlAlchemy.total).label('total')
+                    query = (session.query(IssueIncidentTypeDailySqlAlchemy.name, total)
+                                .filter(IssueIncidentTypeDailySqlAlchemy.day >= first_day)
+                                .group_by(IssueIncidentTypeDailySqlAlchemy.name)
+                                .having(total > 0)
+                                .order_by(desc('total')))
+                else:
+                    query = (session.query(IssueIncidentTypeSqlAlchemy.name, IssueIncidentTypeSqlAlchemy.total)
+                                .filter(IssueIncidentTypeSqlAlchemy.total > 0)
+                                .order_by(desc(IssueIncidentTypeSqlAlchemy.total)))
+
+                return [
+                    self._from_model(IssueModelSqlAlchemy(subject=name))
+                    for name, _ in query.limit(ISSUE_TOP_INCIDENT_TYPES).all()
                 ]
-                return top_issues
             finally:
                 session.close()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import time
+from typing import Optional
+from uuid import UUID
+from .model_sqlalchemy import IssueStateSqlAlchemy
+from .postgres.db import Session
+
+
+class IssueStateRegistry:
+    """
+    In process copy of the issue_state table. It is loaded on first use,
+    reloaded when an unknown id or name shows up, at most once every
+    refresh_interval seconds so repeated unknown values do not reach the
+    database, and on demand with refresh
+    Attributes:
+        session (scoped_session): session factory used to read issue_state
+        refresh_interval (float): seconds between reloads caused by unknown values
+    """
+    def __init__(self, session=Session, refresh_interval: float = 60):
+        self.session = session
+        self.refresh_interval = refresh_interval
+        self._names_by_id = None
+        self._ids_by_name = None
+        self._refreshed_at = None
+
+    def refresh(self):
+        with self.session() as session:
+            try:
+                states = session.query(IssueStateSqlAlchemy.id, IssueStateSqlAlchemy.name).all()
+            finally:
+                session.close()
+
+        self._ids_by_name = {name: UUID(str(state_id)) for state_id, name in states}
+        self._names_by_id = {str(state_id): name for state_id, name in states}
+        self._refreshed_at = time.monotonic()
+
+    def name_of(self, status_id) -> Optional[str]:
+        if status_id is None:
+            return None
+        if self._names_by_id is None or (str(status_id) not in self._names_by_id and self._refresh_due()):
+            self.refresh()
+        return self._names_by_id.get(str(status_id))
+
+    def loaded_name_of(self, status_id) -> Optional[str]:
+        """
+        Name of status_id in the copy already loaded, never reads issue_state so
+        it is safe to call from the event loop
+        """
+        if status_id is None or self._names_by_id is None:
+            return None
+        return self._names_by_id.get(str(status_id))
+
+    def id_of(self, name: str) -> Optional[UUID]:
+        if self._ids_by_name is None or (name not in self._ids_by_name and self._refresh_due()):
+            self.refresh()
+        return self._ids_by_name.get(name)
+
+    def _refresh_due(self) -> bool:
+        return time.monotonic() - self._refreshed_at >= self.refresh_interval
+
+
+issue_state_registry = IssueStateRegistry()
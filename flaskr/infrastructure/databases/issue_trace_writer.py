@@ -0,0 +1,217 @@
+import os
+import time
+from datetime import datetime
+from threading import Condition, Thread, current_thread
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from ...utils import Logger
+from ...domain.models import IssueTrace
+from .model_sqlalchemy import IssueModelSqlAlchemy, IssueTraceSqlAlchemy
+from .postgres.db import engine as default_engine
+from ..mappers.issue_sqlalchemy_mapper import IssueSqlAlchemyMapper
+
+log = Logger()
+
+
+class BufferedIssueTraceWriter:
+    """
+    Keeps the issue traces in memory and stores them with one multi-row INSERT per
+    batch, from a background thread, once batch_size traces are waiting or the oldest
+    one has waited max_delay seconds. A caller adding to a buffer that already holds
+    max_pending traces writes the batch itself, so a slow database slows the callers
+    down instead of growing the buffer.
+    A batch the database refuses is written again row by row: a row that breaks a
+    constraint is dropped, a row failing for another reason goes to the end of the
+    buffer and is dropped after max_attempts. While the database is unreachable the
+    batches stay buffered, up to max_pending traces, the oldest ones are dropped beyond.
+    Every dropped trace is logged with its values.
+    Traces still in the buffer when the process dies are lost, call close() on shutdown,
+    traces added after close() are written right away
+    Attributes:
+        engine (Engine): engine of the database the traces are written to
+        batch_size (int): traces per INSERT
+        max_delay (float): seconds a trace may wait before its batch is written
+        max_pending (int): traces the buffer holds before add() writes in the caller,
+            and the most it keeps while the database is unreachable
+        max_attempts (int): times a single trace is tried before it is dropped
+        written (int): traces stored since the writer was created
+        dropped (int): traces given up since the writer was created
+    """
+    def __init__(self, engine=default_engine, batch_size: int = 500, max_delay: float = 1.0, max_pending: int = 10_000,
+                 max_attempts: int = 3):
+        if batch_size < 1:
+            raise ValueError('batch_size must be greater than zero')
+        self.engine = engine
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.max_pending = max(max_pending, batch_size)
+        self.max_attempts = max_attempts
+        self.written = 0
+        self.dropped = 0
+        self._attempts = {}
+        self._pending = []
+        self._oldest = None
+        self._condition = Condition()
+        self._closed = False
+        self._thread = None
+        self._pid = None
+        self._mapper = IssueSqlAlchemyMapper()
+
+    def add(self, traces: List[IssueTrace]):
+        rows = [self._to_row(trace) for trace in traces]
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                self._start()
+                if not self._pending:
+                    self._oldest = time.monotonic()
+                self._pending.extend(rows)
+                dropped = self._trim()
+                overflow = len(self._pending) >= self.max_pending
+                if len(self._pending) >= self.batch_size:
+                    self._condition.notify()
+        if closed:
+            self._write(rows)
+            return
+        if dropped:
+            self._drop(dropped, f'more than {self.max_pending} issue traces waiting')
+        if overflow:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Write every trace waiting in the buffer, in batches of batch_size. A batch
+        the database refuses goes back to the buffer and the flush stops there
+        Return:
+            flushed (bool): False when a batch was put back
+        """
+        while True:
+            with self._condition:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                self._oldest = time.monotonic() if self._pending else None
+            if not batch:
+                return True
+            if not self._write(batch):
+                return False
+
+    def close(self):
+        """
+        Stop the background thread and write what is left, safe to call more than once
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None and thread is not current_thread() and self._pid == os.getpid():
+            thread.join()
+        self.flush()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def _start(self):
+        # a forked worker inherits the buffer object but not its thread
+        if self._thread is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._thread = Thread(target=self._run, name='issue-trace-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._batch_due():
+                    timeout = None if self._oldest is None else max(self._oldest + self.max_delay - time.monotonic(), 0)
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            if not self.flush():
+                with self._condition:
+                    self._condition.wait(self.max_delay)
+
+    def _batch_due(self) -> bool:
+        return len(self._pending) >= self.batch_size or (
+            self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay)
+
+    def _write(self, batch: List[dict]) -> bool:
+        try:
+            self._insert(batch)
+            return True
+        except OperationalError as ex:
+            return self._put_back(batch, ex)
+        except Exception:
+            # one bad trace must not take the rest of its batch with it
+            for position, row in enumerate(batch):
+                try:
+                    self._insert([row])
+                except IntegrityError as ex:
+                    self._drop([row], ex.orig)
+                except OperationalError as ex:
+                    return self._put_back(batch[position:], ex)
+                except Exception as ex:
+                    self._retry_later(row, ex)
+            return True
+
+    def _insert(self, rows: List[dict]):
+        with self.engine.begin() as connection:
+            self._fill_channel_plans(connection, rows)
+            connection.execute(IssueTraceSqlAlchemy.__table__.insert(), rows)
+        with self._condition:
+            self.written += len(rows)
+            for row in rows:
+                self._attempts.pop(row["id"], None)
+
+    def _fill_channel_plans(self, connection, rows: List[dict]):
+        """
+        Copy the channel plan of their issue to the traces added without one, with one
+        query per batch instead of one per trace
+        """
+        issue_ids = {row["issue_id"] for row in rows if row["channel_plan_id"] is None}
+        if not issue_ids:
+            return
+        issue_table = IssueModelSqlAlchemy.__table__
+        channel_plans = dict(connection.execute(
+            select(issue_table.c.id, issue_table.c.channel_plan_id).where(issue_table.c.id.in_(issue_ids))).all())
+        for row in rows:
+            if row["channel_plan_id"] is None:
+                row["channel_plan_id"] = channel_plans.get(row["issue_id"])
+
+    def _retry_later(self, row: dict, ex: Exception):
+        with self._condition:
+            attempts = self._attempts.get(row["id"], 0) + 1
+            if attempts < self.max_attempts:
+                self._attempts[row["id"]] = attempts
+                self._pending.append(row)
+                return
+        self._drop([row], getattr(ex, 'orig', ex))
+
+    def _put_back(self, rows: List[dict], ex: Exception) -> bool:
+        log.error(f'Error writing {len(rows)} issue traces, they are kept for the next batch: {getattr(ex, "orig", ex)}')
+        with self._condition:
+            self._pending[:0] = rows
+            self._oldest = time.monotonic()
+            dropped = self._trim()
+        if dropped:
+            self._drop(dropped, f'more than {self.max_pending} issue traces waiting')
+        return False
+
+    def _trim(self) -> List[dict]:
+        # called holding the condition, the oldest traces go first
+        dropped = self._pending[:max(len(self._pending) - self.max_pending, 0)]
+        del self._pending[:len(dropped)]
+        return dropped
+
+    def _drop(self, rows: List[dict], reason):
+        with self._condition:
+            self.dropped += len(rows)
+            for row in rows:
+                self._attempts.pop(row["id"], None)
+        for row in rows:
+            log.error(f'Dropping issue trace {row}: {reason}')
+
+    def _to_row(self, trace: IssueTrace) -> dict:
+        row = self._mapper._to_trace_row(trace)
+        row["created_at"] = row["created_at"] or datetime.utcnow()
+        return row
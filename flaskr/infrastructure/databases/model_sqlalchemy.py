@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Numeric, DateTime,Text,ForeignKey
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import Column, String, Numeric, DateTime,Text,ForeignKey,Computed,BigInteger,Date
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import uuid
 
 Base = declarative_base()
@@ -24,6 +24,10 @@ class IssueModelSqlAlchemy(Base):
     created_at = Column(DateTime(timezone=True), default=func.now())
     closed_at = Column(DateTime(timezone=True), default=func.now())
     channel_plan_id = Column(PG_UUID(as_uuid=True), nullable=True)
+    radicado = Column(String(12), Computed("split_part(CAST(id AS TEXT), '-', 5)", persisted=True), index=True)
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('spanish', coalesce(subject, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(description, '')), 'B')", persisted=True)))
     issue_status = relationship("IssueStateSqlAlchemy")
 
 
@@ -46,5 +50,23 @@ class IssueTraceSqlAlchemy(Base):
     auth_user_agent_id = Column(PG_UUID(as_uuid=True), nullable=True)
     scope = Column(String(255), nullable=True)
     channel_plan_id = Column(PG_UUID(as_uuid=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), default=func.now()) 
-    
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), default=func.now())
+
+class IssueCounterSqlAlchemy(Base):
+    __tablename__ = 'issue_counter'
+
+    name = Column(String(64), primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)
+
+class IssueIncidentTypeSqlAlchemy(Base):
+    __tablename__ = 'issue_incident_type'
+
+    name = Column(String(20), primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)
+
+class IssueIncidentTypeDailySqlAlchemy(Base):
+    __tablename__ = 'issue_incident_type_daily'
+
+    day = Column(Date, primary_key=True)
+    name = Column(String(20), primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)
@@ -1 +1,3 @@
-from .db import *
\ No newline at end of file
+from .db import *
+from .migrator import *
+from .partitioner import *
\ No newline at end of file
@@ -0,0 +1,50 @@
+from asyncio import current_task
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_scoped_session, AsyncSession as OrmAsyncSession
+from sqlalchemy.orm import sessionmaker, Session as OrmSession
+from config import Config
+from .db import ENGINE_OPTIONS, ReplicaSession, _mark_flush_as_write, _mark_dml_as_write
+
+config = Config()
+
+ASYNC_DRIVER = 'postgresql+asyncpg'
+
+
+def async_database_uri(uri: str) -> str:
+    """
+    Same database as uri reached through the asyncpg driver
+    """
+    return str(make_url(uri).set(drivername=ASYNC_DRIVER))
+
+
+async_engine = create_async_engine(config.ASYNC_DATABASE_URI or async_database_uri(config.DATABASE_URI),
+                                   **ENGINE_OPTIONS)
+
+async_replica_engines = [
+    create_async_engine(async_database_uri(uri.strip()), **ENGINE_OPTIONS)
+    for uri in (config.DATABASE_REPLICA_URIS or '').split(',') if uri.strip()
+]
+
+
+class AsyncPrimarySession(OrmSession):
+    """
+    Session behind every AsyncSession, its writes are marked like the ones of
+    db.Session so AsyncReadSession reads them back from the primary
+    """
+
+
+event.listen(AsyncPrimarySession, 'after_flush', _mark_flush_as_write)
+event.listen(AsyncPrimarySession, 'do_orm_execute', _mark_dml_as_write)
+
+AsyncSession = async_scoped_session(
+    sessionmaker(bind=async_engine, class_=OrmAsyncSession, sync_session_class=AsyncPrimarySession,
+                 expire_on_commit=False),
+    scopefunc=current_task
+)
+
+AsyncReadSession = async_scoped_session(
+    sessionmaker(bind=async_engine, class_=OrmAsyncSession, sync_session_class=ReplicaSession, expire_on_commit=False,
+                 replicas=[replica.sync_engine for replica in async_replica_engines], primary_session=AsyncSession),
+    scopefunc=current_task
+)
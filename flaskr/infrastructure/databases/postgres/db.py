@@ -1,15 +1,67 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+import random
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session, Session as OrmSession
 from config import Config
 
 config = Config()
 
-engine = create_engine(
-    config.DATABASE_URI,
+ENGINE_OPTIONS = dict(
     pool_size=10,
     max_overflow=5,
     pool_timeout=30,
     pool_recycle=1800
 )
+WROTE_KEY = 'wrote'
+REPLICA_KEY = 'replica'
 
-Session = scoped_session(sessionmaker(bind=engine))
\ No newline at end of file
+engine = create_engine(config.DATABASE_URI, **ENGINE_OPTIONS)
+
+replica_engines = [
+    create_engine(uri.strip(), **ENGINE_OPTIONS)
+    for uri in (config.DATABASE_REPLICA_URIS or '').split(',') if uri.strip()
+]
+
+Session = scoped_session(sessionmaker(bind=engine))
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flush_as_write(session, flush_context):
+    session.info[WROTE_KEY] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_dml_as_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[WROTE_KEY] = True
+
+
+class ReplicaSession(OrmSession):
+    """
+    Session for read only queries. It reads from one of the replicas, the same
+    one for its whole life, until the primary session of the same scope (thread
+    and request) writes; from then on it reads from the primary so the request
+    sees its own writes
+    Attributes:
+        replicas (list): replica engines, the primary is used when empty
+        primary_session (scoped_session): session registry the writes go through
+    """
+    def __init__(self, replicas=None, primary_session=None, **kwargs):
+        super().__init__(**kwargs)
+        self.replicas = replicas or []
+        self.primary_session = primary_session
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if not self.replicas or self._primary_wrote():
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if REPLICA_KEY not in self.info:
+            self.info[REPLICA_KEY] = random.choice(self.replicas)
+        return self.info[REPLICA_KEY]
+
+    def _primary_wrote(self) -> bool:
+        return (self.primary_session is not None
+                and self.primary_session.registry.has()
+                and self.primary_session().info.get(WROTE_KEY, False))
+
+
+ReadSession = scoped_session(sessionmaker(class_=ReplicaSession, bind=engine,
+                                          replicas=replica_engines, primary_session=Session))
@@ -0,0 +1,52 @@
+-- Schema the service had before versioned migrations existed. Every statement
+-- is idempotent so databases created by docker/postgresql/init.sql adopt it.
+CREATE TABLE IF NOT EXISTS issue_state(
+   id UUID PRIMARY KEY,
+   name VARCHAR(20)
+);
+
+INSERT INTO issue_state (id, name) VALUES
+    ('791353c6-3899-4d35-bcd9-af8775e240bf', 'Solved'),
+    ('574408a7-3aa0-4eab-b279-62ed10e6107e', 'Created'),
+    ('18e7d7dd-247b-4e27-aa0e-4f15e8ba5930', 'In Progress')
+ON CONFLICT (id) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS issue(
+   id UUID PRIMARY KEY,
+   auth_user_id UUID,
+   auth_user_agent_id UUID,
+   status UUID,
+   subject VARCHAR(255),
+   description TEXT,
+   created_at TIMESTAMP WITH TIME ZONE,
+   closed_at TIMESTAMP WITH TIME ZONE,
+   channel_plan_id UUID,
+   CONSTRAINT fk_status
+        FOREIGN KEY (status)
+        REFERENCES issue_state (id)
+        ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS issue_attachment (
+    id UUID PRIMARY KEY,
+    file_path VARCHAR(255),
+    issue_id UUID,
+    CONSTRAINT fk_issue
+        FOREIGN KEY (issue_id)
+        REFERENCES issue (id)
+        ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS issue_trace (
+    id UUID PRIMARY KEY,
+    issue_id UUID,
+    auth_user_id UUID NULL,
+    auth_user_agent_id UUID NULL,
+    scope VARCHAR(255),
+    channel_plan_id UUID,
+    created_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT fk_issue
+        FOREIGN KEY (issue_id)
+        REFERENCES issue (id)
+        ON DELETE CASCADE
+);
@@ -0,0 +1,8 @@
+-- Persisted radicado (last segment of the issue UUID) used by get_issue_by_id.
+-- Adding a STORED generated column rewrites the table, which backfills every
+-- existing row in the same statement.
+ALTER TABLE issue
+    ADD COLUMN IF NOT EXISTS radicado VARCHAR(12)
+    GENERATED ALWAYS AS (split_part(id::text, '-', 5)) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_issue_radicado ON issue (radicado);
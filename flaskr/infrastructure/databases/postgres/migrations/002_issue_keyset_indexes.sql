@@ -0,0 +1,5 @@
+-- Keyset pagination for find (per user) and get_open_issues (per status),
+-- both ordered by (created_at, id) descending.
+CREATE INDEX IF NOT EXISTS ix_issue_auth_user_id_created_at_id ON issue (auth_user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_issue_status_created_at_id ON issue (status, created_at DESC, id DESC);
@@ -0,0 +1,20 @@
+-- Totals used by the cached total mode of find (user:<auth_user_id>) and
+-- get_open_issues (open). The repository keeps them up to date on every write;
+-- this backfill makes them exact for the rows that already exist.
+CREATE TABLE IF NOT EXISTS issue_counter (
+    name VARCHAR(64) PRIMARY KEY,
+    total BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO issue_counter (name, total)
+SELECT 'user:' || auth_user_id::text, count(*)
+FROM issue
+WHERE auth_user_id IS NOT NULL
+GROUP BY auth_user_id
+ON CONFLICT (name) DO UPDATE SET total = EXCLUDED.total;
+
+INSERT INTO issue_counter (name, total)
+SELECT 'open', count(*)
+FROM issue
+WHERE status = '574408a7-3aa0-4eab-b279-62ed10e6107e'
+ON CONFLICT (name) DO UPDATE SET total = EXCLUDED.total;
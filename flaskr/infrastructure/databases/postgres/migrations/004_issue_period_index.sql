@@ -0,0 +1,3 @@
+-- Monthly reports (list_issues_period) filter by user, solved status and a
+-- half-open created_at range, which this index serves as a range scan.
+CREATE INDEX IF NOT EXISTS ix_issue_auth_user_id_status_created_at ON issue (auth_user_id, status, created_at);
@@ -0,0 +1,10 @@
+-- Secondary indexes for agent lookups, date filters and the child tables.
+-- auth_user_id and status are already the leading columns of the composite
+-- indexes created by 002, so they do not get indexes of their own.
+CREATE INDEX IF NOT EXISTS ix_issue_created_at ON issue (created_at);
+
+CREATE INDEX IF NOT EXISTS ix_issue_auth_user_agent_id ON issue (auth_user_agent_id);
+
+CREATE INDEX IF NOT EXISTS ix_issue_attachment_issue_id ON issue_attachment (issue_id);
+
+CREATE INDEX IF NOT EXISTS ix_issue_trace_issue_id ON issue_trace (issue_id);
@@ -0,0 +1,86 @@
+-- Incident type totals behind getTopSevenIssues. An incident type is the
+-- subject trimmed, with runs of whitespace collapsed, lower cased and cut to
+-- 20 characters. issue_incident_type keeps the all time total per type and
+-- issue_incident_type_daily the total per type and created_at day (UTC), so
+-- the top types of the last days only read that many days of rows.
+-- Statement level triggers keep both tables up to date on every insert and
+-- delete of issue rows, whatever the write path.
+CREATE OR REPLACE FUNCTION issue_incident_type_name(subject TEXT) RETURNS VARCHAR(20)
+    LANGUAGE sql IMMUTABLE AS
+$$ SELECT rtrim(left(lower(regexp_replace(btrim(coalesce(subject, '')), '\s+', ' ', 'g')), 20)) $$;
+
+CREATE TABLE IF NOT EXISTS issue_incident_type (
+    name VARCHAR(20) PRIMARY KEY,
+    total BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS ix_issue_incident_type_total ON issue_incident_type (total DESC);
+
+CREATE TABLE IF NOT EXISTS issue_incident_type_daily (
+    day DATE NOT NULL,
+    name VARCHAR(20) NOT NULL,
+    total BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, name)
+);
+
+CREATE OR REPLACE FUNCTION issue_incident_type_on_change() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO issue_incident_type (name, total)
+        SELECT issue_incident_type_name(subject), count(*)
+        FROM inserted_issue
+        GROUP BY 1
+        ON CONFLICT (name) DO UPDATE SET total = issue_incident_type.total + EXCLUDED.total;
+
+        INSERT INTO issue_incident_type_daily (day, name, total)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, issue_incident_type_name(subject), count(*)
+        FROM inserted_issue
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (day, name) DO UPDATE SET total = issue_incident_type_daily.total + EXCLUDED.total;
+    ELSE
+        UPDATE issue_incident_type AS counter
+        SET total = counter.total - deleted.total
+        FROM (SELECT issue_incident_type_name(subject) AS name, count(*) AS total
+              FROM deleted_issue
+              GROUP BY 1) AS deleted
+        WHERE counter.name = deleted.name;
+
+        UPDATE issue_incident_type_daily AS counter
+        SET total = counter.total - deleted.total
+        FROM (SELECT (created_at AT TIME ZONE 'UTC')::date AS day, issue_incident_type_name(subject) AS name, count(*) AS total
+              FROM deleted_issue
+              WHERE created_at IS NOT NULL
+              GROUP BY 1, 2) AS deleted
+        WHERE counter.day = deleted.day AND counter.name = deleted.name;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS tr_issue_incident_type_insert ON issue;
+CREATE TRIGGER tr_issue_incident_type_insert
+    AFTER INSERT ON issue
+    REFERENCING NEW TABLE AS inserted_issue
+    FOR EACH STATEMENT EXECUTE FUNCTION issue_incident_type_on_change();
+
+DROP TRIGGER IF EXISTS tr_issue_incident_type_delete ON issue;
+CREATE TRIGGER tr_issue_incident_type_delete
+    AFTER DELETE ON issue
+    REFERENCING OLD TABLE AS deleted_issue
+    FOR EACH STATEMENT EXECUTE FUNCTION issue_incident_type_on_change();
+
+TRUNCATE issue_incident_type, issue_incident_type_daily;
+
+INSERT INTO issue_incident_type (name, total)
+SELECT issue_incident_type_name(subject), count(*)
+FROM issue
+GROUP BY 1;
+
+INSERT INTO issue_incident_type_daily (day, name, total)
+SELECT (created_at AT TIME ZONE 'UTC')::date, issue_incident_type_name(subject), count(*)
+FROM issue
+WHERE created_at IS NOT NULL
+GROUP BY 1, 2;
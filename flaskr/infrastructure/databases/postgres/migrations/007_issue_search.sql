@@ -0,0 +1,14 @@
+-- Full text search over subject and description for the search action.
+-- search_vector is a STORED generated column with the spanish configuration,
+-- subject words weigh more (A) than description words (B) in the ranking.
+-- Adding the column rewrites the table, which backfills every existing row in
+-- the same statement. Searches are always scoped to users, so the planner
+-- combines the GIN index with the auth_user_id indexes of 002.
+ALTER TABLE issue
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(subject, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_issue_search_vector ON issue USING GIN (search_vector);
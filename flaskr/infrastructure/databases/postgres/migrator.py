@@ -0,0 +1,62 @@
+import os
+from sqlalchemy import text
+from ....utils import Logger
+
+log = Logger()
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATIONS_LOCK_KEY = 7_310_024
+
+
+class MigrationRunner:
+    """
+    Apply the versioned sql files of a directory once, in file name order
+    Attributes:
+        engine (Engine): engine of the database to migrate
+        directory (str): folder with the NNN_description.sql files
+    """
+    def __init__(self, engine, directory: str = MIGRATIONS_DIRECTORY):
+        self.engine = engine
+        self.directory = directory
+
+    def versions(self) -> list:
+        return sorted(
+            file_name[:-len('.sql')]
+            for file_name in os.listdir(self.directory)
+            if file_name.endswith('.sql')
+        )
+
+    def run(self) -> list:
+        """
+        Apply every pending migration, each one in its own transaction.
+        An advisory lock keeps concurrent workers or pods from racing.
+        Return:
+            applied (list): versions applied by this call
+        """
+        applied = []
+        with self.engine.connect() as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': MIGRATIONS_LOCK_KEY})
+            try:
+                with connection.begin():
+                    connection.execute(text(
+                        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+                        'version VARCHAR(255) PRIMARY KEY, '
+                        'applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now())'
+                    ))
+                done = {row[0] for row in connection.execute(text('SELECT version FROM schema_migrations'))}
+
+                for version in self.versions():
+                    if version in done:
+                        continue
+                    log.info(f'Applying migration {version}')
+                    with open(os.path.join(self.directory, f'{version}.sql'), 'r', encoding='utf-8') as migration_file:
+                        statements = migration_file.read()
+                    with connection.begin():
+                        connection.exec_driver_sql(statements)
+                        connection.execute(text('INSERT INTO schema_migrations (version) VALUES (:version)'),
+                                           {'version': version})
+                    applied.append(version)
+            finally:
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': MIGRATIONS_LOCK_KEY})
+
+        return applied
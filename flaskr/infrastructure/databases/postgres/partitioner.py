@@ -0,0 +1,327 @@
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+from ....utils import Logger
+from .migrator import MIGRATIONS_LOCK_KEY
+
+log = Logger()
+
+PARTITIONED_TABLES = ['issue', 'issue_trace']
+PARTITION_MONTHS_AHEAD = 3
+PARTITION_LOCK_TIMEOUT = '10s'
+
+# A foreign key can only reference a partitioned table through a unique key that
+# includes created_at, so the checks and the cascade of the issue (id) foreign keys
+# of issue_attachment and issue_trace are kept with triggers instead
+ISSUE_REFERENCES_SQL = """
+CREATE OR REPLACE FUNCTION issue_reference_check() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    IF NEW.issue_id IS NOT NULL AND NOT EXISTS (SELECT 1 FROM issue WHERE id = NEW.issue_id) THEN
+        RAISE foreign_key_violation USING MESSAGE = 'issue ' || NEW.issue_id || ' does not exist';
+    END IF;
+    RETURN NEW;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION issue_reference_cascade() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    DELETE FROM issue_attachment WHERE issue_id IN (SELECT id FROM deleted_issue);
+    DELETE FROM issue_trace WHERE issue_id IN (SELECT id FROM deleted_issue);
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS tr_issue_attachment_issue_reference ON issue_attachment;
+CREATE TRIGGER tr_issue_attachment_issue_reference
+    AFTER INSERT OR UPDATE OF issue_id ON issue_attachment
+    FOR EACH ROW EXECUTE FUNCTION issue_reference_check();
+
+DROP TRIGGER IF EXISTS tr_issue_trace_issue_reference ON issue_trace;
+CREATE TRIGGER tr_issue_trace_issue_reference
+    AFTER INSERT OR UPDATE OF issue_id ON issue_trace
+    FOR EACH ROW EXECUTE FUNCTION issue_reference_check();
+
+DROP TRIGGER IF EXISTS tr_issue_reference_delete ON issue;
+CREATE TRIGGER tr_issue_reference_delete
+    AFTER DELETE ON issue
+    REFERENCING OLD TABLE AS deleted_issue
+    FOR EACH STATEMENT EXECUTE FUNCTION issue_reference_cascade();
+"""
+
+# The primary key of a partitioned table must include created_at, so id alone is
+# kept unique by <table>_ids, a plain table with id as primary key that the
+# statement triggers below fill and empty along with the partitioned table
+UNIQUE_ID_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION partitioned_id_insert() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    EXECUTE 'INSERT INTO ' || quote_ident(TG_ARGV[0]) || ' (id) SELECT id FROM new_rows';
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION partitioned_id_update() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    EXECUTE 'UPDATE ' || quote_ident(TG_ARGV[0]) || ' SET id = $1 WHERE id = $2' USING NEW.id, OLD.id;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION partitioned_id_delete() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    EXECUTE 'DELETE FROM ' || quote_ident(TG_ARGV[0]) || ' WHERE id IN (SELECT id FROM old_rows)';
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION partitioned_id_truncate() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    EXECUTE 'TRUNCATE ' || quote_ident(TG_ARGV[0]);
+    RETURN NULL;
+END
+$$;
+"""
+
+UNIQUE_ID_TRIGGERS_SQL = """
+CREATE TRIGGER tr_{table}_id_insert
+    AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION partitioned_id_insert('{ids}');
+
+CREATE TRIGGER tr_{table}_id_update
+    AFTER UPDATE OF id ON {table}
+    FOR EACH ROW WHEN (OLD.id IS DISTINCT FROM NEW.id) EXECUTE FUNCTION partitioned_id_update('{ids}');
+
+CREATE TRIGGER tr_{table}_id_delete
+    AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION partitioned_id_delete('{ids}');
+
+CREATE TRIGGER tr_{table}_id_truncate
+    AFTER TRUNCATE ON {table}
+    FOR EACH STATEMENT EXECUTE FUNCTION partitioned_id_truncate('{ids}');
+"""
+
+
+def _month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+
+
+def _partition_name(table: str, month: date) -> str:
+    return f'{table}_y{month.year}m{month.month:02d}'
+
+
+class IssuePartitioner:
+    """
+    Optional monthly range partitioning of issue and issue_trace by created_at.
+    partition() converts the plain tables once, rows included, and create_partitions()
+    keeps PARTITION_MONTHS_AHEAD months of empty partitions ready, run it on a schedule.
+    Rows outside every monthly partition land in the <table>_default partition and are
+    moved out when their month is created.
+    Primary keys become (id, created_at) and created_at NOT NULL, id stays unique through
+    the <table>_ids tables of UNIQUE_ID_TRIGGERS_SQL, and the foreign keys issue_attachment
+    and issue_trace had on issue (id) become ISSUE_REFERENCES_SQL triggers.
+    The conversion holds an ACCESS EXCLUSIVE lock on the table while its rows are copied,
+    every read and write of the table waits for it, so run it in a maintenance window.
+    Statements give up after lock_timeout instead of queueing behind long transactions
+    Attributes:
+        engine (Engine): engine of the database to partition
+        months_ahead (int): months after the current one that must have a partition
+        lock_timeout (str): postgres lock_timeout of the partitioning statements
+    """
+    def __init__(self, engine, months_ahead: int = PARTITION_MONTHS_AHEAD, lock_timeout: str = PARTITION_LOCK_TIMEOUT):
+        self.engine = engine
+        self.months_ahead = months_ahead
+        self.lock_timeout = lock_timeout
+
+    def is_partitioned(self, table: str) -> bool:
+        with self.engine.connect() as connection:
+            return self._is_partitioned(connection, table)
+
+    def partitions(self, table: str) -> list:
+        """
+        Names of the partitions of table, the default one included, in name order
+        """
+        with self.engine.connect() as connection:
+            return [row[0] for row in connection.execute(text(
+                'SELECT child.relname FROM pg_inherits '
+                'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                'WHERE pg_inherits.inhparent = to_regclass(:table) ORDER BY child.relname'
+            ), {'table': table})]
+
+    def partition(self) -> list:
+        """
+        Convert every table of PARTITIONED_TABLES that is not partitioned yet, then
+        create the partitions of the months ahead, all under the migrations lock
+        Return:
+            converted (list): tables converted by this call
+        """
+        converted = []
+        with self._locked() as connection:
+            for table in PARTITIONED_TABLES:
+                if self._is_partitioned(connection, table):
+                    continue
+                log.info(f'Partitioning {table} by created_at month, {table} is locked for reads and writes '
+                         f'until its rows are copied')
+                with connection.begin():
+                    self._convert(connection, table)
+                converted.append(table)
+            if converted:
+                with connection.begin():
+                    connection.exec_driver_sql(ISSUE_REFERENCES_SQL)
+            for table in PARTITIONED_TABLES:
+                if self._is_partitioned(connection, table) and not self._has_unique_id(connection, table):
+                    log.info(f'Enforcing unique ids of {table} with {table}_ids')
+                    with connection.begin():
+                        self._enforce_unique_id(connection, table)
+            self._create_partitions(connection)
+
+        return converted
+
+    def create_partitions(self) -> list:
+        """
+        Create the missing monthly partitions from the current month to months_ahead
+        Return:
+            created (list): partitions created by this call
+        """
+        with self._locked() as connection:
+            return self._create_partitions(connection)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Connection holding the migrations advisory lock, so a partitioning run and
+        a MigrationRunner never change the schema at the same time, with lock_timeout set
+        """
+        with self.engine.connect() as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': MIGRATIONS_LOCK_KEY})
+            try:
+                connection.execute(text("SELECT set_config('lock_timeout', :timeout, false)"),
+                                   {'timeout': self.lock_timeout})
+                yield connection
+            finally:
+                connection.exec_driver_sql('RESET lock_timeout')
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': MIGRATIONS_LOCK_KEY})
+
+    def _is_partitioned(self, connection, table) -> bool:
+        return connection.execute(text(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"
+        ), {'table': table}).scalar() is True
+
+    def _convert(self, connection, table):
+        """
+        Swap table for a partitioned copy: the rows are copied before the indexes
+        and triggers are created again, so the statement triggers do not count them twice
+        """
+        legacy = f'{table}_unpartitioned'
+        indexes = connection.execute(text(
+            "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table "
+            "AND indexname <> :primary_key"
+        ), {'table': table, 'primary_key': f'{table}_pkey'}).scalars().all()
+        triggers = connection.execute(text(
+            'SELECT pg_get_triggerdef(oid) FROM pg_trigger WHERE tgrelid = to_regclass(:table) AND NOT tgisinternal'
+        ), {'table': table}).scalars().all()
+        foreign_keys = connection.execute(text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = to_regclass(:table) "
+            "AND contype = 'f' AND confrelid NOT IN (SELECT to_regclass(name)::oid FROM unnest(CAST(:tables AS text[])) AS name)"
+        ), {'table': table, 'tables': PARTITIONED_TABLES}).all()
+        columns = self._stored_columns(connection, table)
+        values = ['coalesce(created_at, now())' if column == 'created_at' else column for column in columns]
+
+        connection.exec_driver_sql(f'ALTER TABLE {table} RENAME TO {legacy}')
+        connection.exec_driver_sql(
+            f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING GENERATED) PARTITION BY RANGE (created_at)')
+        connection.exec_driver_sql(f'ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()')
+        connection.exec_driver_sql(f'ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL')
+        connection.exec_driver_sql(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        first_month = connection.exec_driver_sql(f'SELECT min(created_at) FROM {legacy}').scalar()
+        self._create_partitions(connection, table, _month_start(first_month) if first_month else None)
+
+        connection.exec_driver_sql(
+            f'INSERT INTO {table} ({", ".join(columns)}) SELECT {", ".join(values)} FROM {legacy}')
+        connection.exec_driver_sql(f'DROP TABLE {legacy} CASCADE')
+
+        connection.exec_driver_sql(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)')
+        for name, definition in foreign_keys:
+            connection.exec_driver_sql(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+        for statement in indexes + triggers:
+            connection.exec_driver_sql(statement)
+
+    def _has_unique_id(self, connection, table) -> bool:
+        return connection.execute(text('SELECT to_regclass(:ids) IS NOT NULL'), {'ids': f'{table}_ids'}).scalar()
+
+    def _enforce_unique_id(self, connection, table):
+        """
+        Create <table>_ids from the ids already stored and the triggers that keep it
+        in step, the table is locked against writes meanwhile so no id is missed
+        """
+        ids = f'{table}_ids'
+        connection.exec_driver_sql(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+        connection.exec_driver_sql(UNIQUE_ID_FUNCTIONS_SQL)
+        connection.exec_driver_sql(f'CREATE TABLE {ids} (id UUID PRIMARY KEY)')
+        connection.exec_driver_sql(f'INSERT INTO {ids} (id) SELECT id FROM {table}')
+        connection.exec_driver_sql(UNIQUE_ID_TRIGGERS_SQL.format(table=table, ids=ids))
+
+    def _stored_columns(self, connection, table) -> list:
+        return connection.execute(text(
+            "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(:table) AND attnum > 0 "
+            "AND NOT attisdropped AND attgenerated = '' ORDER BY attnum"
+        ), {'table': table}).scalars().all()
+
+    def _create_partitions(self, connection, table=None, first_month: date = None) -> list:
+        """
+        Create the monthly partitions from first_month (the current month by default)
+        up to months_ahead, rows of those months waiting in the default partition are
+        moved to the new partition in the same transaction
+        """
+        tables = [table] if table else [name for name in PARTITIONED_TABLES if self._is_partitioned(connection, name)]
+        current_month = _month_start(datetime.now(timezone.utc).date())
+        last_month = current_month
+        for _ in range(self.months_ahead):
+            last_month = _next_month(last_month)
+
+        created = []
+        for partitioned in tables:
+            existing = set(connection.execute(text(
+                'SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                'WHERE pg_inherits.inhparent = to_regclass(:table)'
+            ), {'table': partitioned}).scalars())
+            month = min(first_month or current_month, current_month)
+            while month <= last_month:
+                name = _partition_name(partitioned, month)
+                if name not in existing:
+                    self._create_partition(connection, partitioned, name, month, _next_month(month))
+                    created.append(name)
+                month = _next_month(month)
+
+        return created
+
+    def _create_partition(self, connection, table, name, start: date, end: date):
+        columns = ', '.join(self._stored_columns(connection, table))
+        bounds = {'start': start, 'end': end}
+        with connection.begin_nested() if connection.in_transaction() else connection.begin():
+            connection.execute(text(
+                f'CREATE TEMPORARY TABLE {name}_moved AS '
+                f'WITH moved AS (DELETE FROM {table}_default WHERE created_at >= :start AND created_at < :end '
+                f'RETURNING {columns}) SELECT * FROM moved'
+            ), bounds)
+            connection.exec_driver_sql(
+                f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM ('{start}') TO ('{end}')")
+            connection.exec_driver_sql(f'INSERT INTO {name} ({columns}) SELECT {columns} FROM {name}_moved')
+            connection.exec_driver_sql(f'DROP TABLE {name}_moved')
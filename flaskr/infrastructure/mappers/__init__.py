@@ -0,0 +1 @@
+from .issue_sqlalchemy_mapper import *
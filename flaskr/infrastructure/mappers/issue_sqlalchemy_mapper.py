@@ -0,0 +1,185 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy import false, desc, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from ...utils import encode_cursor, decode_cursor
+from ...domain.models import Issue, IssueAttachment, IssueTrace
+from ...domain.constants import ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN, ISSUE_COUNTER_OPEN
+from ..databases.model_sqlalchemy import IssueModelSqlAlchemy, IssueAttachmentSqlAlchemy, IssueTraceSqlAlchemy, IssueCounterSqlAlchemy
+
+
+def _month_range(year, month):
+    start = datetime(int(year), int(month), 1)
+    end = datetime(start.year + 1, 1, 1) if start.month == 12 else datetime(start.year, start.month + 1, 1)
+    return start, end
+
+
+class IssueSqlAlchemyMapper:
+    """
+    Conversions between the domain models and the sqlalchemy models, and the
+    filters both issue repositories apply, they work the same on a Query and a select
+    Attributes:
+        status_registry (IssueStateRegistry): issue states by id and by name
+    """
+    def _from_model(self, model: IssueModelSqlAlchemy) -> Issue:
+        return Issue(
+            id=model.id,
+            auth_user_id=model.auth_user_id,
+            auth_user_agent_id=model.auth_user_agent_id,
+            status=model.status,
+            subject=model.subject,
+            description=model.description,
+            created_at=model.created_at,
+            closed_at=model.closed_at,
+            channel_plan_id=model.channel_plan_id
+        )
+
+    def _to_model(self,issue:Issue)->IssueModelSqlAlchemy:
+        return IssueModelSqlAlchemy(
+            id=issue.id,
+            auth_user_id=issue.auth_user_id,
+            auth_user_agent_id=issue.auth_user_agent_id,
+            status=issue.status,
+            subject=issue.subject,
+            description=issue.description,
+            created_at=issue.created_at,
+            closed_at=issue.closed_at,
+            channel_plan_id=issue.channel_plan_id
+        )
+
+    def _to_row(self, issue: Issue) -> dict:
+        return {
+            "id": issue.id,
+            "auth_user_id": issue.auth_user_id,
+            "auth_user_agent_id": issue.auth_user_agent_id,
+            "status": issue.status,
+            "subject": issue.subject,
+            "description": issue.description,
+            "created_at": issue.created_at,
+            "closed_at": issue.closed_at,
+            "channel_plan_id": issue.channel_plan_id
+        }
+
+    def _to_model_attachment(self,attachment:IssueAttachment)->IssueAttachmentSqlAlchemy:
+        attachment_entity = IssueAttachmentSqlAlchemy(
+                id=attachment.id,
+                issue_id=attachment.issue_id,
+                file_path=attachment.file_path
+        )
+
+        return attachment_entity
+
+    def _to_model_issue_trace(self,issueTrace:IssueTraceSqlAlchemy)->IssueTraceSqlAlchemy:
+        trace = IssueTraceSqlAlchemy(
+                id=issueTrace.id,
+                issue_id=issueTrace.issue_id,
+                auth_user_id = issueTrace.auth_user_id,
+                auth_user_agent_id = issueTrace.auth_user_agent_id,
+                scope = issueTrace.scope,
+                channel_plan_id = issueTrace.channel_plan_id
+        )
+
+        return trace
+
+    def _to_trace_row(self, issue_trace: IssueTrace) -> dict:
+        return {
+            "id": issue_trace.id,
+            "issue_id": issue_trace.issue_id,
+            "auth_user_id": issue_trace.auth_user_id,
+            "auth_user_agent_id": issue_trace.auth_user_agent_id,
+            "scope": issue_trace.scope,
+            "channel_plan_id": issue_trace.channel_plan_id,
+            "created_at": issue_trace.created_at
+        }
+
+    def _to_list_item(self, issue: IssueModelSqlAlchemy, status_names: dict = None) -> dict:
+        """
+        List entry of issue, the status name is taken from status_names (names by
+        str(status id)) when given instead of the registry
+        """
+        status = status_names.get(str(issue.status)) if status_names is not None else self.status_registry.name_of(issue.status)
+        return {
+            "id": str(issue.id),
+            "auth_user_id": str(issue.auth_user_id),
+            "status": str(status),
+            "subject": issue.subject,
+            "description": issue.description,
+            "created_at": str(issue.created_at),
+            "closed_at": str(issue.closed_at),
+            "channel_plan_id": str(issue.channel_plan_id)
+        }
+
+    def _solved_in_period(self, query, year, month):
+        """
+        Filter the solved issues created in the month as a half-open created_at
+        range, so ix_issue_auth_user_id_status_created_at can serve it
+        """
+        start, end = _month_range(year, month)
+        return query.filter(
+            IssueModelSqlAlchemy.status == ISSUE_STATUS_SOLVED,
+            IssueModelSqlAlchemy.created_at >= start,
+            IssueModelSqlAlchemy.created_at < end)
+
+    def _filter_issues(self, query, status=None, channel_plan_id=None, created_at=None, closed_at=None):
+        if status:
+            status_id = self.status_registry.id_of(status)
+            query = query.filter(IssueModelSqlAlchemy.status == status_id if status_id else false())
+        if channel_plan_id:
+            query = query.filter(IssueModelSqlAlchemy.channel_plan_id == channel_plan_id)
+        if created_at:
+            query = query.filter(IssueModelSqlAlchemy.created_at >= created_at)
+        if closed_at:
+            query = query.filter(IssueModelSqlAlchemy.closed_at <= closed_at)
+        return query
+
+    def _issue_counters(self, auth_user_id, status) -> List[str]:
+        counters = [self._user_counter(auth_user_id)]
+        if str(status) == ISSUE_STATUS_OPEN:
+            counters.append(ISSUE_COUNTER_OPEN)
+        return counters
+
+    def _user_counter(self, user_id) -> str:
+        return f'user:{str(user_id).lower()}'
+
+    def _counter_total_statement(self, counter_name):
+        return select(IssueCounterSqlAlchemy.total).where(IssueCounterSqlAlchemy.name == counter_name)
+
+    def _after_cursor(self, statement, cursor, limit):
+        """
+        Rows that follow cursor ordering by (created_at, id) descending, one more
+        than limit to tell whether there is a next page. The row comparison is
+        repeated on created_at alone so a partitioned issue table skips the newer months.
+        Rows without created_at can not be pointed at by a cursor and are left out
+        """
+        statement = statement.filter(IssueModelSqlAlchemy.created_at.isnot(None))
+        if cursor:
+            created_at, issue_id = decode_cursor(cursor)
+            statement = statement.filter(
+                IssueModelSqlAlchemy.created_at <= created_at,
+                tuple_(IssueModelSqlAlchemy.created_at, IssueModelSqlAlchemy.id) < tuple_(created_at, issue_id)
+            )
+        return (statement
+                    .order_by(desc(IssueModelSqlAlchemy.created_at), desc(IssueModelSqlAlchemy.id))
+                    .limit(limit + 1))
+
+    def _keyset_result(self, issues, limit, status_names: dict = None) -> dict:
+        has_next = len(issues) > limit
+        issues = issues[:limit]
+
+        return {
+            "limit": limit,
+            "has_next": has_next,
+            "next_cursor": encode_cursor(issues[-1].created_at, issues[-1].id) if has_next else None,
+            "data": [self._to_list_item(issue, status_names) for issue in issues]
+        }
+
+    def _increment_counters_statement(self, counter_names, delta):
+        """
+        Upsert adding delta to every counter, a missing counter starts at delta.
+        Rows are locked in name order so concurrent writers cannot deadlock
+        """
+        statement = insert(IssueCounterSqlAlchemy).values(
+            [{"name": counter_name, "total": delta} for counter_name in sorted(set(counter_names))])
+        return statement.on_conflict_do_update(
+            index_elements=[IssueCounterSqlAlchemy.name],
+            set_={"total": IssueCounterSqlAlchemy.total + statement.excluded.total})
@@ -1,2 +1,6 @@
 from .json_custom_encoder import *
-from .logger import *
\ No newline at end of file
+from .logger import *
+from .pagination_cursor import *
+from .json_stream import *
+from .lru_cache import *
+from .async_http import *
\ No newline at end of file
@@ -0,0 +1,38 @@
+import httpx
+
+ASYNC_HTTP_TIMEOUT = 30.0
+ASYNC_HTTP_MAX_CONNECTIONS = 200
+
+
+class AsyncHttpClient:
+    """
+    One httpx.AsyncClient shared by the async service calls, built on first use so
+    it belongs to the event loop serving the requests, and closed when it stops
+    Attributes:
+        timeout (float): seconds to wait for each outbound call
+        max_connections (int): outbound connections kept open at most
+    """
+    def __init__(self, timeout: float = ASYNC_HTTP_TIMEOUT, max_connections: int = ASYNC_HTTP_MAX_CONNECTIONS):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout,
+                                             limits=httpx.Limits(max_connections=self.max_connections))
+        return self._client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.client().get(url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.client().post(url, **kwargs)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+async_http_client = AsyncHttpClient()
@@ -0,0 +1,40 @@
+import json
+from typing import Iterable, Iterator
+
+STREAM_JSON='json'
+STREAM_NDJSON='ndjson'
+STREAM_FORMATS = {STREAM_JSON: 'application/json', STREAM_NDJSON: 'application/x-ndjson'}
+
+
+def json_array_chunks(items: Iterable) -> Iterator[str]:
+    """
+    Serialize items one by one as the pieces of a single JSON array
+    Args:
+        items (Iterable): json serializable values
+    Return:
+        chunks (Iterator[str]): '[', every item separated by ',' and ']'
+    """
+    yield '['
+    separator = ''
+    for item in items:
+        yield separator + json.dumps(item)
+        separator = ','
+    yield ']'
+
+
+def ndjson_lines(items: Iterable) -> Iterator[str]:
+    """
+    Serialize items one by one as newline delimited JSON
+    Args:
+        items (Iterable): json serializable values
+    Return:
+        lines (Iterator[str]): one JSON document per line
+    """
+    for item in items:
+        yield json.dumps(item) + '\n'
+
+
+def stream_chunks(items: Iterable, stream_format: str) -> Iterator[str]:
+    if stream_format not in STREAM_FORMATS:
+        raise ValueError(f"stream must be one of {', '.join(STREAM_FORMATS)}")
+    return ndjson_lines(items) if stream_format == STREAM_NDJSON else json_array_chunks(items)
@@ -0,0 +1,53 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    Bounded in process cache that drops the least recently used key when full
+    Attributes:
+        max_size (int): maximum number of keys kept
+        ttl (float): seconds an entry is served before it is read again, None to keep it until evicted
+        hits (int): lookups answered from the cache
+        misses (int): lookups that were not in the cache or had expired
+    """
+    def __init__(self, max_size: int = 1024, ttl: float = None):
+        if max_size < 1:
+            raise ValueError('max_size must be greater than zero')
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[1] > self.ttl):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """
+    Build the opaque cursor that points to the last row of a keyset page
+    Args:
+        created_at (datetime): created_at of the last row returned
+        id (UUID): id of the last row returned
+    Return:
+        cursor (str): url safe cursor
+    """
+    payload = json.dumps([created_at.isoformat(), str(id)])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str):
+    """
+    Read the position stored in a cursor built by encode_cursor
+    Args:
+        cursor (str): url safe cursor
+    Return:
+        position (tuple): created_at (datetime) and id (UUID) of the last row returned
+    """
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError) as ex:
+        raise ValueError('Invalid cursor') from ex
+
+
+def encode_search_cursor(rank: float, created_at: datetime, id: UUID) -> str:
+    """
+    Build the opaque cursor that points to the last row of a ranked search page
+    Args:
+        rank (float): search rank of the last row returned
+        created_at (datetime): created_at of the last row returned
+        id (UUID): id of the last row returned
+    Return:
+        cursor (str): url safe cursor
+    """
+    payload = json.dumps([rank, created_at.isoformat(), str(id)])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_search_cursor(cursor: str):
+    """
+    Read the position stored in a cursor built by encode_search_cursor
+    Args:
+        cursor (str): url safe cursor
+    Return:
+        position (tuple): rank (float), created_at (datetime) and id (UUID) of the last row returned
+    """
+    try:
+        rank, created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(rank), datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError) as ex:
+        raise ValueError('Invalid cursor') from ex
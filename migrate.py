@@ -0,0 +1,5 @@
+from flaskr.infrastructure.databases.postgres.db import engine
+from flaskr.infrastructure.databases.postgres.migrator import MigrationRunner
+
+if __name__ == "__main__":
+    MigrationRunner(engine).run()
@@ -0,0 +1,5 @@
+from flaskr.infrastructure.databases.postgres.db import engine
+from flaskr.infrastructure.databases.postgres.partitioner import IssuePartitioner
+
+if __name__ == "__main__":
+    IssuePartitioner(engine).partition()
@@ -1,7 +1,7 @@
 from unittest.mock import patch
 import unittest
 import logging
-from flaskr.app import before_server_stop
+from flaskr.app import before_server_stop, container
 
 class AppTestCase(unittest.TestCase):
         
@@ -13,3 +13,9 @@ class AppTestCase(unittest.TestCase):
         before_server_stop()
 
         info_mock.assert_called_once_with(expectedInfo)
+
+    def test_should_flush_the_trace_writer_before_server_stop(self):
+        with patch.object(container, 'trace_writer') as trace_writer_mock:
+            before_server_stop()
+
+        trace_writer_mock.close.assert_called_once_with()
@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+from unittest.mock import patch, AsyncMock
+from http import HTTPStatus
+from faker import Faker
+from starlette.testclient import TestClient
+from flaskr.async_app import asgi_app
+from flaskr.app import container
+from flaskr.infrastructure.databases.issue_state_registry import IssueStateRegistry
+from builder import AuthUserCustomerBuilder
+
+fake = Faker()
+
+
+class AsyncIssueIntegrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(asgi_app)
+        self.client.__enter__()
+
+    def tearDown(self):
+        self.client.__exit__(None, None, None)
+
+    def _create_issue(self, auth_user_id=None):
+        response = self.client.post('/issue/post', json={
+            'auth_user_id': auth_user_id or fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        })
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        return response.json()['message'].split(': ')[-1]
+
+    def test_should_create_and_read_an_issue_on_the_event_loop(self):
+        radicado = self._create_issue()
+
+        response = self.client.get(f'/issue/get_issue_by_id?issue_id={radicado}')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.json()['id'].endswith(radicado.lower()))
+
+    def test_should_return_an_internal_server_error_when_create_fails(self):
+        response = self.client.post('/issue/post', json={'subject': fake.word()})
+
+        self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.json()['message'], 'Error creating issue')
+
+    def test_should_find_the_issues_of_a_user(self):
+        auth_user_id = fake.uuid4()
+        self._create_issue(auth_user_id)
+
+        page = self.client.get(f'/issues/find/{auth_user_id}?page=1&limit=5&total=cached')
+        keyset = self.client.get(f'/issues/find/{auth_user_id}?cursor=&limit=5')
+
+        self.assertEqual(page.status_code, HTTPStatus.OK)
+        self.assertEqual(len(page.json()['data']), 1)
+        self.assertEqual(keyset.json()['data'], page.json()['data'])
+
+    def test_should_read_missing_status_names_off_the_event_loop(self):
+        auth_user_id = fake.uuid4()
+        self._create_issue(auth_user_id)
+        self._create_issue(auth_user_id)
+        registry = IssueStateRegistry()
+        name_of = registry.name_of
+        on_event_loop = []
+
+        def loop_checked_name_of(status_id):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return name_of(status_id)
+
+        with patch.object(container.async_issue_repository, 'status_registry', registry), \
+                patch.object(registry, 'name_of', side_effect=loop_checked_name_of):
+            page = self.client.get(f'/issues/find/{auth_user_id}?page=1&limit=5')
+            keyset = self.client.get(f'/issues/find/{auth_user_id}?cursor=&limit=5')
+
+        self.assertEqual(on_event_loop, [False])
+        self.assertEqual([issue['status'] for issue in page.json()['data']], ['Created'] * 2)
+        self.assertEqual(keyset.json()['data'], page.json()['data'])
+
+    def test_should_get_open_issues_and_validate_the_total_mode(self):
+        self._create_issue()
+
+        response = self.client.get('/issue/getOpenIssues?page=1&limit=5&total=estimated')
+        bad_response = self.client.get('/issue/getOpenIssues?page=1&limit=5&total=guess')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.json()['data']), 5)
+        self.assertEqual(bad_response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_assign_an_issue(self):
+        self._create_issue()
+        issue_id = self.client.get('/issue/getOpenIssues?page=1&limit=1').json()['data'][0]['id']
+
+        response = self.client.post(f'/issue/assignIssue?issue_id={issue_id}', json={'auth_user_agent_id': fake.uuid4()})
+        missing_response = self.client.post(f'/issue/assignIssue?issue_id={fake.uuid4()}',
+                                            json={'auth_user_agent_id': fake.uuid4()})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(missing_response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_get_issues_by_customer_with_the_async_auth_client(self):
+        user = AuthUserCustomerBuilder().with_auth_user_id(fake.uuid4()).build()
+
+        with patch.object(container.auth_service, 'get_users_by_customer_list_async',
+                          new=AsyncMock(return_value=[user])) as get_users_mock:
+            response = self.client.get(f'/issue/getIssuesByCustomer?customer_id={fake.uuid4()}&year=2024&month=5')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json(), [])
+        get_users_mock.assert_awaited_once()
+
+    def test_should_validate_the_top_seven_window(self):
+        response = self.client.get('/issue/getTopSevenIssues?days=7')
+        bad_response = self.client.get('/issue/getTopSevenIssues?days=90')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(bad_response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_hand_the_other_actions_to_the_flask_app(self):
+        with patch.object(container.issue_service, 'get_all_issues', return_value=[]) as get_all_issues_mock:
+            response = self.client.get('/issue/getAllIssues')
+        not_found = self.client.get('/issue/doesNotExist')
+        health = self.client.get('/health')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        get_all_issues_mock.assert_called_once()
+        self.assertEqual(not_found.status_code, HTTPStatus.NOT_FOUND)
+        self.assertEqual(health.status_code, HTTPStatus.OK)
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from flaskr.application.auth_service import AuthService
 from flaskr.domain.models.auth_user_customer import AuthUserCustomer
 
@@ -149,3 +149,34 @@ class TestAuthService(unittest.TestCase):
         result = auth_service.get_customer_by_user_id(10)
 
         self.assertIsNone(result)
+
+
+class TestAuthServiceAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_users_by_customer_list_async_success(self):
+        """
+        Test the async call reads the response the same way as the sync one.
+        """
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{'id': 1, 'auth_user_id': 10, 'customer_id': 100}]
+        http_client = MagicMock()
+        http_client.get = AsyncMock(return_value=mock_response)
+
+        auth_service = AuthService(http_client=http_client)
+        result = await auth_service.get_users_by_customer_list_async(100)
+
+        self.assertEqual(result[0].auth_user_id, 10)
+        http_client.get.assert_awaited_once()
+
+    async def test_get_customer_by_user_id_async_exception(self):
+        """
+        Test the scenario when an exception is raised during the async API call.
+        """
+        http_client = MagicMock()
+        http_client.get = AsyncMock(side_effect=Exception('API is down'))
+
+        auth_service = AuthService(http_client=http_client)
+        result = await auth_service.get_customer_by_user_id_async(10)
+
+        self.assertIsNone(result)
@@ -0,0 +1,164 @@
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+from uuid import uuid4
+from sqlalchemy.exc import OperationalError
+from flaskr.domain.constants import ISSUE_STATUS_OPEN
+from flaskr.domain.models import Issue, IssueTrace
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.infrastructure.databases.issue_trace_writer import BufferedIssueTraceWriter
+from flaskr.infrastructure.databases.model_sqlalchemy import IssueTraceSqlAlchemy
+from flaskr.infrastructure.databases.postgres.db import Session
+
+
+class BufferedIssueTraceWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = IssuePostgresqlRepository()
+        self.issue = Issue(id=uuid4(), auth_user_id=uuid4(), auth_user_agent_id=None, status=ISSUE_STATUS_OPEN,
+                           subject='Traced Issue', description='Traced Description', created_at=datetime.utcnow(),
+                           closed_at=None, channel_plan_id=uuid4())
+        self.repo.create_issue(self.issue)
+
+    def _trace(self, issue_id=None):
+        return IssueTrace(id=uuid4(), issue_id=issue_id or self.issue.id, auth_user_id=None, auth_user_agent_id=uuid4(),
+                          scope='assignIssue', created_at=datetime.utcnow(), channel_plan_id=None)
+
+    def _stored(self, traces):
+        with Session() as session:
+            try:
+                return session.query(IssueTraceSqlAlchemy).filter(
+                    IssueTraceSqlAlchemy.id.in_([trace.id for trace in traces])).count()
+            finally:
+                session.close()
+
+    def _wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_should_write_a_batch_once_it_is_full(self):
+        writer = BufferedIssueTraceWriter(batch_size=3, max_delay=60)
+        traces = [self._trace() for _ in range(3)]
+
+        writer.add(traces[:2])
+        waiting = self._stored(traces)
+        writer.add(traces[2:])
+        self._wait_for(lambda: writer.written == 3)
+        writer.close()
+
+        self.assertEqual(waiting, 0)
+        self.assertEqual(self._stored(traces), 3)
+
+    def test_should_write_a_partial_batch_after_the_max_delay(self):
+        writer = BufferedIssueTraceWriter(batch_size=100, max_delay=0.05)
+        trace = self._trace()
+
+        writer.add([trace])
+        self._wait_for(lambda: writer.written == 1)
+        writer.close()
+
+        self.assertEqual(self._stored([trace]), 1)
+
+    def test_should_write_what_is_left_on_close_and_write_later_traces_right_away(self):
+        writer = BufferedIssueTraceWriter(batch_size=100, max_delay=60)
+        first, later = self._trace(), self._trace()
+
+        writer.add([first])
+        writer.close()
+        writer.add([later])
+
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(self._stored([first, later]), 2)
+
+    def test_should_drop_only_the_trace_of_a_missing_issue(self):
+        writer = BufferedIssueTraceWriter(batch_size=100, max_delay=60)
+        traces = [self._trace(), self._trace(uuid4()), self._trace()]
+
+        writer.add(traces)
+        writer.close()
+
+        self.assertEqual(writer.written, 2)
+        self.assertEqual(self._stored(traces), 2)
+
+    def test_should_keep_the_traces_when_the_database_is_down(self):
+        engine = MagicMock()
+        engine.begin.side_effect = OperationalError('INSERT', {}, Exception('connection refused'))
+        writer = BufferedIssueTraceWriter(engine=engine, batch_size=100, max_delay=60)
+
+        writer.add([self._trace(), self._trace()])
+
+        self.assertFalse(writer.flush())
+        self.assertEqual(writer.pending(), 2)
+        self.assertEqual(writer.written, 0)
+
+    def test_should_drop_a_trace_the_database_refuses_after_max_attempts(self):
+        writer = BufferedIssueTraceWriter(batch_size=100, max_delay=60, max_attempts=2)
+        writer._start = MagicMock()
+        refused = self._trace()
+        refused.scope = 'x' * 300
+        traces = [self._trace(), refused, self._trace()]
+
+        writer.add(traces)
+        flushed = writer.flush()
+
+        self.assertTrue(flushed)
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(writer.written, 2)
+        self.assertEqual(writer.dropped, 1)
+        self.assertEqual(self._stored(traces), 2)
+
+    def test_should_cap_the_buffer_while_the_database_is_down(self):
+        engine = MagicMock()
+        engine.begin.side_effect = OperationalError('INSERT', {}, Exception('connection refused'))
+        writer = BufferedIssueTraceWriter(engine=engine, batch_size=2, max_delay=60, max_pending=2)
+        writer._start = MagicMock()
+
+        writer.add([self._trace(), self._trace(), self._trace()])
+        writer.add([self._trace()])
+
+        self.assertEqual(writer.pending(), 2)
+        self.assertEqual(writer.dropped, 2)
+        self.assertEqual(writer.written, 0)
+
+    def test_should_make_the_caller_write_when_the_buffer_is_full(self):
+        writer = BufferedIssueTraceWriter(batch_size=2, max_delay=60, max_pending=4)
+        writer._start = MagicMock()
+        traces = [self._trace() for _ in range(4)]
+
+        writer.add(traces[:3])
+        buffered = writer.pending()
+        writer.add(traces[3:])
+
+        self.assertEqual(buffered, 3)
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(self._stored(traces), 4)
+
+    def test_should_assign_before_the_trace_is_written(self):
+        writer = BufferedIssueTraceWriter(batch_size=100, max_delay=60)
+        repo = IssuePostgresqlRepository(trace_writer=writer)
+        trace = self._trace()
+
+        repo.assign_issue_with_trace(issue_id=self.issue.id, auth_user_agent_id=trace.auth_user_agent_id, issue_trace=trace)
+        buffered = self._stored([trace])
+        writer.close()
+
+        self.assertEqual(buffered, 0)
+        self.assertEqual(trace.channel_plan_id, self.issue.channel_plan_id)
+        self.assertEqual(self._stored([trace]), 1)
+
+    def test_should_copy_the_channel_plan_of_the_issue_when_the_trace_is_written(self):
+        writer = BufferedIssueTraceWriter(batch_size=100, max_delay=60)
+        repo = IssuePostgresqlRepository(trace_writer=writer)
+        trace = self._trace()
+
+        repo.create_issue_trace(trace)
+        writer.close()
+
+        with Session() as session:
+            try:
+                stored = session.query(IssueTraceSqlAlchemy).filter(IssueTraceSqlAlchemy.id == trace.id).one()
+                self.assertEqual(stored.channel_plan_id, self.issue.channel_plan_id)
+            finally:
+                session.close()
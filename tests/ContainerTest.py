@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import patch
+from http import HTTPStatus
+from config import Config
+from flaskr.container import Container
+from flaskr.app import app, container
+
+
+class ContainerTest(unittest.TestCase):
+
+    def test_should_wire_the_issue_service_with_the_shared_dependencies(self):
+        new_container = Container()
+        service = new_container.issue_service
+
+        self.assertIs(service.issue_repository, new_container.issue_repository)
+        self.assertIs(service.async_issue_repository, new_container.async_issue_repository)
+        self.assertIs(service.auth_service, new_container.auth_service)
+        self.assertIs(service.customer_service, new_container.customer_service)
+        self.assertIs(service.openai_service, new_container.openai_service)
+        self.assertIs(service.config, new_container.config)
+
+    @patch('flaskr.endpoint.Issues.Issues.IssueService')
+    def test_should_serve_every_request_with_the_container_service(self, IssueServiceMock):
+        client = app.test_client()
+
+        with patch.object(container.issue_service, 'get_all_issues', return_value=[]) as get_all_issues_mock:
+            first_response = client.get('/issue/getAllIssues')
+            second_response = client.get('/issue/getAllIssues')
+
+        self.assertEqual(first_response.status_code, HTTPStatus.OK)
+        self.assertEqual(second_response.status_code, HTTPStatus.OK)
+        self.assertEqual(get_all_issues_mock.call_count, 2)
+        IssueServiceMock.assert_not_called()
+
+    def test_should_share_one_trace_writer_unless_traces_are_written_in_the_transaction(self):
+        buffered_config = Config()
+        buffered_config.ISSUE_TRACE_WRITE_MODE = 'buffered'
+        buffered = Container(buffered_config)
+        sync = Container()
+        wrong_config = Config()
+        wrong_config.ISSUE_TRACE_WRITE_MODE = 'later'
+
+        self.assertIs(buffered.issue_repository.trace_writer, buffered.trace_writer)
+        self.assertIs(buffered.async_issue_repository.trace_writer, buffered.trace_writer)
+        self.assertIsNone(sync.issue_repository.trace_writer)
+        with self.assertRaises(ValueError):
+            Container(wrong_config)
@@ -1,13 +1,16 @@
+import os
 import unittest
+import json
+import tempfile
 from unittest.mock import patch
 from http import HTTPStatus
 from sqlalchemy import desc
 from io import BytesIO
 from faker import Faker
-from flaskr.app import app
-from builder import FindIssueBuilder, IssueBuilder
+from flaskr.app import app, container
+from builder import FindIssueBuilder, IssueBuilder, AuthUserCustomerBuilder
 from flaskr.infrastructure.databases.postgres.db import Session
-from flaskr.infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy
+from flaskr.infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy, IssueAttachmentSqlAlchemy
 
 
 fake = Faker()
@@ -17,6 +20,14 @@ class IssueIntegrationTest(unittest.TestCase):
     def setUpClass(cls):
         cls.client = app.test_client()
         app.testing = True
+        cls.upload_directory = tempfile.TemporaryDirectory()
+        cls.upload_folder = patch.dict(app.config, {'UPLOAD_FOLDER': cls.upload_directory.name})
+        cls.upload_folder.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.upload_folder.stop()
+        cls.upload_directory.cleanup()
         
     def test_should_endpoint_create_an_issue(self):
         data = {
@@ -95,6 +106,291 @@ class IssueIntegrationTest(unittest.TestCase):
         self.assertEqual(response.json["has_next"], expected_response["has_next"])
         self.assertEqual(response.json["data"][0]["auth_user_id"], expected_response["data"][0].auth_user_id)
 
+    def test_should_find_issues_by_user_with_cursor(self):
+        user_id = fake.uuid4()
+        for _ in range(3):
+            data = {
+                'auth_user_id': user_id,
+                'auth_user_agent_id': fake.uuid4(),
+                'subject': fake.word(),
+                'description': fake.sentence()
+            }
+            self.client.post('/issue/post', content_type='multipart/form-data', data=data)
+
+        first_page = self.client.get(f'/issues/find/{user_id}?limit=2&cursor=')
+        second_page = self.client.get(f'/issues/find/{user_id}?limit=2&cursor={first_page.json["next_cursor"]}')
+
+        self.assertEqual(first_page.status_code, HTTPStatus.OK)
+        self.assertEqual(len(first_page.json["data"]), 2)
+        self.assertTrue(first_page.json["has_next"])
+        self.assertEqual(second_page.status_code, HTTPStatus.OK)
+        self.assertEqual(len(second_page.json["data"]), 1)
+        self.assertFalse(second_page.json["has_next"])
+        self.assertIsNone(second_page.json["next_cursor"])
+        ids = [issue["id"] for issue in first_page.json["data"] + second_page.json["data"]]
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_should_return_bad_request_when_the_cursor_is_invalid(self):
+        response = self.client.get(f'/issues/find/{fake.uuid4()}?limit=2&cursor=invalid')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_search_issues_by_user_with_cursor(self):
+        user_id = fake.uuid4()
+        for subject in ['Conexión intermitente', 'Sin conexión en la sede', 'Cambio de plan']:
+            data = {
+                'auth_user_id': user_id,
+                'auth_user_agent_id': fake.uuid4(),
+                'subject': subject,
+                'description': fake.sentence()
+            }
+            self.client.post('/issue/post', content_type='multipart/form-data', data=data)
+
+        first_page = self.client.get(f'/issue/search?q=conexiones&user_id={user_id}&limit=1')
+        second_page = self.client.get(f'/issue/search?q=conexiones&user_id={user_id}&limit=1&cursor={first_page.json["next_cursor"]}')
+
+        self.assertEqual(first_page.status_code, HTTPStatus.OK)
+        self.assertTrue(first_page.json["has_next"])
+        self.assertEqual(second_page.status_code, HTTPStatus.OK)
+        self.assertFalse(second_page.json["has_next"])
+        subjects = {issue["subject"] for issue in first_page.json["data"] + second_page.json["data"]}
+        self.assertEqual(subjects, {'Conexión intermitente', 'Sin conexión en la sede'})
+
+    def test_should_search_issues_of_the_customer_users(self):
+        customer_user = AuthUserCustomerBuilder().with_auth_user_id(fake.uuid4()).build()
+        data = {
+            'auth_user_id': str(customer_user.auth_user_id),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': 'Portal caído',
+            'description': 'El portal de pagos no carga'
+        }
+        self.client.post('/issue/post', content_type='multipart/form-data', data=data)
+
+        with patch.object(container.auth_service, 'get_users_by_customer_list', return_value=[customer_user]):
+            response = self.client.get(f'/issue/search?q=pagos&customer_id={fake.uuid4()}')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual([issue["auth_user_id"] for issue in response.json["data"]], [str(customer_user.auth_user_id)])
+
+    def test_should_return_bad_request_when_the_search_has_no_query_or_scope(self):
+        without_query = self.client.get(f'/issue/search?user_id={fake.uuid4()}')
+        without_scope = self.client.get('/issue/search?q=conexión')
+        invalid_cursor = self.client.get(f'/issue/search?q=conexión&user_id={fake.uuid4()}&cursor=invalid')
+
+        self.assertEqual(without_query.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(without_scope.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(invalid_cursor.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_keep_cached_totals_up_to_date_on_create(self):
+        user_id = fake.uuid4()
+        data = {
+            'auth_user_id': user_id,
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        }
+
+        self.client.post('/issue/post', content_type='multipart/form-data', data=data)
+        first_response = self.client.get(f'/issues/find/{user_id}?page=1&limit=1&total=cached')
+        self.client.post('/issue/post', content_type='multipart/form-data', data=data)
+        second_response = self.client.get(f'/issues/find/{user_id}?page=1&limit=1&total=cached')
+
+        self.assertEqual(first_response.status_code, HTTPStatus.OK)
+        self.assertEqual(first_response.json["total_pages"], 1)
+        self.assertEqual(second_response.json["total_pages"], 2)
+        self.assertTrue(second_response.json["has_next"])
+
+    def test_should_create_issues_in_bulk(self):
+        user_id = fake.uuid4()
+        issues = [{
+            'auth_user_id': user_id,
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        } for _ in range(3)]
+
+        self.client.get(f'/issues/find/{user_id}?page=1&limit=2&total=cached')
+        response = self.client.post('/issue/bulk', json={'issues': issues})
+        found = self.client.get(f'/issues/find/{user_id}?page=1&limit=2&total=cached')
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(len(response.json["radicados"]), 3)
+        self.assertEqual(len(found.json["data"]), 2)
+        self.assertEqual(found.json["total_pages"], 2)
+
+    def test_should_page_bulk_issues_sharing_a_timestamp_without_repeats(self):
+        user_id = fake.uuid4()
+        issues = [{
+            'auth_user_id': user_id,
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        } for _ in range(9)]
+
+        self.client.post('/issue/bulk', json={'issues': issues})
+        pages = [self.client.get(f'/issues/find/{user_id}?page={page}&limit=2').json["data"] for page in range(1, 6)]
+        ids = [issue["id"] for page in pages for issue in page]
+
+        self.assertEqual(len(ids), 9)
+        self.assertEqual(len(set(ids)), 9)
+
+    def test_should_create_issues_in_bulk_with_attachments(self):
+        issues = [{
+            'auth_user_id': fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        } for _ in range(2)]
+
+        response = self.client.post('/issue/bulk', content_type='multipart/form-data', data={
+            'issues': json.dumps(issues),
+            'file_1': (BytesIO(b"Testing file"), 'bulkfile.txt')
+        })
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(len(response.json["radicados"]), 2)
+
+    def test_should_store_bulk_attachments_under_a_safe_unique_name(self):
+        issues = [{
+            'auth_user_id': fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        }]
+
+        responses = [self.client.post('/issue/bulk', content_type='multipart/form-data', data={
+            'issues': json.dumps(issues),
+            'file_0': (BytesIO(b"Testing file"), '../../escape.txt')
+        }) for _ in range(2)]
+        stored = os.listdir(self.upload_directory.name)
+        escaped = [name for name in stored if name.endswith('_escape.txt')]
+
+        self.assertEqual([response.status_code for response in responses], [HTTPStatus.CREATED] * 2)
+        self.assertEqual(len(escaped), 2)
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.upload_directory.name), 'escape.txt')))
+
+    def test_should_ignore_a_file_path_sent_in_a_bulk_item(self):
+        issues = [{
+            'auth_user_id': fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence(),
+            'file_path': '/etc/passwd'
+        }]
+
+        response = self.client.post('/issue/bulk', json={'issues': issues})
+        session = Session()
+        try:
+            attached = session.query(IssueAttachmentSqlAlchemy).filter(IssueAttachmentSqlAlchemy.file_path == '/etc/passwd').count()
+        finally:
+            session.close()
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(attached, 0)
+
+    def test_should_return_bad_request_when_the_bulk_body_is_not_an_object(self):
+        issue = {'auth_user_id': fake.uuid4(), 'auth_user_agent_id': fake.uuid4(), 'subject': fake.word(), 'description': fake.sentence()}
+
+        for body in [[issue], "issues", 3]:
+            response = self.client.post('/issue/bulk', json=body)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_not_save_any_attachment_when_one_bulk_item_is_invalid(self):
+        issues = [{'auth_user_id': fake.uuid4(), 'auth_user_agent_id': fake.uuid4(), 'subject': fake.word(), 'description': fake.sentence()},
+                  'not an issue']
+        before = set(os.listdir(self.upload_directory.name))
+
+        response = self.client.post('/issue/bulk', content_type='multipart/form-data', data={
+            'issues': json.dumps(issues),
+            'file_0': (BytesIO(b"Testing file"), 'rejected.txt')
+        })
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(set(os.listdir(self.upload_directory.name)), before)
+
+    def test_should_not_create_any_issue_when_one_bulk_item_is_invalid(self):
+        user_id = fake.uuid4()
+        issues = [{'auth_user_id': user_id, 'auth_user_agent_id': fake.uuid4(), 'subject': fake.word(), 'description': fake.sentence()},
+                  {'auth_user_id': user_id, 'subject': fake.word()}]
+
+        response = self.client.post('/issue/bulk', json={'issues': issues})
+        found = self.client.get(f'/issues/find/{user_id}?page=1&limit=10')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(found.json["data"], [])
+
+    def test_should_get_open_issues_with_estimated_total(self):
+        response = self.client.get('/issue/getOpenIssues?page=1&limit=2&total=estimated')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIsInstance(response.json["total_pages"], int)
+
+    def test_should_return_bad_request_when_the_total_mode_is_unknown(self):
+        response = self.client.get('/issue/getOpenIssues?page=1&limit=2&total=approximate')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_get_dashboard_summary_grouped_by_month(self):
+        customer_user = AuthUserCustomerBuilder().with_auth_user_id(fake.uuid4()).build()
+        for _ in range(2):
+            self.client.post('/issue/post', content_type='multipart/form-data', data={
+                'auth_user_id': str(customer_user.auth_user_id),
+                'auth_user_agent_id': fake.uuid4(),
+                'subject': fake.word(),
+                'description': fake.sentence()
+            })
+
+        with patch.object(container.auth_service, 'get_users_by_customer_list', return_value=[customer_user]):
+            response = self.client.get(f'/issue/getIssuesDashboardSummary?customer_id={fake.uuid4()}&bucket=month')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.json), 1)
+        self.assertEqual(response.json[0]["total"], 2)
+        self.assertTrue(response.json[0]["bucket"].split('T')[0].endswith('-01'))
+
+    def test_should_stream_dashboard_issues_as_a_json_array(self):
+        customer_user = AuthUserCustomerBuilder().with_auth_user_id(fake.uuid4()).build()
+        for _ in range(3):
+            self.client.post('/issue/post', content_type='multipart/form-data', data={
+                'auth_user_id': str(customer_user.auth_user_id),
+                'auth_user_agent_id': fake.uuid4(),
+                'subject': fake.word(),
+                'description': fake.sentence()
+            })
+
+        with patch.object(container.auth_service, 'get_users_by_customer_list', return_value=[customer_user]):
+            response = self.client.get(f'/issue/getIssuesDasboard?customer_id={fake.uuid4()}&stream=json')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(len(response.json), 3)
+        self.assertEqual(set(response.json[0]), {"status", "channel_plan_id", "created_at"})
+
+    def test_should_stream_all_issues_as_ndjson(self):
+        response = self.client.get('/issue/getAllIssues?stream=ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(lines, self.client.get('/issue/getAllIssues').json)
+
+    def test_should_stream_no_issues_when_the_customer_has_no_users(self):
+        with patch.object(container.auth_service, 'get_users_by_customer_list', return_value=[]):
+            response = self.client.get(f'/issue/getIssuesByCustomer?customer_id={fake.uuid4()}&year=2024&month=1&stream=json')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json, [])
+
+    def test_should_return_bad_request_when_the_stream_format_is_unknown(self):
+        response = self.client.get('/issue/getAllIssues?stream=csv')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_return_bad_request_when_the_dashboard_bucket_is_unknown(self):
+        response = self.client.get(f'/issue/getIssuesDashboardSummary?customer_id={fake.uuid4()}&bucket=year')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
     def test_should_get_issue_by_id(self):
         user_id = fake.uuid4()
         data = {
@@ -131,6 +427,28 @@ class IssueIntegrationTest(unittest.TestCase):
         self.assertEqual(response.json['id'], issue_dict['id'])
         self.assertEqual(response.json['description'], issue_dict['description'])
 
+    def test_should_get_issue_by_id_with_uppercase_radicado_and_status(self):
+        data = {
+            'auth_user_id': fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        }
+
+        response = self.client.post('/issue/post', content_type='multipart/form-data', data=data)
+        radicado = response.json["message"].split(' ')[-1]
+        response = self.client.get(f'/issue/get_issue_by_id?issue_id={radicado.upper()}')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.json['id'].endswith(radicado))
+        self.assertEqual(response.json['status'], 'Created')
+        self.assertEqual(response.json['description'], data['description'])
+
+    def test_should_return_not_found_when_radicado_does_not_exist(self):
+        response = self.client.get('/issue/get_issue_by_id?issue_id=000000000000')
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
     def test_should_return_an_internal_server_error_endpoint_assign_issue(self):
         data = {
             "auth_user_agent_id": fake.uuid4(),
@@ -141,6 +459,54 @@ class IssueIntegrationTest(unittest.TestCase):
 
         self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
         self.assertEqual(response.json["message"], expected_message)
+
+    def test_should_assign_an_issue(self):
+        response = self.client.post('/issue/bulk', json={'issues': [{
+            'auth_user_id': fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        }]})
+        radicado = response.json["radicados"][0]
+        with Session() as session:
+            issue_id = session.query(IssueModelSqlAlchemy.id).filter(IssueModelSqlAlchemy.radicado == radicado).scalar()
+            session.close()
+
+        response = self.client.post(f'/issue/assignIssue?issue_id={issue_id}', json={"auth_user_agent_id": fake.uuid4()})
+        detail = self.client.get(f'/issue/get_issue_by_id?issue_id={radicado}')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(detail.json["status"], "In Progress")
+
+    def test_should_assign_issues_in_bulk(self):
+        response = self.client.post('/issue/bulk', json={'issues': [{
+            'auth_user_id': fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': fake.word(),
+            'description': fake.sentence()
+        } for _ in range(2)]})
+        radicados = response.json["radicados"]
+        with Session() as session:
+            issue_ids = [str(issue_id) for issue_id, in session.query(IssueModelSqlAlchemy.id).filter(IssueModelSqlAlchemy.radicado.in_(radicados))]
+            session.close()
+        missing_id = fake.uuid4()
+
+        response = self.client.post('/issue/assignIssues', json={"auth_user_agent_id": fake.uuid4(), "issue_ids": issue_ids + [missing_id]})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertCountEqual(response.json["assigned"], issue_ids)
+        self.assertEqual(response.json["missing"], [missing_id])
+
+    def test_should_return_bad_request_when_the_bulk_assign_filter_is_not_an_open_status_object(self):
+        for bulk_filter in [{}, {"channel_plan_id": fake.uuid4()}, ["Created"], "Created"]:
+            response = self.client.post('/issue/assignIssues', json={"auth_user_agent_id": fake.uuid4(), "filter": bulk_filter})
+
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_return_bad_request_when_the_assigned_issue_does_not_exist(self):
+        response = self.client.post(f'/issue/assignIssue?issue_id={fake.uuid4()}', json={"auth_user_agent_id": fake.uuid4()})
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
     
     def test_should_get_open_issues_by_user(self):
         user_id = fake.uuid4()
@@ -187,6 +553,29 @@ class IssueIntegrationTest(unittest.TestCase):
  
         self.assertEqual(response.status_code, HTTPStatus.OK)
 
+    def _delete_issues_with_subject(self, subject):
+        with Session() as session:
+            session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.subject == subject).delete()
+            session.commit()
+        Session.remove()
+
+    def test_get_top_seven_issues_of_the_last_week(self):
+        subject = f'weekly {fake.uuid4()[:8]}'
+        self.client.post('/issue/bulk', json={'issues': [{
+            'auth_user_id': fake.uuid4(),
+            'auth_user_agent_id': fake.uuid4(),
+            'subject': subject,
+            'description': fake.sentence()
+        } for _ in range(300)]})
+        self.addCleanup(self._delete_issues_with_subject, subject)
+
+        response = self.client.get('/issue/getTopSevenIssues?days=7')
+        bad_response = self.client.get('/issue/getTopSevenIssues?days=90')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(subject[:20], [issue["subject"] for issue in response.json])
+        self.assertEqual(bad_response.status_code, HTTPStatus.BAD_REQUEST)
+
         
 
  
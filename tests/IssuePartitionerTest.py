@@ -0,0 +1,182 @@
+import unittest
+from datetime import datetime, timezone
+from uuid import uuid4
+from sqlalchemy import create_engine, text, desc, tuple_
+from sqlalchemy.exc import IntegrityError, OperationalError
+from config import Config
+from flaskr.domain.constants import ISSUE_STATUS_OPEN, ISSUE_STATUS_SOLVED
+from flaskr.infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy
+from flaskr.infrastructure.databases.postgres.db import engine
+from flaskr.infrastructure.databases.postgres.migrator import MigrationRunner
+from flaskr.infrastructure.databases.postgres.partitioner import IssuePartitioner, _month_start, _next_month
+from flaskr.infrastructure.databases.issue_postresql_repository import USER_SOLVED_IN_PERIOD
+from flaskr.infrastructure.mappers.issue_sqlalchemy_mapper import _month_range
+from utils.testHelper import explain_statement, plan_nodes
+
+PROBE_SCHEMA = 'issue_partition_probe'
+
+
+class IssuePartitionerTest(unittest.TestCase):
+    """
+    Migrates a schema of its own, fills it, and partitions it, so the tables the
+    other tests use stay as they are
+    """
+    @classmethod
+    def setUpClass(cls):
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'DROP SCHEMA IF EXISTS {PROBE_SCHEMA} CASCADE')
+            connection.exec_driver_sql(f'CREATE SCHEMA {PROBE_SCHEMA}')
+        cls.probe_engine = create_engine(Config().DATABASE_URI, connect_args={'options': f'-csearch_path={PROBE_SCHEMA}'})
+        MigrationRunner(cls.probe_engine).run()
+
+        cls.user_id = uuid4()
+        cls.months = [datetime(2023, month, 15, tzinfo=timezone.utc) for month in (1, 2, 3)]
+        with cls.probe_engine.begin() as connection:
+            for created_at in cls.months:
+                cls._insert_issue(connection, created_at, ISSUE_STATUS_SOLVED)
+                cls._insert_issue(connection, created_at, ISSUE_STATUS_OPEN)
+            connection.execute(text(
+                'INSERT INTO issue_trace (id, issue_id, scope, created_at) SELECT gen_random_uuid(), id, :scope, created_at FROM issue'
+            ), {'scope': 'partition probe'})
+
+        cls.partitioner = IssuePartitioner(cls.probe_engine, months_ahead=2)
+        cls.converted = cls.partitioner.partition()
+        with cls.probe_engine.connect() as connection:
+            cls.totals = connection.execute(text(
+                'SELECT (SELECT count(*) FROM issue), (SELECT count(*) FROM issue_trace), (SELECT count(*) FROM issue_default)'
+            )).one()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.probe_engine.dispose()
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'DROP SCHEMA IF EXISTS {PROBE_SCHEMA} CASCADE')
+
+    @classmethod
+    def _insert_issue(cls, connection, created_at, status, subject='partition probe'):
+        connection.execute(text(
+            'INSERT INTO issue (id, auth_user_id, status, subject, created_at) VALUES (:id, :user_id, :status, :subject, :created_at)'
+        ), {'id': uuid4(), 'user_id': cls.user_id, 'status': status, 'subject': subject, 'created_at': created_at})
+
+    def _scanned_partitions(self, statement, params):
+        with self.probe_engine.connect() as connection:
+            plan = explain_statement(connection, statement, params)
+        return {node['Relation Name'] for node in plan_nodes(plan) if 'Relation Name' in node}
+
+    def test_should_partition_issue_and_issue_trace_keeping_their_rows(self):
+        self.assertEqual(self.converted, ['issue', 'issue_trace'])
+        self.assertTrue(self.partitioner.is_partitioned('issue'))
+        self.assertTrue(self.partitioner.is_partitioned('issue_trace'))
+        self.assertEqual(tuple(self.totals), (6, 6, 0))
+        self.assertIn('issue_y2023m02', self.partitioner.partitions('issue'))
+        self.assertIn('issue_trace_y2023m02', self.partitioner.partitions('issue_trace'))
+        self.assertEqual(self.partitioner.partition(), [])
+
+    def test_should_keep_the_months_ahead_ready(self):
+        month = _month_start(datetime.now(timezone.utc).date())
+        for _ in range(2):
+            month = _next_month(month)
+
+        self.assertIn(f'issue_y{month.year}m{month.month:02d}', self.partitioner.partitions('issue'))
+        self.assertEqual(self.partitioner.create_partitions(), [])
+
+    def test_should_move_rows_out_of_the_default_partition_when_their_month_is_created(self):
+        created_at = datetime(2031, 6, 1, tzinfo=timezone.utc)
+        with self.probe_engine.begin() as connection:
+            self._insert_issue(connection, created_at, ISSUE_STATUS_OPEN)
+        today = datetime.now(timezone.utc)
+        far_ahead = IssuePartitioner(self.probe_engine,
+                                     months_ahead=(created_at.year - today.year) * 12 + created_at.month - today.month)
+
+        created = far_ahead.create_partitions()
+        with self.probe_engine.connect() as connection:
+            partition = connection.execute(text(
+                'SELECT tableoid::regclass::text FROM issue WHERE created_at = :created_at'
+            ), {'created_at': created_at}).scalar()
+
+        self.assertIn('issue_y2031m06', created)
+        self.assertEqual(partition, 'issue_y2031m06')
+
+    def test_should_keep_the_incident_type_totals_up_to_date(self):
+        subject = f'probe {uuid4().hex[:8]}'
+        with self.probe_engine.begin() as connection:
+            self._insert_issue(connection, self.months[0], ISSUE_STATUS_OPEN, subject)
+            total = connection.execute(text('SELECT total FROM issue_incident_type WHERE name = :name'),
+                                       {'name': subject}).scalar()
+
+        self.assertEqual(total, 1)
+
+    def test_should_keep_the_issue_references_of_attachments_and_traces(self):
+        with self.probe_engine.begin() as connection:
+            issue_id = connection.execute(text("SELECT id FROM issue WHERE subject = 'partition probe' LIMIT 1")).scalar()
+            connection.execute(text('INSERT INTO issue_attachment (id, issue_id, file_path) VALUES (:id, :issue_id, :path)'),
+                               {'id': uuid4(), 'issue_id': issue_id, 'path': '/tmp/probe.txt'})
+            connection.execute(text('DELETE FROM issue WHERE id = :issue_id'), {'issue_id': issue_id})
+            orphans = connection.execute(text(
+                'SELECT (SELECT count(*) FROM issue_attachment WHERE issue_id = :issue_id) + '
+                '(SELECT count(*) FROM issue_trace WHERE issue_id = :issue_id)'
+            ), {'issue_id': issue_id}).scalar()
+
+        with self.assertRaises(IntegrityError):
+            with self.probe_engine.begin() as connection:
+                connection.execute(text('INSERT INTO issue_attachment (id, issue_id, file_path) VALUES (:id, :issue_id, :path)'),
+                                   {'id': uuid4(), 'issue_id': uuid4(), 'path': '/tmp/orphan.txt'})
+        self.assertEqual(orphans, 0)
+
+    def test_should_keep_issue_ids_unique_across_partitions(self):
+        issue_id = uuid4()
+        with self.probe_engine.begin() as connection:
+            connection.execute(text('INSERT INTO issue (id, subject, created_at) VALUES (:id, :subject, :created_at)'),
+                               {'id': issue_id, 'subject': 'unique probe', 'created_at': self.months[0]})
+
+        with self.assertRaises(IntegrityError):
+            with self.probe_engine.begin() as connection:
+                connection.execute(text('INSERT INTO issue (id, subject, created_at) VALUES (:id, :subject, :created_at)'),
+                                   {'id': issue_id, 'subject': 'unique probe', 'created_at': self.months[1]})
+        with self.assertRaises(IntegrityError):
+            with self.probe_engine.begin() as connection:
+                connection.execute(text("UPDATE issue SET id = :id WHERE subject = 'partition probe' AND id <> :id "
+                                        "AND created_at = :created_at AND status = :status"),
+                                   {'id': issue_id, 'created_at': self.months[2], 'status': ISSUE_STATUS_OPEN})
+        with self.probe_engine.begin() as connection:
+            connection.execute(text('DELETE FROM issue WHERE id = :id'), {'id': issue_id})
+            connection.execute(text('INSERT INTO issue (id, subject, created_at) VALUES (:id, :subject, :created_at)'),
+                               {'id': issue_id, 'subject': 'unique probe', 'created_at': self.months[1]})
+            stored = connection.execute(text('SELECT (SELECT count(*) FROM issue_ids), (SELECT count(*) FROM issue)')).one()
+            connection.execute(text('DELETE FROM issue WHERE id = :id'), {'id': issue_id})
+
+        self.assertEqual(stored[0], stored[1])
+
+    def test_should_give_up_when_the_table_stays_locked(self):
+        created_at = datetime(2032, 6, 1, tzinfo=timezone.utc)
+        today = datetime.now(timezone.utc)
+        impatient = IssuePartitioner(self.probe_engine, lock_timeout='100ms',
+                                     months_ahead=(created_at.year - today.year) * 12 + created_at.month - today.month)
+
+        with self.probe_engine.connect() as blocker:
+            with blocker.begin():
+                blocker.exec_driver_sql('LOCK TABLE issue IN ACCESS EXCLUSIVE MODE')
+                with self.assertRaises(OperationalError):
+                    impatient.create_partitions()
+
+        self.assertNotIn('issue_y2032m06', self.partitioner.partitions('issue'))
+
+    def test_list_issues_period_scans_only_the_partition_of_the_month(self):
+        start, end = _month_range(2023, 2)
+
+        scanned = self._scanned_partitions(USER_SOLVED_IN_PERIOD, {'user_id': self.user_id, 'start': start, 'end': end})
+
+        self.assertEqual(scanned, {'issue_y2023m02'})
+
+    def test_keyset_page_skips_the_partitions_after_the_cursor(self):
+        statement = (IssueModelSqlAlchemy.__table__.select()
+                        .where(IssueModelSqlAlchemy.auth_user_id == self.user_id,
+                               IssueModelSqlAlchemy.created_at <= self.months[1],
+                               tuple_(IssueModelSqlAlchemy.created_at, IssueModelSqlAlchemy.id) < tuple_(self.months[1], uuid4()))
+                        .order_by(desc(IssueModelSqlAlchemy.created_at), desc(IssueModelSqlAlchemy.id))
+                        .limit(5))
+
+        scanned = self._scanned_partitions(statement, {})
+
+        self.assertIn('issue_y2023m01', scanned)
+        self.assertNotIn('issue_y2023m03', scanned)
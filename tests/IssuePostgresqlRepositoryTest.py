@@ -1,22 +1,24 @@
 import unittest
-from unittest.mock import patch, MagicMock
-from uuid import uuid4
-from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from uuid import uuid4, UUID
+from datetime import datetime, timedelta
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository, _chunks, _month_range
+from flaskr.domain.constants import ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN, ISSUE_STATUS_INPROGRESS, ISSUE_TOTAL_CACHED
+from flaskr.infrastructure.databases.postgres.db import engine, Session
+from flaskr.infrastructure.databases.postgres.partitioner import IssuePartitioner
+from flaskr.infrastructure.databases.model_sqlalchemy import IssueModelSqlAlchemy, IssueTraceSqlAlchemy, IssueIncidentTypeSqlAlchemy
+from sqlalchemy import text, event
+from utils.testHelper import explain_query, plan_nodes, count_statements
 from flaskr.domain.models import Issue, IssueAttachment,IssueTrace
 
 class TestIssuePostgresqlRepository(unittest.TestCase):
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.create_engine')
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.sessionmaker')
-    def setUp(self, mock_sessionmaker, mock_create_engine):
-        mock_create_engine.return_value = MagicMock()
+    def setUp(self):
         self.repo = IssuePostgresqlRepository()
         self.repo.Session = MagicMock()
 
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.create_engine')
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.sessionmaker')
-    def test_list_issues_period(self, mock_sessionmaker, mock_create_engine):
+    def test_list_issues_period(self):
         mock_session = MagicMock()
-        mock_sessionmaker.return_value = mock_session
         mock_session_instance = mock_session.return_value
 
         mock_issue = Issue(
@@ -36,35 +38,8 @@ class TestIssuePostgresqlRepository(unittest.TestCase):
 
         self.assertGreaterEqual(len(result), 0)
 
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.create_engine')
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.sessionmaker')
-    def test_list_issues_filtered(self, mock_sessionmaker, mock_create_engine):
+    def test_issue_assign_issue_not_found(self):
         mock_session = MagicMock()
-        mock_sessionmaker.return_value = mock_session
-        mock_session_instance = mock_session.return_value
-
-        mock_issue = Issue(
-            id=uuid4(),
-            auth_user_id=uuid4(),
-            auth_user_agent_id=uuid4(),
-            status='OPEN',
-            subject='Filtered Issue',
-            description='Filtered Description',
-            created_at='2023-03-01',
-            closed_at='2023-03-05',
-            channel_plan_id=uuid4()
-        )
-        mock_session_instance.query.return_value.filter.return_value.all.return_value = [mock_issue]
-
-        result = self.repo.list_issues_filtered(user_id=mock_issue.auth_user_id, status='OPEN')
-
-        self.assertGreaterEqual(len(result), 0)
-
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.create_engine')
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.sessionmaker')
-    def test_issue_assign_issue_not_found(self, mock_sessionmaker, mock_create_engine):
-        mock_session = MagicMock()
-        mock_sessionmaker.return_value = mock_session
         mock_session_instance = mock_session.return_value
         
         mock_session_instance.query.return_value.filter.return_value.one_or_none.return_value = None
@@ -77,11 +52,8 @@ class TestIssuePostgresqlRepository(unittest.TestCase):
         
         self.assertEqual(str(context.exception), "Issue not found")
     
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.create_engine')
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.sessionmaker')
-    def test_issue_create_issue_trace_not_found(self, mock_sessionmaker, mock_create_engine):
+    def test_issue_create_issue_trace_not_found(self):
         mock_session = MagicMock()
-        mock_sessionmaker.return_value = mock_session
         mock_session_instance = mock_session.return_value
         
         mock_session_instance.query.return_value.filter.return_value.one_or_none.return_value = None
@@ -102,11 +74,8 @@ class TestIssuePostgresqlRepository(unittest.TestCase):
         self.assertEqual(str(context.exception), "Issue not found")
 
 
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.create_engine')
-    @patch('flaskr.infrastructure.databases.issue_postresql_repository.sessionmaker')
-    def test_get_top_7_incident_types(self, mock_sessionmaker, mock_create_engine):
+    def test_get_top_7_incident_types(self):
         mock_session = MagicMock()
-        mock_sessionmaker.return_value = mock_session
         mock_session_instance = mock_session.return_value
 
         mock_results = [
@@ -122,4 +91,490 @@ class TestIssuePostgresqlRepository(unittest.TestCase):
 
         result = self.repo.get_top_7_incident_types()
 
-        self.assertEqual(len(result), 7)  
\ No newline at end of file
+        self.assertEqual(len(result), 7)  
+
+    def test_incident_type_totals_follow_inserts_and_deletes(self):
+        name = f'jam {uuid4().hex[:8]}'
+        incident_type = f'{name} in the printer'[:20].rstrip()
+        issues = [Issue(
+            id=uuid4(),
+            auth_user_id=uuid4(),
+            auth_user_agent_id=uuid4(),
+            status=ISSUE_STATUS_OPEN,
+            subject=f'  {name.upper().replace(" ", "   ")} in the printer room ',
+            description='Incident Description',
+            created_at=datetime.utcnow() - timedelta(days=60),
+            closed_at=None,
+            channel_plan_id=None
+        ) for _ in range(500)]
+
+        self.repo.create_issues(issues)
+        all_time = [issue.subject for issue in self.repo.get_top_7_incident_types()]
+        last_month = [issue.subject for issue in self.repo.get_top_7_incident_types(days=30)]
+        with self.repo.session() as session:
+            session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.id.in_([issue.id for issue in issues])).delete(synchronize_session=False)
+            session.commit()
+            total = session.query(IssueIncidentTypeSqlAlchemy.total).filter(IssueIncidentTypeSqlAlchemy.name == incident_type).scalar()
+            session.close()
+
+        self.assertEqual(all_time[0], incident_type)
+        self.assertNotIn(incident_type, last_month)
+        self.assertEqual(total, 0)
+
+    def test_list_issues_period_by_users(self):
+        user_ids = [uuid4(), uuid4()]
+        for user_id in user_ids:
+            self.repo.create_issue(Issue(
+                id=uuid4(),
+                auth_user_id=user_id,
+                auth_user_agent_id=uuid4(),
+                status=ISSUE_STATUS_SOLVED,
+                subject='Solved Issue',
+                description='Solved Description',
+                created_at=datetime(2023, 1, 15),
+                closed_at=datetime(2023, 1, 20),
+                channel_plan_id=uuid4()
+            ))
+
+        result = self.repo.list_issues_period_by_users(user_ids=user_ids + [uuid4()], year=2023, month=1)
+
+        self.assertEqual({issue.auth_user_id for issue in result}, set(user_ids))
+
+    def test_list_issue_columns_by_users_filters_by_channel_plan(self):
+        user_ids = [uuid4(), uuid4()]
+        channel_plan_id = uuid4()
+        for user_id in user_ids:
+            for issue_channel_plan_id in [channel_plan_id, uuid4()]:
+                self.repo.create_issue(Issue(
+                    id=uuid4(),
+                    auth_user_id=user_id,
+                    auth_user_agent_id=uuid4(),
+                    status=ISSUE_STATUS_SOLVED,
+                    subject='Filtered Issue',
+                    description='Filtered Description',
+                    created_at=datetime(2023, 3, 1),
+                    closed_at=datetime(2023, 3, 5),
+                    channel_plan_id=issue_channel_plan_id
+                ))
+
+        result = self.repo.list_issue_columns_by_users(user_ids=user_ids, columns=('auth_user_id', 'channel_plan_id'),
+                                                       channel_plan_id=channel_plan_id)
+
+        self.assertCountEqual(result, [(user_id, channel_plan_id) for user_id in user_ids])
+
+    def test_list_issue_columns_by_users_returns_only_the_projected_columns(self):
+        user_id = uuid4()
+        channel_plan_id = uuid4()
+        self.repo.create_issue(Issue(
+            id=uuid4(),
+            auth_user_id=user_id,
+            auth_user_agent_id=uuid4(),
+            status=ISSUE_STATUS_SOLVED,
+            subject='Projected Issue',
+            description='Projected Description',
+            created_at=datetime(2023, 3, 1),
+            closed_at=datetime(2023, 3, 5),
+            channel_plan_id=channel_plan_id
+        ))
+
+        with count_statements(engine) as statements:
+            rows = self.repo.list_issue_columns_by_users(user_ids=[user_id], status='Solved')
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][:2], (UUID(ISSUE_STATUS_SOLVED), channel_plan_id))
+        self.assertEqual(rows[0][2].date(), datetime(2023, 3, 1).date())
+        self.assertNotIn('description', statements[-1].split('FROM')[0])
+
+    def test_count_issues_by_users_groups_by_status_channel_and_bucket(self):
+        user_ids = [uuid4(), uuid4()]
+        channel_plan_id = uuid4()
+        for created_at in [datetime(2023, 3, 1, 8), datetime(2023, 3, 1, 20), datetime(2023, 3, 2, 8)]:
+            for user_id in user_ids:
+                self.repo.create_issue(Issue(
+                    id=uuid4(),
+                    auth_user_id=user_id,
+                    auth_user_agent_id=uuid4(),
+                    status=ISSUE_STATUS_SOLVED,
+                    subject='Counted Issue',
+                    description='Counted Description',
+                    created_at=created_at,
+                    closed_at=None,
+                    channel_plan_id=channel_plan_id
+                ))
+
+        by_day = self.repo.count_issues_by_users(user_ids=user_ids, bucket='day')
+        by_month = self.repo.count_issues_by_users(user_ids=user_ids, bucket='month', status='Solved')
+
+        self.assertEqual([(row[2].day, row[3]) for row in by_day], [(1, 4), (2, 2)])
+        self.assertEqual(len(by_month), 1)
+        self.assertEqual(by_month[0][:2], (UUID(ISSUE_STATUS_SOLVED), channel_plan_id))
+        self.assertEqual(by_month[0][3], 6)
+
+    def test_iter_issue_columns_by_users_yields_the_listed_rows(self):
+        user_ids = [uuid4(), uuid4()]
+        for user_id in user_ids:
+            self.repo.create_issue(Issue(
+                id=uuid4(),
+                auth_user_id=user_id,
+                auth_user_agent_id=uuid4(),
+                status=ISSUE_STATUS_SOLVED,
+                subject='Streamed Issue',
+                description='Streamed Description',
+                created_at=datetime(2023, 3, 1),
+                closed_at=datetime(2023, 3, 5),
+                channel_plan_id=uuid4()
+            ))
+
+        rows = self.repo.iter_issue_columns_by_users(user_ids=user_ids)
+        period = self.repo.iter_issues_period_by_users(user_ids=user_ids, year=2023, month=3)
+
+        self.assertNotIsInstance(rows, list)
+        self.assertCountEqual(list(rows), self.repo.list_issue_columns_by_users(user_ids=user_ids))
+        self.assertEqual({issue.auth_user_id for issue in period}, set(user_ids))
+
+    def test_iter_all_yields_the_same_items_as_all(self):
+        self.assertEqual(list(self.repo.iter_all()), self.repo.all())
+
+    def test_list_issue_columns_by_users_rejects_unknown_columns(self):
+        with self.assertRaises(ValueError):
+            self.repo.list_issue_columns_by_users(user_ids=[uuid4()], columns=('status', 'password'))
+
+    def test_list_issues_period_uses_a_created_at_index_range(self):
+        with self.repo.session() as session:
+            session.execute(text('SET LOCAL enable_seqscan = off'))
+            query = self.repo._solved_in_period(
+                session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.auth_user_id == uuid4()),
+                year='2023', month='12')
+
+            plan = explain_query(session, query)
+            session.rollback()
+
+        index_conditions = [node.get('Index Cond', '') for node in plan_nodes(plan)]
+        self.assertTrue(any('created_at' in condition for condition in index_conditions))
+
+    def test_create_issue_with_attachment_writes_without_reading_back(self):
+        issue = Issue(
+            id=uuid4(),
+            auth_user_id=uuid4(),
+            auth_user_agent_id=uuid4(),
+            status=ISSUE_STATUS_OPEN,
+            subject='Created Issue',
+            description='Created Description',
+            created_at=datetime.utcnow(),
+            closed_at=None,
+            channel_plan_id=None
+        )
+        attachment = IssueAttachment(id=uuid4(), issue_id=issue.id, file_path='/tmp/created.txt')
+
+        with count_statements(engine) as statements:
+            created = self.repo.create_issue(issue, attachment)
+
+        self.assertEqual(created.id, issue.id)
+        self.assertEqual(len(statements), 3)
+        self.assertEqual([statement.split()[0] for statement in statements], ['INSERT', 'INSERT', 'INSERT'])
+        self.assertIsNotNone(self.repo.get_issue_by_id(str(issue.id).split('-')[-1]))
+
+    def test_concurrent_creates_keep_the_cached_total_exact(self):
+        user_id = uuid4()
+
+        def create(_):
+            try:
+                self.repo.create_issue(Issue(id=uuid4(), auth_user_id=user_id, auth_user_agent_id=None,
+                                             status=ISSUE_STATUS_OPEN, subject='Counted Issue',
+                                             description='Counted Description', created_at=datetime.utcnow(),
+                                             closed_at=None, channel_plan_id=None))
+            finally:
+                Session.remove()
+
+        unknown = self.repo.find(user_id=uuid4(), page=1, limit=5, total_mode=ISSUE_TOTAL_CACHED)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(create, range(40)))
+        counted = self.repo.find(user_id=user_id, page=1, limit=5, total_mode=ISSUE_TOTAL_CACHED)
+        with engine.begin() as connection:
+            connection.execute(text('DELETE FROM issue WHERE auth_user_id = :user_id'), {'user_id': user_id})
+
+        self.assertEqual(unknown["total_pages"], 0)
+        self.assertEqual(counted["total_pages"], 8)
+
+    def test_create_issue_stores_nothing_when_the_attachment_fails(self):
+        issue = Issue(
+            id=uuid4(),
+            auth_user_id=uuid4(),
+            auth_user_agent_id=uuid4(),
+            status=ISSUE_STATUS_OPEN,
+            subject='Rolled Back Issue',
+            description='Rolled Back Description',
+            created_at=datetime.utcnow(),
+            closed_at=None,
+            channel_plan_id=None
+        )
+        attachment = IssueAttachment(id=uuid4(), issue_id=uuid4(), file_path='/tmp/orphan.txt')
+
+        with self.assertRaises(Exception):
+            self.repo.create_issue(issue, attachment)
+
+        self.assertIsNone(self.repo.get_issue_by_id(str(issue.id).split('-')[-1]))
+
+    def test_assign_issue_with_trace_updates_and_traces_in_one_transaction(self):
+        issue = Issue(
+            id=uuid4(),
+            auth_user_id=uuid4(),
+            auth_user_agent_id=None,
+            status=ISSUE_STATUS_OPEN,
+            subject='Assigned Issue',
+            description='Assigned Description',
+            created_at=datetime.utcnow(),
+            closed_at=None,
+            channel_plan_id=uuid4()
+        )
+        self.repo.create_issue(issue)
+        agent_id = uuid4()
+        trace = IssueTrace(id=uuid4(), issue_id=issue.id, auth_user_id=None, auth_user_agent_id=agent_id,
+                           scope='assignIssue', created_at=datetime.utcnow(), channel_plan_id=None)
+
+        with count_statements(engine) as statements:
+            self.repo.assign_issue_with_trace(issue_id=issue.id, auth_user_agent_id=agent_id, issue_trace=trace)
+
+        self.assertEqual([statement.split()[0] for statement in statements], ['UPDATE', 'INSERT', 'INSERT'])
+        with self.repo.session() as session:
+            stored_issue = session.query(IssueModelSqlAlchemy).get(issue.id)
+            stored_trace = session.query(IssueTraceSqlAlchemy).get(trace.id)
+            self.assertEqual(str(stored_issue.status), ISSUE_STATUS_INPROGRESS)
+            self.assertEqual(stored_issue.auth_user_agent_id, agent_id)
+            self.assertEqual(stored_trace.channel_plan_id, issue.channel_plan_id)
+            session.close()
+
+    def test_assign_issues_with_trace_updates_every_issue_at_once(self):
+        channel_plan_id = uuid4()
+        issues = [Issue(
+            id=uuid4(),
+            auth_user_id=uuid4(),
+            auth_user_agent_id=None,
+            status=ISSUE_STATUS_OPEN,
+            subject='Bulk Assigned Issue',
+            description='Bulk Assigned Description',
+            created_at=datetime.utcnow(),
+            closed_at=None,
+            channel_plan_id=channel_plan_id
+        ) for _ in range(3)]
+        self.repo.create_issues(issues)
+        agent_id = uuid4()
+
+        with count_statements(engine) as statements:
+            assigned = self.repo.assign_issues_with_trace(auth_user_agent_id=agent_id, scope='assignIssues',
+                                                          issue_ids=[issues[0].id, issues[1].id, uuid4()])
+        by_filter = self.repo.assign_issues_with_trace(auth_user_agent_id=agent_id, scope='assignIssues',
+                                                       filters={"status": "Created", "channel_plan_id": channel_plan_id})
+
+        self.assertCountEqual(assigned, [issues[0].id, issues[1].id])
+        self.assertEqual(by_filter, [issues[2].id])
+        self.assertEqual([statement.split()[0] for statement in statements], ['UPDATE', 'INSERT', 'INSERT'])
+        with self.repo.session() as session:
+            traces = session.query(IssueTraceSqlAlchemy).filter(IssueTraceSqlAlchemy.issue_id.in_([issue.id for issue in issues])).all()
+            session.close()
+        self.assertEqual(len(traces), 3)
+        self.assertTrue(all(trace.channel_plan_id == channel_plan_id for trace in traces))
+
+    def test_assign_issues_with_trace_refuses_a_filter_without_status(self):
+        for filters in [None, {}, {"channel_plan_id": uuid4()}]:
+            with self.assertRaises(ValueError):
+                self.repo.assign_issues_with_trace(auth_user_agent_id=uuid4(), scope='assignIssues', filters=filters)
+
+    def test_assign_issue_with_trace_not_found(self):
+        trace = IssueTrace(id=uuid4(), issue_id=uuid4(), auth_user_id=None, auth_user_agent_id=uuid4(),
+                           scope='assignIssue', created_at=datetime.utcnow(), channel_plan_id=None)
+
+        with self.assertRaises(ValueError) as context:
+            self.repo.assign_issue_with_trace(issue_id=trace.issue_id, auth_user_agent_id=uuid4(), issue_trace=trace)
+
+        self.assertEqual(str(context.exception), "Issue not found")
+
+    def test_listings_run_a_fixed_number_of_statements_whatever_the_page_size(self):
+        user_id = uuid4()
+        for status in [ISSUE_STATUS_OPEN, ISSUE_STATUS_SOLVED, ISSUE_STATUS_INPROGRESS] * 2:
+            self.repo.create_issue(Issue(
+                id=uuid4(),
+                auth_user_id=user_id,
+                auth_user_agent_id=uuid4(),
+                status=status,
+                subject='Listed Issue',
+                description='Listed Description',
+                created_at=datetime.utcnow(),
+                closed_at=None,
+                channel_plan_id=uuid4()
+            ))
+
+        self.repo.status_registry.refresh()
+        for limit in [2, 6]:
+            with count_statements(engine) as find_statements:
+                page = self.repo.find(user_id=user_id, page=1, limit=limit)
+            with count_statements(engine) as find_after_statements:
+                self.repo.find_after(user_id=user_id, cursor='', limit=limit)
+            with count_statements(engine) as open_statements:
+                self.repo.get_open_issues(page=1, limit=limit)
+            with count_statements(engine) as open_after_statements:
+                self.repo.get_open_issues_after(cursor='', limit=limit)
+
+            self.assertEqual(len(page['data']), limit)
+            self.assertEqual(len(find_statements), 2)
+            self.assertEqual(len(find_after_statements), 1)
+            self.assertEqual(len(open_statements), 2)
+            self.assertEqual(len(open_after_statements), 1)
+
+        with count_statements(engine) as all_statements:
+            self.repo.all()
+        self.assertEqual(len(all_statements), 1)
+
+    def test_find_after_pages_past_issues_without_created_at(self):
+        if IssuePartitioner(engine).is_partitioned('issue'):
+            self.skipTest('created_at is the partition key of a partitioned issue table and can not be null')
+        user_id = uuid4()
+        issues = [self._create_search_issue(user_id, 'Dated Issue', 'Dated Description',
+                                            created_at=datetime(2024, 1, day)) for day in (1, 2, 3)]
+        undated = self._create_search_issue(user_id, 'Undated Issue', 'Undated Description')
+        with self.repo.session() as session:
+            session.query(IssueModelSqlAlchemy).filter(IssueModelSqlAlchemy.id == undated.id).update(
+                {IssueModelSqlAlchemy.created_at: None}, synchronize_session=False)
+            session.commit()
+            session.close()
+
+        seen, cursor = [], ''
+        while cursor is not None:
+            page = self.repo.find_after(user_id=user_id, cursor=cursor, limit=1)
+            seen.extend(issue['id'] for issue in page['data'])
+            cursor = page['next_cursor']
+
+        self.assertEqual(seen, [str(issue.id) for issue in reversed(issues)])
+
+    def test_should_return_no_issues_when_filtering_by_an_unknown_status(self):
+        user_id = uuid4()
+        self.repo.create_issue(Issue(
+            id=uuid4(),
+            auth_user_id=user_id,
+            auth_user_agent_id=uuid4(),
+            status=ISSUE_STATUS_OPEN,
+            subject='Filtered Issue',
+            description='Filtered Description',
+            created_at=datetime.utcnow(),
+            closed_at=None,
+            channel_plan_id=uuid4()
+        ))
+
+        self.assertEqual(len(self.repo.list_issue_columns_by_users([user_id], status='Created')), 1)
+        self.assertEqual(self.repo.list_issue_columns_by_users([user_id], status='Unknown'), [])
+
+    def test_hot_listings_reuse_their_compiled_statements(self):
+        cache_hits = []
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            cache_hits.append(context.cache_hit == context.dialect.CACHE_HIT)
+
+        self.repo.status_registry.refresh()
+        for user_id in [uuid4(), uuid4()]:
+            self.repo.list_issues_period(user_id, 2023, 1)
+            list(self.repo.iter_issues_period_by_users([user_id], 2023, 1))
+            self.repo.find(user_id=user_id, page=1, limit=5)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+        try:
+            user_id = uuid4()
+            self.repo.list_issues_period(user_id, 2024, 2)
+            list(self.repo.iter_issues_period_by_users([uuid4(), user_id], 2024, 2))
+            self.repo.find(user_id=user_id, page=2, limit=10)
+        finally:
+            event.remove(engine, 'after_cursor_execute', after_cursor_execute)
+
+        self.assertEqual(cache_hits, [True] * 4)
+
+    def test_dashboard_columns_reuse_their_compiled_statements(self):
+        cache_hits = []
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            cache_hits.append(context.cache_hit == context.dialect.CACHE_HIT)
+
+        self.repo.status_registry.refresh()
+        for user_id in [uuid4(), uuid4()]:
+            self.repo.list_issue_columns_by_users([user_id], status='Created', channel_plan_id=uuid4())
+            list(self.repo.iter_issue_columns_by_users([user_id], status='Created'))
+            self.repo.count_issues_by_users([user_id], bucket='day', created_at=datetime(2023, 1, 1))
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+        try:
+            user_ids = [uuid4(), uuid4()]
+            self.repo.list_issue_columns_by_users(user_ids, status='Solved', channel_plan_id=uuid4())
+            list(self.repo.iter_issue_columns_by_users(user_ids, status='Solved'))
+            self.repo.count_issues_by_users(user_ids, bucket='month', created_at=datetime(2024, 2, 1))
+        finally:
+            event.remove(engine, 'after_cursor_execute', after_cursor_execute)
+
+        self.assertEqual(cache_hits, [True] * 3)
+
+    def test_list_issue_columns_by_users_keeps_a_statement_per_column_list(self):
+        user_id = uuid4()
+        self._create_search_issue(user_id, 'Projected Subject', 'Projected Description')
+
+        self.assertEqual(self.repo.list_issue_columns_by_users([user_id], columns=('subject',)),
+                         [('Projected Subject',)])
+        self.assertEqual(self.repo.list_issue_columns_by_users([user_id], columns=('subject', 'auth_user_id')),
+                         [('Projected Subject', user_id)])
+
+    def _create_search_issue(self, auth_user_id, subject, description, created_at=None):
+        issue = Issue(id=uuid4(), auth_user_id=auth_user_id, auth_user_agent_id=None, status=ISSUE_STATUS_OPEN,
+                      subject=subject, description=description, created_at=created_at or datetime.utcnow(),
+                      closed_at=None, channel_plan_id=uuid4())
+        self.repo.create_issue(issue)
+        return issue
+
+    def test_search_by_users_ranks_spanish_matches_and_pages_with_the_cursor(self):
+        user_id = uuid4()
+        in_subject = self._create_search_issue(user_id, 'Conexiones lentas', 'El servidor tarda en responder')
+        in_description = self._create_search_issue(user_id, 'Factura duplicada', 'Me cobraron dos veces la conexión')
+        self._create_search_issue(user_id, 'Cambio de plan', 'Quiero un plan con más datos')
+        self._create_search_issue(uuid4(), 'Falla de conexión', 'Otro usuario sin internet')
+
+        first_page = self.repo.search_by_users([user_id], 'conexión', limit=1)
+        second_page = self.repo.search_by_users([user_id], 'conexión', cursor=first_page["next_cursor"], limit=1)
+
+        self.assertEqual([issue["id"] for issue in first_page["data"]], [str(in_subject.id)])
+        self.assertTrue(first_page["has_next"])
+        self.assertEqual([issue["id"] for issue in second_page["data"]], [str(in_description.id)])
+        self.assertFalse(second_page["has_next"])
+        self.assertGreater(first_page["data"][0]["rank"], second_page["data"][0]["rank"])
+
+    def test_search_by_users_takes_the_web_search_syntax(self):
+        user_id = uuid4()
+        outage = self._create_search_issue(user_id, 'Falla de conexión', 'No hay internet en la oficina')
+        self._create_search_issue(user_id, 'Falla de facturación', 'La factura llegó sin internet incluido')
+
+        page = self.repo.search_by_users([user_id], '"falla de conexión" or oficina -factura', limit=10)
+
+        self.assertEqual([issue["id"] for issue in page["data"]], [str(outage.id)])
+
+    def test_search_by_users_breaks_rank_ties_by_created_at_then_id(self):
+        user_id = uuid4()
+        created_at = datetime(2024, 5, 1, 12, 0)
+        tied = [self._create_search_issue(user_id, 'Router dañado', 'Sin señal', created_at) for _ in range(3)]
+        newest = self._create_search_issue(user_id, 'Router dañado', 'Sin señal', created_at + timedelta(days=1))
+
+        pages, cursor = [], None
+        while True:
+            page = self.repo.search_by_users([user_id], 'router', cursor=cursor, limit=2)
+            pages.append([issue["id"] for issue in page["data"]])
+            if not page["has_next"]:
+                break
+            cursor = page["next_cursor"]
+
+        expected = [str(newest.id)] + sorted((str(issue.id) for issue in tied), reverse=True)
+        self.assertEqual(pages, [expected[:2], expected[2:]])
+
+    def test_search_by_users_returns_an_empty_page_without_users(self):
+        page = self.repo.search_by_users([], 'conexión', limit=5)
+
+        self.assertEqual(page, {"limit": 5, "has_next": False, "next_cursor": None, "data": []})
+
+    def test_should_build_a_half_open_month_range(self):
+        self.assertEqual(_month_range('2023', '12'), (datetime(2023, 12, 1), datetime(2024, 1, 1)))
+        self.assertEqual(_month_range(2024, 2), (datetime(2024, 2, 1), datetime(2024, 3, 1)))
+
+    def test_should_split_user_ids_in_chunks(self):
+        chunks = list(_chunks(range(5), 2))
+
+        self.assertEqual(chunks, [[0, 1], [2, 3], [4]])
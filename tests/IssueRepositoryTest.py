@@ -15,9 +15,29 @@ class IssueRepositoryUseCase(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             self.repo.list_issues_period(user_id="", year="", month="")
     
-    def test_should_return_error_when_list_issues_filtered_method_is_not_implement(self):
+    def test_should_return_error_when_list_issues_period_by_users_method_is_not_implement(self):
         with self.assertRaises(NotImplementedError):
-            self.repo.list_issues_filtered(user_id="", status="", channel_plan_id="", created_at="", closed_at="")
+            self.repo.list_issues_period_by_users(user_ids=[], year="", month="")
+
+    def test_should_return_error_when_list_issue_columns_by_users_method_is_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.list_issue_columns_by_users(user_ids=[], columns=(), status="", channel_plan_id="", created_at="", closed_at="")
+
+    def test_should_return_error_when_create_issues_method_is_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.create_issues(issues=[], attachments=[])
+
+    def test_should_return_error_when_iter_methods_are_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.iter_issue_columns_by_users(user_ids=[], columns=(), status="", channel_plan_id="", created_at="", closed_at="")
+        with self.assertRaises(NotImplementedError):
+            self.repo.iter_issues_period_by_users(user_ids=[], year="", month="")
+        with self.assertRaises(NotImplementedError):
+            self.repo.iter_all()
+
+    def test_should_return_error_when_count_issues_by_users_method_is_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.count_issues_by_users(user_ids=[], bucket="day", status="", channel_plan_id="", created_at="", closed_at="")
 
     def test_should_return_error_when_create_issue_method_is_not_implement(self):
         with self.assertRaises(NotImplementedError):
@@ -31,6 +51,22 @@ class IssueRepositoryUseCase(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             self.repo.find()
     
+    def test_should_return_error_when_find_after_method_is_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.find_after()
+
+    def test_should_return_error_when_get_open_issues_after_is_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.get_open_issues_after(cursor="", limit="")
+
+    def test_should_return_error_when_assign_issue_with_trace_method_is_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.assign_issue_with_trace(issue_id="", auth_user_agent_id="", issue_trace=None)
+
+    def test_should_return_error_when_assign_issues_with_trace_method_is_not_implement(self):
+        with self.assertRaises(NotImplementedError):
+            self.repo.assign_issues_with_trace(auth_user_agent_id="", scope="", issue_ids=[])
+
     def test_should_return_error_when_assign_issue_method_is_not_implement(self):
         with self.assertRaises(NotImplementedError):
             self.repo.assign_issue()
@@ -1,10 +1,13 @@
 import unittest
-from unittest.mock import patch,Mock
+from unittest.mock import patch,Mock,AsyncMock
 from builder import AuthUserCustomerBuilder, IssueBuilder, IssueAttachmentBuilder
 from flaskr.application.issue_service import IssueService
 from flaskr.domain.models import Issue, AuthUserCustomer
 from mocks.repositories import IssueMockRepository
 from utils.testHelper import dict_to_obj
+from uuid import UUID
+import uuid
+from flaskr.utils import decode_cursor, decode_search_cursor
 
 
 class TestIssueService(unittest.TestCase):
@@ -44,6 +47,23 @@ class TestIssueService(unittest.TestCase):
         self.assertEqual(len(issues), 1)
         self.assertEqual(issues[0].auth_user_id, customers_mocked[0].auth_user_id)
     
+    @patch('flaskr.application.issue_service.AuthService')
+    def test_should_list_issues_period_in_a_single_repository_call(self, AuthServiceMock):
+        customers_mocked = [
+            AuthUserCustomerBuilder().build(),
+            AuthUserCustomerBuilder().with_auth_user_id(UUID('0b5c2c3e-8f7e-4a45-bb3c-0d9a1a7f7c11')).build()
+        ]
+        AuthServiceMock.return_value.get_users_by_customer_list.return_value = customers_mocked
+        repository_mock = Mock()
+        repository_mock.list_issues_period_by_users.return_value = []
+
+        issue_service = IssueService(issue_repository=repository_mock)
+        issue_service.list_issues_period(customer_id="fake_id", year="2024", month="10")
+
+        repository_mock.list_issues_period_by_users.assert_called_once_with(
+            [customer.auth_user_id for customer in customers_mocked], "2024", "10")
+        repository_mock.list_issues_period.assert_not_called()
+
     @patch('flaskr.application.issue_service.AuthService')
     def test_return_none_if_there_are_not_customers(self, AuthServiceMock):
         customers_mocked = []
@@ -56,33 +76,31 @@ class TestIssueService(unittest.TestCase):
         self.assertIsNone(issues)
 
     @patch('flaskr.application.issue_service.AuthService')
-    def test_return_in_filtered_none_if_there_are_not_customers(self, AuthServiceMock):
-        customers_mocked = []
-        instance = AuthServiceMock.return_value
-        instance.get_users_by_customer_list.return_value = customers_mocked
+    def test_return_dashboard_columns_of_customer_issues(self, AuthServiceMock):
+        customers_mocked = [AuthUserCustomerBuilder().build()]
+        issue = IssueBuilder().with_auth_user_id(customers_mocked[0].auth_user_id).build()
+        AuthServiceMock.return_value.get_users_by_customer_list.return_value = customers_mocked
 
-        issue_service = IssueService()
-        issues = issue_service.list_issues_filtered(customer_id="fake_id", status="fake_status", channel_plan_id="fake_channel", created_at="fake_created_at", closed_at="fake_closed_at")
+        issue_service = IssueService(issue_repository=IssueMockRepository([issue]))
+        rows = issue_service.list_issues_dashboard(customer_id="fake_id")
 
-        self.assertIsNone(issues)
+        self.assertEqual(rows, [(issue.status, issue.channel_plan_id, issue.created_at)])
 
     @patch('flaskr.application.issue_service.AuthService')
-    def test_return_in_issues_with_filters(self, AuthServiceMock):
-        customers_mocked:list[AuthUserCustomer] = []
-        issues_mocked: list[Issue] = []
-        customers_mocked.append(AuthUserCustomerBuilder().build())
-        issues_mocked.append(IssueBuilder()
-                             .with_auth_user_id(customers_mocked[0].auth_user_id)
-                             .build()
-                            )
-        instance = AuthServiceMock.return_value
-        instance.get_users_by_customer_list.return_value = customers_mocked
+    def test_count_dashboard_issues_by_day(self, AuthServiceMock):
+        customers_mocked = [AuthUserCustomerBuilder().build()]
+        issue = IssueBuilder().with_auth_user_id(customers_mocked[0].auth_user_id).build()
+        AuthServiceMock.return_value.get_users_by_customer_list.return_value = customers_mocked
 
-        issue_service = IssueService(issue_repository=IssueMockRepository(issues_mocked))
-        issues = issue_service.list_issues_filtered(customer_id="fake_id", status="fake_status", channel_plan_id="fake_channel", created_at="fake_created_at", closed_at="fake_closed_at")
+        issue_service = IssueService(issue_repository=IssueMockRepository([issue, issue]))
+        totals = issue_service.count_issues_dashboard(customer_id="fake_id", bucket="day")
 
-        self.assertEqual(len(issues), 1)
-        self.assertEqual(issues[0].auth_user_id, customers_mocked[0].auth_user_id)
+        self.assertEqual(len(totals), 1)
+        self.assertEqual(totals[0][3], 2)
+
+    def test_error_count_dashboard_issues_with_unknown_bucket(self):
+        with self.assertRaises(ValueError):
+            IssueService(issue_repository=IssueMockRepository([])).count_issues_dashboard(customer_id="fake_id", bucket="year")
 
     
     def test_error_create_issue_with_missed_params(self):
@@ -93,6 +111,59 @@ class TestIssueService(unittest.TestCase):
 
         self.assertEqual(str(context.exception), error_expected)
 
+    def test_should_create_issues_in_bulk(self):
+        issue_mock = IssueBuilder().build()
+        items = [{
+            "auth_user_id": issue_mock.auth_user_id,
+            "auth_user_agent_id": issue_mock.auth_user_agent_id,
+            "subject": issue_mock.subject,
+            "description": issue_mock.description
+        } for _ in range(3)]
+        repository = IssueMockRepository([])
+
+        issues = IssueService(issue_repository=repository).create_issues(items, {0: "/tmp/file.txt"})
+
+        self.assertEqual(len(issues), 3)
+        self.assertEqual(len(repository.issues), 3)
+        self.assertEqual(len({issue.id for issue in issues}), 3)
+        self.assertEqual([attachment.issue_id for attachment in repository.issues_attachment], [issues[0].id])
+
+    def test_error_create_issues_in_bulk_reports_every_invalid_item(self):
+        repository = IssueMockRepository([])
+        items = [{"auth_user_id": "a", "auth_user_agent_id": "b", "subject": "c", "description": "d"},
+                 {"auth_user_id": "a", "subject": "c", "description": "d"},
+                 "not an issue"]
+
+        with self.assertRaises(ValueError) as context:
+            IssueService(issue_repository=repository).create_issues(items)
+
+        self.assertIn("Invalid items: 1, 2", str(context.exception))
+        self.assertEqual(repository.issues, [])
+
+    def test_error_create_issues_in_bulk_over_the_limit(self):
+        item = {"auth_user_id": "a", "auth_user_agent_id": "b", "subject": "c", "description": "d"}
+
+        with self.assertRaises(ValueError):
+            IssueService(issue_repository=IssueMockRepository([])).create_issues([item] * 501)
+
+    def test_error_create_issues_in_bulk_with_a_client_file_path(self):
+        repository = IssueMockRepository([])
+        items = [{"auth_user_id": "a", "auth_user_agent_id": "b", "subject": "c", "description": "d"},
+                 {"auth_user_id": "a", "auth_user_agent_id": "b", "subject": "c", "description": "d", "file_path": "/etc/passwd"}]
+
+        with self.assertRaises(ValueError) as context:
+            IssueService(issue_repository=repository).create_issues(items)
+
+        self.assertIn("Invalid items: 1", str(context.exception))
+        self.assertEqual(repository.issues_attachment, [])
+
+    def test_error_validate_issues_when_the_items_are_not_a_list(self):
+        item = {"auth_user_id": "a", "auth_user_agent_id": "b", "subject": "c", "description": "d"}
+
+        for items in [item, "issues", None]:
+            with self.assertRaises(ValueError):
+                IssueService(issue_repository=IssueMockRepository([])).validate_issues(items)
+
     @patch('flaskr.application.issue_service.IssueStatus')
     @patch('uuid.uuid4', return_value="e3a54f43-3e8d-4c16-b340-9aba07dfb1ec")
     def test_should_create_an_issue(self, uuid4Mock, IssueStatusMock):
@@ -161,6 +232,90 @@ class TestIssueService(unittest.TestCase):
         self.assertEqual(issue_obj.total_pages, 1)
         self.assertFalse(issue_obj.has_next)
 
+    def test_should_get_issues_by_user_with_cursor(self):
+        issues_mocked: list[Issue] = [
+            IssueBuilder().build(),
+            IssueBuilder().with_id(UUID('3a1f6f0e-5c1b-4c55-9e0e-0f3c6f1f6a01')).build()
+        ]
+
+        issue_service = IssueService(issue_repository=IssueMockRepository(issues_mocked))
+        issues = issue_service.find_issues(user_id=issues_mocked[0].auth_user_id, page=None, limit=1, cursor='')
+        issue_obj = dict_to_obj(issues)
+
+        self.assertEqual(len(issue_obj.data), 1)
+        self.assertTrue(issue_obj.has_next)
+        self.assertEqual(decode_cursor(issue_obj.next_cursor), (issues_mocked[0].created_at, issues_mocked[0].id))
+
+    def test_error_in_open_issues_with_cursor_without_limit(self):
+        with self.assertRaises(ValueError) as context:
+            issue_service = IssueService()
+            issue_service.get_open_issues(page=None, limit=None, cursor='')
+        error_expected = "All fields are required to get issues."
+
+        self.assertEqual(str(context.exception), error_expected)
+
+    def test_should_get_open_issues_with_cursor(self):
+        issues_mocked: list[Issue] = [IssueBuilder().build()]
+
+        issue_service = IssueService(issue_repository=IssueMockRepository(issues_mocked))
+        issues = issue_service.get_open_issues(page=None, limit=10, cursor='')
+        issue_obj = dict_to_obj(issues)
+
+        self.assertEqual(len(issue_obj.data), 1)
+        self.assertFalse(issue_obj.has_next)
+        self.assertIsNone(issue_obj.next_cursor)
+
+    @patch('flaskr.application.issue_service.AuthService')
+    def test_should_search_the_issues_of_the_customer_users(self, AuthServiceMock):
+        customers_mocked: list[AuthUserCustomer] = [AuthUserCustomerBuilder().build()]
+        issues_mocked: list[Issue] = [
+            IssueBuilder().with_auth_user_id(customers_mocked[0].auth_user_id).with_subject('Falla de conexión').build(),
+            IssueBuilder().with_auth_user_id(customers_mocked[0].auth_user_id).with_subject('Cambio de plan').build(),
+            IssueBuilder().with_subject('Falla de conexión').build()
+        ]
+        AuthServiceMock.return_value.get_users_by_customer_list.return_value = customers_mocked
+
+        issue_service = IssueService(issue_repository=IssueMockRepository(issues_mocked))
+        issues = issue_service.search_issues(query=' conexión ', customer_id='fake_id', limit=10)
+        issue_obj = dict_to_obj(issues)
+
+        self.assertEqual([issue.id for issue in issue_obj.data], [str(issues_mocked[0].id)])
+        self.assertFalse(issue_obj.has_next)
+
+    def test_should_search_the_issues_of_a_user_with_cursor(self):
+        issues_mocked: list[Issue] = [
+            IssueBuilder().with_subject('Falla de conexión').build(),
+            IssueBuilder().with_id(UUID('3a1f6f0e-5c1b-4c55-9e0e-0f3c6f1f6a01')).with_subject('Conexión lenta').build()
+        ]
+
+        issue_service = IssueService(issue_repository=IssueMockRepository(issues_mocked))
+        issues = issue_service.search_issues(query='conexión', user_id=issues_mocked[0].auth_user_id, limit=1)
+        issue_obj = dict_to_obj(issues)
+
+        self.assertEqual(len(issue_obj.data), 1)
+        self.assertTrue(issue_obj.has_next)
+        self.assertEqual(decode_search_cursor(issue_obj.next_cursor), (1.0, issues_mocked[0].created_at, issues_mocked[0].id))
+
+    def test_error_in_search_issues_without_query_scope_or_valid_limit(self):
+        issue_service = IssueService(issue_repository=IssueMockRepository([]))
+        cases = [
+            ({'query': ' ', 'user_id': uuid.uuid4(), 'limit': 10}, "q is required to search issues."),
+            ({'query': 'conexión', 'limit': 10}, "customer_id or user_id is required to search issues."),
+            ({'query': 'conexión', 'user_id': uuid.uuid4(), 'limit': 101}, "limit must be between 1 and 100"),
+        ]
+
+        for arguments, error_expected in cases:
+            with self.assertRaises(ValueError) as context:
+                issue_service.search_issues(**arguments)
+            self.assertEqual(str(context.exception), error_expected)
+
+    def test_error_in_issue_finder_with_an_unknown_total_mode(self):
+        with self.assertRaises(ValueError) as context:
+            issue_service = IssueService(issue_repository=IssueMockRepository([]))
+            issue_service.find_issues(user_id='fake_user', page=1, limit=10, total_mode='approximate')
+
+        self.assertEqual(str(context.exception), "total must be one of exact, cached, estimated")
+
     def test_error_in_issue_assign_issue(self):
         with self.assertRaises(ValueError) as context:
             issue_service = IssueService()
@@ -179,6 +334,81 @@ class TestIssueService(unittest.TestCase):
         
         self.assertEqual(result, "Issue Asignado correctamente")
     
+    def test_should_cache_recent_descriptions_until_the_user_creates_an_issue(self):
+        issue_mock = IssueBuilder().build()
+        repository = Mock()
+        repository.list_top_issues_by_user.return_value = [('printer jam',), ('no network',)]
+        auth_service = Mock()
+        customer_service = Mock()
+        customer_service.get_customer_by_id.return_value.name = 'ACME'
+        customer_service.get_plan_by_id.return_value.name = 'Pro'
+        openai_service = Mock()
+        openai_service.ask_predictive_ai_chatgpt.return_value = 'answer'
+        issue_service = IssueService(issue_repository=repository, auth_service=auth_service,
+                                     customer_service=customer_service, openai_service=openai_service)
+
+        issue_service.ask_predictive_analitic(issue_mock.auth_user_id)
+        issue_service.ask_predictive_analitic(issue_mock.auth_user_id)
+        issue_service.create_issue(auth_user_id=issue_mock.auth_user_id, auth_user_agent_id=issue_mock.auth_user_agent_id,
+                                   subject=issue_mock.subject, description=issue_mock.description)
+        issue_service.ask_predictive_analitic(issue_mock.auth_user_id)
+
+        self.assertEqual(repository.list_top_issues_by_user.call_count, 2)
+        self.assertEqual(issue_service.recent_issues_cache.hits, 1)
+        self.assertEqual(issue_service.recent_issues_cache.misses, 2)
+        self.assertIn('printer jam - no network', openai_service.ask_predictive_ai_chatgpt.call_args[0][0])
+
+    def test_should_assign_an_issue_with_its_trace(self):
+        uuid_mock = "e3a54f43-3e8d-4c16-b340-9aba07dfb1ec"
+        issue_mock = IssueBuilder().with_id(uuid_mock).build()
+        repository = IssueMockRepository([issue_mock])
+
+        trace = IssueService(issue_repository=repository).assign_issue_with_trace(
+            issue_id=issue_mock.id, auth_user_agent_id=uuid_mock, scope='assignIssue')
+
+        self.assertEqual(repository.issues_trace, [trace])
+        self.assertEqual(trace.issue_id, issue_mock.id)
+        self.assertEqual(trace.scope, 'assignIssue')
+        self.assertEqual(issue_mock.auth_user_agent_id, uuid_mock)
+
+    def test_should_assign_issues_and_report_the_missing_ones(self):
+        issue_mock = IssueBuilder().with_id(uuid.uuid4()).build()
+        missing_id = str(uuid.uuid4())
+
+        result = IssueService(issue_repository=IssueMockRepository([issue_mock])).assign_issues(
+            auth_user_agent_id=str(uuid.uuid4()), issue_ids=[str(issue_mock.id), missing_id, str(issue_mock.id)])
+
+        self.assertEqual(result, {"assigned": [str(issue_mock.id)], "missing": [missing_id]})
+
+    def test_error_in_assign_issues_without_ids_or_filter(self):
+        issue_service = IssueService(issue_repository=IssueMockRepository([]))
+
+        with self.assertRaises(ValueError):
+            issue_service.assign_issues(auth_user_agent_id='agent')
+        with self.assertRaises(ValueError):
+            issue_service.assign_issues(auth_user_agent_id='agent', issue_ids=['not-a-uuid'])
+        with self.assertRaises(ValueError):
+            issue_service.assign_issues(auth_user_agent_id='agent', filters={"subject": "x"})
+
+    def test_error_in_assign_issues_with_a_filter_that_could_reopen_solved_issues(self):
+        issue_service = IssueService(issue_repository=IssueMockRepository([]))
+        cases = [
+            ({}, "filter status must be one of Created, In Progress"),
+            ({"channel_plan_id": str(uuid.uuid4())}, "filter status must be one of Created, In Progress"),
+            ({"status": "Solved"}, "filter status must be one of Created, In Progress"),
+            (["Created"], "filter must be an object"),
+            ("Created", "filter must be an object"),
+        ]
+
+        for filters, error_expected in cases:
+            with self.assertRaises(ValueError) as context:
+                issue_service.assign_issues(auth_user_agent_id='agent', filters=filters)
+            self.assertEqual(str(context.exception), error_expected)
+
+    def test_error_in_assign_issue_with_trace_without_agent(self):
+        with self.assertRaises(ValueError):
+            IssueService(issue_repository=IssueMockRepository([])).assign_issue_with_trace(issue_id='fake_id', auth_user_agent_id=None)
+
     def test_should_get_open_issues(self):
         issues_mocked: list[Issue] = []
         issues_mocked.append(IssueBuilder().build())
@@ -224,5 +454,75 @@ class TestIssueService(unittest.TestCase):
         self.assertEqual(len(result), 7)
         mock_repository_instance.get_top_7_incident_types.assert_called_once()
 
+    def test_error_get_top_7_incident_types_with_unknown_window(self):
+        with self.assertRaises(ValueError):
+            IssueService(issue_repository=IssueMockRepository([])).get_top_7_incident_types(days=365)
+
+
+        
 
-        
\ No newline at end of file
+class TestIssueServiceAsync(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.repository = AsyncMock()
+        self.auth_service = Mock()
+        self.customer_service = Mock()
+        self.openai_service = Mock()
+        self.issue_service = IssueService(issue_repository=Mock(), async_issue_repository=self.repository,
+                                          auth_service=self.auth_service, customer_service=self.customer_service,
+                                          openai_service=self.openai_service)
+
+    async def test_should_create_an_issue_with_the_async_repository(self):
+        issue_mock = IssueBuilder().build()
+
+        created = await self.issue_service.create_issue_async(auth_user_id=issue_mock.auth_user_id,
+                                                              auth_user_agent_id=issue_mock.auth_user_agent_id,
+                                                              subject=issue_mock.subject, description=issue_mock.description)
+
+        self.repository.create_issue.assert_awaited_once_with(created, None)
+        self.issue_service.issue_repository.create_issue.assert_not_called()
+
+    async def test_error_in_create_issue_async_without_fields(self):
+        with self.assertRaises(ValueError):
+            await self.issue_service.create_issue_async(auth_user_id=None, auth_user_agent_id=None,
+                                                        subject=None, description=None)
+        self.repository.create_issue.assert_not_awaited()
+
+    async def test_should_ask_predictive_analitic_with_the_async_clients(self):
+        issue_mock = IssueBuilder().build()
+        self.auth_service.get_customer_by_user_id_async = AsyncMock(return_value=AuthUserCustomerBuilder().build())
+        customer = Mock()
+        customer.name = 'ACME'
+        plan = Mock()
+        plan.name = 'Pro'
+        self.customer_service.get_customer_by_id_async = AsyncMock(return_value=customer)
+        self.customer_service.get_plan_by_id_async = AsyncMock(return_value=plan)
+        self.openai_service.ask_predictive_ai_chatgpt_async = AsyncMock(return_value='answer')
+        self.repository.list_top_issues_by_user.return_value = [('printer jam',), ('no network',)]
+
+        answer = await self.issue_service.ask_predictive_analitic_async(issue_mock.auth_user_id)
+        await self.issue_service.ask_predictive_analitic_async(issue_mock.auth_user_id)
+
+        self.assertEqual(answer, 'answer')
+        self.repository.list_top_issues_by_user.assert_awaited_once()
+        prompt = self.openai_service.ask_predictive_ai_chatgpt_async.call_args[0][0]
+        self.assertIn('printer jam - no network', prompt)
+        self.assertIn('ACME', prompt)
+
+    async def test_should_not_ask_predictive_analitic_without_customer(self):
+        self.auth_service.get_customer_by_user_id_async = AsyncMock(return_value=None)
+        self.openai_service.ask_predictive_ai_chatgpt_async = AsyncMock()
+
+        answer = await self.issue_service.ask_predictive_analitic_async(uuid.uuid4())
+
+        self.assertEqual(answer, 'No se pudo identificar al cliente para dar sugerencias')
+        self.openai_service.ask_predictive_ai_chatgpt_async.assert_not_awaited()
+
+    async def test_should_get_open_issues_async_with_cursor(self):
+        await self.issue_service.get_open_issues_async(page=None, limit=5, cursor='')
+
+        self.repository.get_open_issues_after.assert_awaited_once_with(cursor='', limit=5)
+
+    async def test_error_get_top_7_incident_types_async_with_unknown_window(self):
+        with self.assertRaises(ValueError):
+            await self.issue_service.get_top_7_incident_types_async(days=365)
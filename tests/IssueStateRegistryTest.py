@@ -0,0 +1,58 @@
+import unittest
+from uuid import UUID
+from unittest.mock import MagicMock, patch
+from flaskr.infrastructure.databases.issue_state_registry import IssueStateRegistry
+from flaskr.domain.constants import ISSUE_STATUS_OPEN, ISSUE_STATUS_SOLVED, ISSUE_STATUS_OPEN_NAME, ISSUE_STATUS_SOLVED_NAME
+
+
+class IssueStateRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.db_session = MagicMock()
+        self.db_session.__enter__.return_value = self.db_session
+        self.db_session.query.return_value.all.return_value = [
+            (UUID(ISSUE_STATUS_OPEN), ISSUE_STATUS_OPEN_NAME),
+            (UUID(ISSUE_STATUS_SOLVED), ISSUE_STATUS_SOLVED_NAME),
+        ]
+        self.registry = IssueStateRegistry(session=lambda: self.db_session)
+
+    def test_should_load_states_once_for_known_lookups(self):
+        self.assertEqual(self.registry.name_of(ISSUE_STATUS_OPEN), ISSUE_STATUS_OPEN_NAME)
+        self.assertEqual(self.registry.name_of(UUID(ISSUE_STATUS_SOLVED)), ISSUE_STATUS_SOLVED_NAME)
+        self.assertEqual(self.registry.id_of(ISSUE_STATUS_SOLVED_NAME), UUID(ISSUE_STATUS_SOLVED))
+
+        self.assertEqual(self.db_session.query.call_count, 1)
+
+    def test_should_reload_once_on_unknown_state(self):
+        self.registry.refresh_interval = 0
+        self.registry.refresh()
+
+        self.assertIsNone(self.registry.id_of('Unknown'))
+        self.assertEqual(self.db_session.query.call_count, 2)
+
+    @patch('flaskr.infrastructure.databases.issue_state_registry.time.monotonic')
+    def test_should_reload_on_unknown_states_at_most_once_per_interval(self, monotonic):
+        monotonic.return_value = 100
+        self.registry.refresh()
+
+        for _ in range(5):
+            self.assertIsNone(self.registry.id_of('Unknown'))
+            self.assertIsNone(self.registry.name_of('00000000-0000-0000-0000-000000000000'))
+        within_interval = self.db_session.query.call_count
+        monotonic.return_value = 100 + self.registry.refresh_interval
+        self.assertIsNone(self.registry.id_of('Unknown'))
+
+        self.assertEqual(within_interval, 1)
+        self.assertEqual(self.db_session.query.call_count, 2)
+
+    def test_should_not_load_states_for_missing_status(self):
+        self.assertIsNone(self.registry.name_of(None))
+        self.db_session.query.assert_not_called()
+
+    def test_should_look_up_loaded_names_without_reading_the_states(self):
+        before_load = self.registry.loaded_name_of(ISSUE_STATUS_OPEN)
+        self.registry.refresh()
+
+        self.assertIsNone(before_load)
+        self.assertEqual(self.registry.loaded_name_of(ISSUE_STATUS_OPEN), ISSUE_STATUS_OPEN_NAME)
+        self.assertIsNone(self.registry.loaded_name_of('Unknown'))
+        self.assertEqual(self.db_session.query.call_count, 1)
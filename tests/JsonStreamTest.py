@@ -0,0 +1,28 @@
+import json
+import unittest
+from flaskr.utils import json_array_chunks, ndjson_lines, stream_chunks
+
+
+class JsonStreamTest(unittest.TestCase):
+    def test_should_build_a_json_array_item_by_item(self):
+        items = [{"id": 1}, {"id": 2}]
+
+        chunks = list(json_array_chunks(iter(items)))
+
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(json.loads(''.join(chunks)), items)
+
+    def test_should_build_an_empty_json_array(self):
+        self.assertEqual(''.join(json_array_chunks(iter([]))), '[]')
+
+    def test_should_write_one_json_document_per_line(self):
+        items = [{"id": 1}, {"id": 2}]
+
+        lines = list(ndjson_lines(iter(items)))
+
+        self.assertEqual([json.loads(line) for line in lines], items)
+        self.assertTrue(all(line.endswith('\n') for line in lines))
+
+    def test_should_reject_unknown_stream_format(self):
+        with self.assertRaises(ValueError):
+            stream_chunks([], 'csv')
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+from flaskr.utils import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_should_count_hits_and_misses(self):
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats(), {'size': 1, 'max_size': 2, 'hits': 1, 'misses': 1})
+
+    def test_should_evict_the_least_recently_used_key(self):
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_should_invalidate_a_key(self):
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.invalidate('a')
+        cache.invalidate('missing')
+
+        self.assertIsNone(cache.get('a'))
+
+    @patch('flaskr.utils.lru_cache.time.monotonic')
+    def test_should_expire_entries_after_ttl(self, monotonic_mock):
+        cache = LRUCache(max_size=2, ttl=10)
+        monotonic_mock.return_value = 100
+        cache.put('a', 1)
+
+        monotonic_mock.return_value = 105
+        self.assertEqual(cache.get('a'), 1)
+        monotonic_mock.return_value = 111
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_should_reject_an_empty_cache(self):
+        with self.assertRaises(ValueError):
+            LRUCache(max_size=0)
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from sqlalchemy import text
+from flaskr.infrastructure.databases.postgres.db import engine
+from flaskr.infrastructure.databases.postgres.migrator import MigrationRunner
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+
+
+class MigrationRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.versions = ['900_migration_runner_probe', '901_migration_runner_probe_row']
+        self._write(self.versions[1], "INSERT INTO migration_runner_probe (id) VALUES (1);")
+        self._write(self.versions[0], "CREATE TABLE migration_runner_probe (id INTEGER PRIMARY KEY);")
+        with open(os.path.join(self.directory.name, 'README.md'), 'w') as not_a_migration:
+            not_a_migration.write('ignored')
+
+    def tearDown(self):
+        with engine.begin() as connection:
+            connection.execute(text('DROP TABLE IF EXISTS migration_runner_probe'))
+            connection.execute(text('DELETE FROM schema_migrations WHERE version LIKE :prefix'), {'prefix': '90%'})
+        self.directory.cleanup()
+
+    def _write(self, version, statements):
+        with open(os.path.join(self.directory.name, f'{version}.sql'), 'w') as migration_file:
+            migration_file.write(statements)
+
+    def test_should_list_versions_in_order(self):
+        runner = MigrationRunner(engine, self.directory.name)
+
+        self.assertEqual(runner.versions(), self.versions)
+
+    def test_should_apply_pending_migrations_only_once(self):
+        runner = MigrationRunner(engine, self.directory.name)
+
+        first_run = runner.run()
+        second_run = runner.run()
+
+        self.assertEqual(first_run, self.versions)
+        self.assertEqual(second_run, [])
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text('SELECT count(*) FROM migration_runner_probe')).scalar(), 1)
+
+    def test_should_not_record_a_failed_migration(self):
+        self._write('902_migration_runner_broken', "INSERT INTO migration_runner_missing_table VALUES (1);")
+        runner = MigrationRunner(engine, self.directory.name)
+
+        with self.assertRaises(Exception):
+            runner.run()
+
+        with engine.connect() as connection:
+            versions = {row[0] for row in connection.execute(text('SELECT version FROM schema_migrations'))}
+        self.assertIn(self.versions[1], versions)
+        self.assertNotIn('902_migration_runner_broken', versions)
+
+    @patch('flaskr.infrastructure.databases.model_sqlalchemy.Base.metadata.create_all')
+    def test_should_not_run_ddl_when_the_repository_is_built(self, create_all_mock):
+        IssuePostgresqlRepository()
+
+        create_all_mock.assert_not_called()
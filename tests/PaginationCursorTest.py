@@ -0,0 +1,35 @@
+import unittest
+from uuid import UUID
+from datetime import datetime, timezone
+from flaskr.utils.pagination_cursor import encode_cursor, decode_cursor, encode_search_cursor, decode_search_cursor
+
+
+class TestPaginationCursor(unittest.TestCase):
+
+    def test_should_decode_the_position_encoded_in_the_cursor(self):
+        created_at = datetime(2024, 10, 12, 11, 34, 43, 123456, tzinfo=timezone.utc)
+        issue_id = UUID('17be4b3e-3b6d-44e2-9721-229d6a746f15')
+
+        cursor = encode_cursor(created_at, issue_id)
+
+        self.assertEqual(decode_cursor(cursor), (created_at, issue_id))
+
+    def test_should_raise_value_error_when_the_cursor_is_invalid(self):
+        with self.assertRaises(ValueError) as context:
+            decode_cursor('not-a-cursor')
+
+        self.assertEqual(str(context.exception), 'Invalid cursor')
+
+    def test_should_decode_the_rank_and_position_encoded_in_the_search_cursor(self):
+        created_at = datetime(2024, 10, 12, 11, 34, 43, 123456, tzinfo=timezone.utc)
+        issue_id = UUID('17be4b3e-3b6d-44e2-9721-229d6a746f15')
+
+        cursor = encode_search_cursor(0.0607927106320858, created_at, issue_id)
+
+        self.assertEqual(decode_search_cursor(cursor), (0.0607927106320858, created_at, issue_id))
+
+    def test_should_not_read_a_listing_cursor_as_a_search_cursor(self):
+        cursor = encode_cursor(datetime(2024, 10, 12, tzinfo=timezone.utc), UUID('17be4b3e-3b6d-44e2-9721-229d6a746f15'))
+
+        with self.assertRaises(ValueError):
+            decode_search_cursor(cursor)
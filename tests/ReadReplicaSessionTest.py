@@ -0,0 +1,164 @@
+import os
+import unittest
+from asyncio import current_task
+from uuid import uuid4
+from datetime import datetime
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.ext.asyncio import create_async_engine, async_scoped_session, AsyncSession as OrmAsyncSession
+from flaskr.infrastructure.databases.postgres.db import (engine, Session, ReplicaSession, ENGINE_OPTIONS,
+                                                          WROTE_KEY, REPLICA_KEY)
+from flaskr.infrastructure.databases.postgres.async_db import AsyncPrimarySession, async_database_uri
+from flaskr.infrastructure.databases.postgres.migrator import MigrationRunner
+from flaskr.infrastructure.databases.issue_postresql_repository import IssuePostgresqlRepository
+from flaskr.infrastructure.databases.issue_postgresql_async_repository import IssuePostgresqlAsyncRepository
+from flaskr.domain.constants import ISSUE_STATUS_OPEN
+from flaskr.domain.models import Issue
+
+REPLICA_TEST_URI = os.getenv('DATABASE_REPLICA_TEST_URI')
+
+
+class ReplicaSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.primary_session = scoped_session(sessionmaker(bind=engine))
+        self.replica = MagicMock()
+
+    def tearDown(self):
+        self.primary_session.remove()
+
+    def _read_session(self, replicas):
+        return ReplicaSession(bind=engine, replicas=replicas, primary_session=self.primary_session)
+
+    def test_should_read_from_the_primary_without_replicas(self):
+        self.assertIs(self._read_session([]).get_bind(), engine)
+
+    def test_should_keep_the_same_replica_for_the_whole_session(self):
+        other_replica = MagicMock()
+        read_session = self._read_session([self.replica, other_replica])
+
+        chosen = read_session.get_bind()
+
+        self.assertIn(chosen, [self.replica, other_replica])
+        self.assertTrue(all(read_session.get_bind() is chosen for _ in range(10)))
+        self.assertIs(read_session.info[REPLICA_KEY], chosen)
+
+    def test_should_read_from_the_primary_after_a_write_in_the_same_scope(self):
+        read_session = self._read_session([self.replica])
+        self.assertIs(read_session.get_bind(), self.replica)
+
+        self.primary_session().info[WROTE_KEY] = True
+
+        self.assertIs(read_session.get_bind(), engine)
+
+    def test_should_go_back_to_the_replica_once_the_scope_ends(self):
+        self.primary_session().info[WROTE_KEY] = True
+        self.primary_session.remove()
+
+        self.assertIs(self._read_session([self.replica]).get_bind(), self.replica)
+
+
+@unittest.skipUnless(REPLICA_TEST_URI, 'DATABASE_REPLICA_TEST_URI is not set')
+class ReadReplicaRoutingTest(unittest.TestCase):
+    """
+    Runs against a second, independent postgres instance standing in for the replica,
+    so a row written to the primary is only visible when the read is routed there
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_engine = create_engine(REPLICA_TEST_URI, **ENGINE_OPTIONS)
+        MigrationRunner(cls.replica_engine).run()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.replica_engine.dispose()
+
+    def setUp(self):
+        self.read_session = scoped_session(sessionmaker(class_=ReplicaSession, bind=engine,
+                                                        replicas=[self.replica_engine], primary_session=Session))
+        self.repo = IssuePostgresqlRepository(read_session=self.read_session)
+        Session.remove()
+
+    def tearDown(self):
+        self.read_session.remove()
+        Session.remove()
+
+    def _create_issue(self):
+        issue = Issue(
+            id=uuid4(),
+            auth_user_id=uuid4(),
+            auth_user_agent_id=None,
+            status=ISSUE_STATUS_OPEN,
+            subject='Replica Issue',
+            description='Replica Description',
+            created_at=datetime.utcnow(),
+            closed_at=None,
+            channel_plan_id=None
+        )
+        self.repo.create_issue(issue)
+        return str(issue.id).split('-')[-1]
+
+    def test_should_read_from_the_replica_in_a_later_request(self):
+        radicado = self._create_issue()
+        Session.remove()
+        self.read_session.remove()
+
+        self.assertIsNone(self.repo.get_issue_by_id(radicado))
+
+    def test_should_read_its_own_writes_in_the_same_request(self):
+        radicado = self._create_issue()
+
+        self.assertIsNotNone(self.repo.get_issue_by_id(radicado))
+
+
+@unittest.skipUnless(REPLICA_TEST_URI, 'DATABASE_REPLICA_TEST_URI is not set')
+class AsyncReadReplicaRoutingTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Same routing as ReadReplicaRoutingTest for IssuePostgresqlAsyncRepository, the
+    scope of the sessions is the asyncio task instead of the thread
+    """
+    @classmethod
+    def setUpClass(cls):
+        replica_engine = create_engine(REPLICA_TEST_URI, **ENGINE_OPTIONS)
+        MigrationRunner(replica_engine).run()
+        replica_engine.dispose()
+
+    async def asyncSetUp(self):
+        self.primary_engine = create_async_engine(async_database_uri(engine.url.render_as_string(hide_password=False)))
+        self.replica_engine = create_async_engine(async_database_uri(REPLICA_TEST_URI))
+        self.session = async_scoped_session(
+            sessionmaker(bind=self.primary_engine, class_=OrmAsyncSession, sync_session_class=AsyncPrimarySession,
+                         expire_on_commit=False),
+            scopefunc=current_task)
+        self.read_session = async_scoped_session(
+            sessionmaker(bind=self.primary_engine, class_=OrmAsyncSession, sync_session_class=ReplicaSession,
+                         expire_on_commit=False, replicas=[self.replica_engine.sync_engine], primary_session=self.session),
+            scopefunc=current_task)
+        self.repo = IssuePostgresqlAsyncRepository(session=self.session, read_session=self.read_session)
+
+    async def asyncTearDown(self):
+        await self._end_request()
+        await self.primary_engine.dispose()
+        await self.replica_engine.dispose()
+
+    async def _end_request(self):
+        await self.read_session.remove()
+        await self.session.remove()
+
+    async def _create_issue(self):
+        issue = Issue(id=uuid4(), auth_user_id=uuid4(), auth_user_agent_id=None, status=ISSUE_STATUS_OPEN,
+                      subject='Replica Issue', description='Replica Description', created_at=datetime.utcnow(),
+                      closed_at=None, channel_plan_id=None)
+        await self.repo.create_issue(issue)
+        return str(issue.id).split('-')[-1]
+
+    async def test_should_read_from_the_replica_in_a_later_request(self):
+        radicado = await self._create_issue()
+        await self._end_request()
+
+        self.assertIsNone(await self.repo.get_issue_by_id(radicado))
+
+    async def test_should_read_its_own_writes_in_the_same_request(self):
+        radicado = await self._create_issue()
+
+        self.assertIsNotNone(await self.repo.get_issue_by_id(radicado))
@@ -2,6 +2,7 @@ from typing import List
 from flaskr.domain.interfaces import IssueRepository
 from flaskr.domain.models import Issue
 from math import ceil
+from flaskr.utils import encode_cursor, encode_search_cursor
 
 
 class IssueMockRepository(IssueRepository):
@@ -9,12 +10,24 @@ class IssueMockRepository(IssueRepository):
         super().__init__()
         self.issues = issuesMock
         self.issues_attachment = []
+        self.issues_trace = []
 
     def list_issues_period(self, user_id, year, month) -> List[Issue]:
         return self.issues
 
-    def list_issues_filtered(self, user_id, status, channel_plan_id, created_at, closed_at) -> List[Issue]:
-        return self.issues
+    def list_issues_period_by_users(self, user_ids, year, month) -> List[Issue]:
+        return [issue for issue in self.issues if issue.auth_user_id in user_ids]
+
+    def count_issues_by_users(self, user_ids, bucket, status=None, channel_plan_id=None, created_at=None, closed_at=None) -> List[tuple]:
+        totals = {}
+        for issue in self.issues:
+            if issue.auth_user_id in user_ids:
+                key = (issue.status, issue.channel_plan_id, issue.created_at.replace(hour=0, minute=0, second=0, microsecond=0))
+                totals[key] = totals.get(key, 0) + 1
+        return [(*key, total) for key, total in totals.items()]
+
+    def list_issue_columns_by_users(self, user_ids, columns, status=None, channel_plan_id=None, created_at=None, closed_at=None) -> List[tuple]:
+        return [tuple(getattr(issue, column) for column in columns) for issue in self.issues if issue.auth_user_id in user_ids]
 
     def create_issue(self, issue_data, new_attachment):
         self.issues.append(issue_data)
@@ -23,7 +36,13 @@ class IssueMockRepository(IssueRepository):
 
         return issue_data
 
-    def find(self, user_id=None, page=1, limit=10):
+    def create_issues(self, issues, attachments=None):
+        self.issues.extend(issues)
+        self.issues_attachment.extend(attachments or [])
+
+        return issues
+
+    def find(self, user_id=None, page=1, limit=10, total_mode=None):
         total_pages = ceil(len(self.issues)/limit)
         has_next = page < total_pages
 
@@ -46,6 +65,9 @@ class IssueMockRepository(IssueRepository):
             "data": data
         }
 
+    def find_after(self, user_id=None, cursor=None, limit=10):
+        return self._keyset_page(limit)
+
     def assign_issue(self, issue_id, auth_user_agent_id):
             issue = next((i for i in self.issues if i.id == issue_id), None)
             if issue:
@@ -54,7 +76,18 @@ class IssueMockRepository(IssueRepository):
                 raise ValueError("Issue not found")
             return "Issue Asignado correctamente"
     
-    def get_open_issues(self,page=1, limit=10):
+    def assign_issue_with_trace(self, issue_id, auth_user_agent_id, issue_trace):
+        self.assign_issue(issue_id, auth_user_agent_id)
+        self.issues_trace.append(issue_trace)
+        return issue_trace
+
+    def assign_issues_with_trace(self, auth_user_agent_id, scope, issue_ids=None, filters=None, limit=None):
+        assigned = [issue for issue in self.issues if issue_ids is None or issue.id in issue_ids][:limit]
+        for issue in assigned:
+            issue.auth_user_agent_id = auth_user_agent_id
+        return [issue.id for issue in assigned]
+
+    def get_open_issues(self,page=1, limit=10, total_mode=None):
         total_pages = ceil(len(self.issues)/limit)
         has_next = page < total_pages
 
@@ -75,4 +108,43 @@ class IssueMockRepository(IssueRepository):
             "total_pages": total_pages,
             "has_next": has_next,
             "data": data
+        }
+
+    def search_by_users(self, user_ids, query, cursor=None, limit=10):
+        words = query.lower().split()
+        matches = [issue for issue in self.issues if issue.auth_user_id in user_ids and
+                   any(word in f'{issue.subject} {issue.description}'.lower() for word in words)]
+        issues = matches[:limit]
+        has_next = len(matches) > limit
+
+        return {
+            "limit": limit,
+            "has_next": has_next,
+            "next_cursor": encode_search_cursor(1.0, issues[-1].created_at, issues[-1].id) if has_next else None,
+            "data": [{"id": str(issue.id), "subject": issue.subject, "rank": 1.0} for issue in issues]
+        }
+
+    def get_open_issues_after(self, cursor=None, limit=10):
+        return self._keyset_page(limit)
+
+    def _keyset_page(self, limit):
+        issues = self.issues[:limit]
+        has_next = len(self.issues) > limit
+
+        data = [{
+            "id": str(issue.id),
+            "auth_user_id": str(issue.auth_user_id),
+            "status": "Created",
+            "subject": issue.subject,
+            "description": issue.description,
+            "created_at": str(issue.created_at),
+            "closed_at": str(issue.closed_at),
+            "channel_plan_id": str(issue.channel_plan_id)
+        } for issue in issues]
+
+        return {
+            "limit": limit,
+            "has_next": has_next,
+            "next_cursor": encode_cursor(issues[-1].created_at, issues[-1].id) if has_next else None,
+            "data": data
         }
\ No newline at end of file
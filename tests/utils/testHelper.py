@@ -1,4 +1,7 @@
 from types import SimpleNamespace
+from uuid import UUID
+from contextlib import contextmanager
+from sqlalchemy import event
 
 def dict_to_obj(data):
     if isinstance(data, dict):
@@ -6,4 +9,46 @@ def dict_to_obj(data):
     elif isinstance(data, list):
         return [dict_to_obj(item) for item in data]
     else:
-        return data
\ No newline at end of file
+        return data
+
+def explain_query(session, query):
+    """
+    Return the JSON plan postgres chooses for an ORM query
+    """
+    compiled = query.statement.compile(dialect=session.get_bind().dialect)
+    params = {key: str(value) if isinstance(value, UUID) else value for key, value in compiled.params.items()}
+    return session.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', params).scalar()[0]['Plan']
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+
+@contextmanager
+def count_statements(engine):
+    """
+    Collect every sql statement the engine sends to the database inside the block
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def explain_statement(connection, statement, params):
+    """
+    Return the JSON plan postgres chooses for a core statement and its bound values
+    """
+    compiled = statement.compile(dialect=connection.dialect)
+    params = {key: str(value) if isinstance(value, UUID) else value
+              for key, value in {**compiled.params, **params}.items()}
+    return connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', params).scalar()[0]['Plan']